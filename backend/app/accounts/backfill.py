@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import time
+from datetime import date
+from typing import List, Optional
+
+from app.db import get_supabase_client, run_query
+
+logger = logging.getLogger(__name__)
+
+# Membership registration fee by role (₹)
+MEMBERSHIP_FEES = {"PERMANENT": 5000, "NORMAL": 100, "ASSOCIATED": 500}
+
+# Unique constraint from app/db/migration_membership_fee_unique.sql
+FEE_CONFLICT_COLUMNS = "reference_user_id,fee_key"
+MEMBER_PAGE_SIZE = 1000
+INSERT_CHUNK_SIZE = 500
+
+
+async def _members_without_fee(supabase, after_id: Optional[str]) -> List[dict]:
+    """
+    Next page of active non-HEAD members with no MEMBERSHIP_FEE transaction,
+    as a single anti-join (embedded fees filtered to nothing) ordered by id.
+    """
+    def _fetch():
+        query = (
+            supabase.table("users")
+            .select("id, full_name, member_id, role, joined_at, created_at, fees:transactions!reference_user_id(id)")
+            .eq("status", "ACTIVE")
+            .neq("role", "HEAD")
+            .eq("fees.category", "MEMBERSHIP_FEE")
+            .is_("fees", "null")
+        )
+        if after_id:
+            query = query.gt("id", after_id)
+        return query.order("id").limit(MEMBER_PAGE_SIZE).execute()
+
+    result = await run_query(_fetch)
+    return result.data or []
+
+
+def membership_fee_key(role: str, member_id: Optional[str]) -> str:
+    """
+    Idempotency key of one membership fee. An upgrade assigns a new member
+    ID, so each membership a member pays for gets its own fee row.
+    """
+    return f"{role}:{member_id or ''}"
+
+
+def _fee_row(member: dict, admin_id: str) -> Optional[dict]:
+    fee = MEMBERSHIP_FEES.get(member["role"])
+    if not fee:
+        return None
+    # Use joined_at or created_at as the transaction date
+    tx_date = (member.get("joined_at") or member.get("created_at") or date.today().isoformat())[:10]
+    mid = member.get("member_id") or "—"
+    return {
+        "type":               "INCOME",
+        "category":           "MEMBERSHIP_FEE",
+        "amount":             fee,
+        "description":        f"Registration fee — {mid} ({member['role']})",
+        "reference_user_id":  member["id"],
+        "recorded_by":        admin_id,
+        "transaction_date":   tx_date,
+        "fee_key":            membership_fee_key(member["role"], member.get("member_id")),
+    }
+
+
+class FeeBackfill:
+    """
+    Seeds MEMBERSHIP_FEE income for active members who have none.
+
+    The missing set is read page by page and written in chunked bulk
+    upserts that ignore rows already covered by the (reference_user_id,
+    fee_key) unique constraint, so re-runs and concurrent approvals can't
+    double-book a fee. One run at a time, in the background; `status()`
+    reports its progress.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._state: dict = {"status": "idle"}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, admin_id: str) -> dict:
+        self._state = {
+            "status": "running",
+            "started_at": time.time(),
+            "finished_at": None,
+            "scanned": 0,
+            "created": 0,
+            "skipped": 0,
+            "error": None,
+        }
+        self._task = asyncio.create_task(self._run(admin_id), name="fee-backfill")
+        return self.status()
+
+    async def dry_run(self) -> dict:
+        """What a run would insert right now, without writing anything."""
+        supabase = get_supabase_client()
+        would_create, would_amount, skipped, sample = 0, 0, 0, []
+        after_id = None
+        while True:
+            members = await _members_without_fee(supabase, after_id)
+            for member in members:
+                fee = MEMBERSHIP_FEES.get(member["role"])
+                if fee:
+                    would_create += 1
+                    would_amount += fee
+                    if len(sample) < 20:
+                        sample.append({"member_id": member.get("member_id"), "full_name": member["full_name"], "role": member["role"]})
+                else:
+                    skipped += 1
+            if len(members) < MEMBER_PAGE_SIZE:
+                break
+            after_id = members[-1]["id"]
+        return {
+            "dry_run": True,
+            "would_create": would_create,
+            "would_amount": would_amount,
+            "skipped": skipped,
+            "sample": sample,
+        }
+
+    async def _run(self, admin_id: str) -> None:
+        supabase = get_supabase_client()
+        state = self._state
+        try:
+            after_id = None
+            while True:
+                members = await _members_without_fee(supabase, after_id)
+                rows = []
+                for member in members:
+                    row = _fee_row(member, admin_id)
+                    if row:
+                        rows.append(row)
+                    else:
+                        state["skipped"] += 1
+                for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+                    chunk = rows[start:start + INSERT_CHUNK_SIZE]
+                    result = await run_query(
+                        lambda: supabase.table("transactions")
+                        .upsert(chunk, on_conflict=FEE_CONFLICT_COLUMNS, ignore_duplicates=True)
+                        .execute()
+                    )
+                    # Rows skipped as duplicates are not returned
+                    inserted = len(result.data or [])
+                    state["created"] += inserted
+                    state["skipped"] += len(chunk) - inserted
+                state["scanned"] += len(members)
+                if len(members) < MEMBER_PAGE_SIZE:
+                    break
+                after_id = members[-1]["id"]
+            state["status"] = "completed"
+        except Exception as exc:
+            state["status"] = "failed"
+            state["error"] = str(exc)
+            logger.exception("Membership fee backfill failed")
+        finally:
+            state["finished_at"] = time.time()
+            logger.info(
+                "Membership fee backfill %s: %d scanned, %d created, %d skipped",
+                state["status"], state["scanned"], state["created"], state["skipped"],
+            )
+
+    def status(self) -> dict:
+        state = dict(self._state)
+        if state.get("started_at"):
+            end = state.get("finished_at") or time.time()
+            state["elapsed_seconds"] = round(end - state["started_at"], 1)
+        if state["status"] == "running":
+            state["message"] = f"Backfill running — {state['scanned']} member(s) scanned so far."
+        elif state["status"] == "completed":
+            state["message"] = (
+                f"Backfill complete. {state['created']} transaction(s) created, "
+                f"{state['skipped']} skipped (already recorded or no fee)."
+            )
+        elif state["status"] == "failed":
+            state["message"] = f"Backfill failed: {state['error']}"
+        return state
+
+
+fee_backfill = FeeBackfill()
@@ -0,0 +1,162 @@
+import asyncio
+import base64
+import csv
+import io
+import json
+import os
+import tempfile
+from typing import AsyncIterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+from openpyxl import Workbook
+
+from app.accounts.models import LedgerFilters
+from app.db import run_query
+
+# Member name / ID come from one embedded join on the reference_user_id FK
+# (transactions also references users via recorded_by, hence the hint)
+MEMBER_EMBED = "member:users!reference_user_id(id, full_name, member_id)"
+MEMBER_EMBED_INNER = "member:users!reference_user_id!inner(id, full_name, member_id)"
+EXPORT_PAGE_SIZE = 1000
+EXPORT_COLUMNS = ["Date", "Type", "Category", "Amount", "Description", "Member ID", "Member Name", "Recorded At"]
+
+
+def encode_cursor(row: dict) -> str:
+    key = [row["transaction_date"], row["created_at"], row["id"]]
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str, str]:
+    try:
+        transaction_date, created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(transaction_date), str(created_at), str(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _quoted(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def build_ledger_query(supabase, filters: LedgerFilters, cursor: Optional[str] = None):
+    """
+    Ledger rows matching `filters`, newest first, ordered by
+    (transaction_date, created_at, id) descending so that `cursor` (the key
+    of the last row already seen) can resume with a keyset condition.
+    """
+    embed = MEMBER_EMBED_INNER if filters.member_id else MEMBER_EMBED
+    query = supabase.table("transactions").select(f"*, {embed}")
+
+    if filters.from_date:
+        query = query.gte("transaction_date", filters.from_date.isoformat())
+    if filters.to_date:
+        query = query.lte("transaction_date", filters.to_date.isoformat())
+    if filters.type:
+        query = query.eq("type", filters.type)
+    if filters.category:
+        query = query.eq("category", filters.category)
+    if filters.user_id:
+        query = query.eq("reference_user_id", filters.user_id)
+    if filters.member_id:
+        query = query.eq("member.member_id", filters.member_id)
+
+    if cursor:
+        d, c, i = (_quoted(part) for part in decode_cursor(cursor))
+        query = query.or_(
+            f"transaction_date.lt.{d},"
+            f"and(transaction_date.eq.{d},created_at.lt.{c}),"
+            f"and(transaction_date.eq.{d},created_at.eq.{c},id.lt.{i})"
+        )
+
+    return (
+        query.order("transaction_date", desc=True)
+        .order("created_at", desc=True)
+        .order("id", desc=True)
+    )
+
+
+async def fetch_page(
+    supabase, filters: LedgerFilters, limit: Optional[int], cursor: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """One page of the ledger; returns (rows, next_cursor). No limit → everything."""
+    def _fetch():
+        query = build_ledger_query(supabase, filters, cursor)
+        if limit:
+            # One extra row tells us whether another page exists
+            query = query.limit(limit + 1)
+        return query.execute()
+
+    result = await run_query(_fetch)
+    rows = result.data or []
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+    return rows, next_cursor
+
+
+async def iter_ledger(supabase, filters: LedgerFilters) -> AsyncIterator[List[dict]]:
+    """Yield the filtered ledger page by page (EXPORT_PAGE_SIZE rows at a time)."""
+    cursor = None
+    while True:
+        rows, cursor = await fetch_page(supabase, filters, EXPORT_PAGE_SIZE, cursor)
+        if rows:
+            yield rows
+        if not cursor:
+            return
+
+
+def _export_row(tx: dict) -> list:
+    member = tx.get("member") or {}
+    return [
+        tx.get("transaction_date"),
+        tx.get("type"),
+        tx.get("category"),
+        float(tx["amount"]) if tx.get("amount") is not None else None,
+        tx.get("description") or "",
+        member.get("member_id") or "",
+        member.get("full_name") or "",
+        tx.get("created_at"),
+    ]
+
+
+async def csv_chunks(supabase, filters: LedgerFilters) -> AsyncIterator[bytes]:
+    """CSV export, encoded and yielded one page at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM so Excel opens the UTF-8 file (₹, Telugu names) correctly
+    buffer.write("\ufeff")
+    writer.writerow(EXPORT_COLUMNS)
+    async for rows in iter_ledger(supabase, filters):
+        writer.writerows(_export_row(tx) for tx in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def write_xlsx(supabase, filters: LedgerFilters) -> str:
+    """
+    XLSX export written with openpyxl's write-only mode (rows are flushed to
+    disk as they are appended) into a temp file; returns its path. The
+    caller streams the file and deletes it afterwards.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Ledger")
+    sheet.append(EXPORT_COLUMNS)
+
+    def _append(rows):
+        for tx in rows:
+            sheet.append(_export_row(tx))
+
+    fd, path = tempfile.mkstemp(prefix="ledger-", suffix=".xlsx")
+    os.close(fd)
+    try:
+        async for rows in iter_ledger(supabase, filters):
+            await asyncio.to_thread(_append, rows)
+        await asyncio.to_thread(workbook.save, path)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional
 from datetime import date
 
 
@@ -9,3 +9,12 @@ class TransactionCreate(BaseModel):
     amount: float = Field(..., gt=0)
     description: Optional[str] = None
     transaction_date: Optional[date] = None
+
+
+class LedgerFilters(BaseModel):
+    from_date: Optional[date] = None
+    to_date: Optional[date] = None
+    type: Optional[Literal["INCOME", "EXPENSE"]] = None
+    category: Optional[str] = None
+    user_id: Optional[str] = None      # reference_user_id (users.id)
+    member_id: Optional[str] = None    # e.g. PID-003
@@ -1,25 +1,50 @@
 import logging
+import os
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from app.auth.dependencies import require_admin
 from app.db import get_supabase_client, run_query
-from app.accounts.models import TransactionCreate
+from app.accounts.models import TransactionCreate, LedgerFilters
+from app.accounts.ledger import csv_chunks, fetch_page, write_xlsx
+from app.accounts.backfill import fee_backfill
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-MEMBERSHIP_FEES = {"PERMANENT": 5000, "NORMAL": 100, "ASSOCIATED": 500}
+async def _rollup(supabase, dimension: str, from_date: Optional[date] = None, to_date: Optional[date] = None):
+    """
+    Income/expense per bucket from the maintained transaction_rollups table
+    (see app/db/migration_transaction_rollups.sql). Cost depends on the
+    number of buckets, not on the size of the ledger.
+    """
+    result = await run_query(
+        lambda: supabase.rpc("transaction_rollup", {
+            "p_dimension": dimension,
+            "p_from": from_date.isoformat() if from_date else None,
+            "p_to": to_date.isoformat() if to_date else None,
+        }).execute()
+    )
+    return [
+        {
+            "bucket":  row["bucket"],
+            "income":  float(row["income"]),
+            "expense": float(row["expense"]),
+            "net":     float(row["income"]) - float(row["expense"]),
+            "count":   row["tx_count"],
+        }
+        for row in (result.data or [])
+    ]
 
 
 @router.get("/summary")
 async def get_summary(admin: dict = Depends(require_admin)):
     """Total income, expenses and net balance."""
     supabase = get_supabase_client()
-    result = await run_query(
-        lambda: supabase.table("transactions").select("type, amount").execute()
-    )
-    income  = sum(r["amount"] for r in result.data if r["type"] == "INCOME")
-    expense = sum(r["amount"] for r in result.data if r["type"] == "EXPENSE")
+    rows = await _rollup(supabase, "total")
+    income = rows[0]["income"] if rows else 0
+    expense = rows[0]["expense"] if rows else 0
     return {
         "total_income":  income,
         "total_expense": expense,
@@ -27,40 +52,85 @@ async def get_summary(admin: dict = Depends(require_admin)):
     }
 
 
-@router.get("/transactions")
-async def list_transactions(admin: dict = Depends(require_admin)):
-    """Full ledger, newest first. Fetches member names in a second query to avoid join issues."""
+@router.get("/rollups/{dimension}")
+async def get_rollup(
+    dimension: Literal["month", "category", "role"],
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    admin: dict = Depends(require_admin),
+):
+    """
+    Income, expense, net and transaction count grouped by month (YYYY-MM),
+    category, or membership role of the linked member ('NONE' for entries
+    not tied to a member). from_date / to_date limit the months covered.
+    """
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(status_code=400, detail="from_date must not be after to_date")
     supabase = get_supabase_client()
+    return await _rollup(supabase, dimension, from_date, to_date)
 
-    # Fetch transactions
-    tx_result = await run_query(
-        lambda: supabase.table("transactions")
-        .select("*")
-        .order("transaction_date", desc=True)
-        .order("created_at", desc=True)
-        .execute()
-    )
-    transactions = tx_result.data
-
-    # Enrich with member name/id for those linked to a user
-    user_ids = list({t["reference_user_id"] for t in transactions if t.get("reference_user_id")})
-    users_map = {}
-    if user_ids:
-        users_result = await run_query(
-            lambda: supabase.table("users")
-            .select("id, full_name, member_id")
-            .in_("id", user_ids)
-            .execute()
-        )
-        users_map = {u["id"]: u for u in users_result.data}
 
-    for tx in transactions:
-        uid = tx.get("reference_user_id")
-        tx["member"] = users_map.get(uid) if uid else None
+def _check_range(filters: LedgerFilters):
+    if filters.from_date and filters.to_date and filters.from_date > filters.to_date:
+        raise HTTPException(status_code=400, detail="from_date must not be after to_date")
+
 
+@router.get("/transactions")
+async def list_transactions(
+    response: Response,
+    filters: LedgerFilters = Depends(),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    admin: dict = Depends(require_admin),
+):
+    """
+    Ledger newest first, each entry with its linked `member` (id, name,
+    member ID) from a single embedded join. Filter by date range, type,
+    category, user_id or member_id. Pass `limit` to paginate; the next
+    page's cursor is in X-Next-Cursor. Without `limit` the whole filtered
+    ledger is returned.
+    """
+    _check_range(filters)
+    supabase = get_supabase_client()
+    transactions, next_cursor = await fetch_page(supabase, filters, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return transactions
 
 
+@router.get("/transactions/export")
+async def export_transactions(
+    background_tasks: BackgroundTasks,
+    filters: LedgerFilters = Depends(),
+    format: Literal["csv", "xlsx"] = "csv",
+    admin: dict = Depends(require_admin),
+):
+    """
+    Download the filtered ledger as CSV or XLSX. Rows are read from the
+    database page by page; CSV is streamed as it is produced, XLSX is
+    built in openpyxl's write-only mode on disk and then streamed.
+    """
+    _check_range(filters)
+    supabase = get_supabase_client()
+    filename = f"ledger-{date.today().isoformat()}.{format}"
+    logger.info("Admin %s exported the ledger as %s", admin["id"], format)
+
+    if format == "csv":
+        return StreamingResponse(
+            csv_chunks(supabase, filters),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+    path = await write_xlsx(supabase, filters)
+    background_tasks.add_task(os.unlink, path)
+    return FileResponse(
+        path,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        filename=filename,
+    )
+
+
 @router.post("/transactions", status_code=201)
 async def add_transaction(
     payload: TransactionCreate,
@@ -83,65 +153,30 @@ async def add_transaction(
     return result.data[0]
 
 
-@router.post("/backfill", status_code=201)
-async def backfill_membership_fees(admin: dict = Depends(require_admin)):
+@router.post("/backfill", status_code=202)
+async def backfill_membership_fees(
+    dry_run: bool = False,
+    admin: dict = Depends(require_admin),
+):
     """
     Seed INCOME transactions for all existing active members who don't
     already have a MEMBERSHIP_FEE transaction recorded.
-    Safe to call multiple times — skips members already in the ledger.
-    """
-    supabase = get_supabase_client()
-
-    # Get all active non-HEAD members
-    members_result = await run_query(
-        lambda: supabase.table("users")
-        .select("id, full_name, member_id, role, joined_at, created_at")
-        .eq("status", "ACTIVE")
-        .neq("role", "HEAD")
-        .execute()
-    )
-    members = members_result.data
-
-    # Get user IDs that already have a MEMBERSHIP_FEE transaction
-    existing_result = await run_query(
-        lambda: supabase.table("transactions")
-        .select("reference_user_id")
-        .eq("category", "MEMBERSHIP_FEE")
-        .execute()
-    )
-    already_recorded = {r["reference_user_id"] for r in existing_result.data if r.get("reference_user_id")}
-
-    created = 0
-    skipped = 0
-    for m in members:
-        if m["id"] in already_recorded:
-            skipped += 1
-            continue
-        fee = MEMBERSHIP_FEES.get(m["role"])
-        if not fee:
-            skipped += 1
-            continue
-
-        # Use joined_at or created_at as the transaction date
-        tx_date = (m.get("joined_at") or m.get("created_at") or date.today().isoformat())[:10]
-        mid = m.get("member_id") or "—"
-
-        await run_query(
-            lambda: supabase.table("transactions").insert({
-                "type":               "INCOME",
-                "category":           "MEMBERSHIP_FEE",
-                "amount":             fee,
-                "description":        f"Registration fee — {mid} ({m['role']})",
-                "reference_user_id":  m["id"],
-                "recorded_by":        admin["id"],
-                "transaction_date":   tx_date,
-            }).execute()
-        )
-        created += 1
-        logger.info("Backfill: recorded ₹%d for %s (%s)", fee, m["full_name"], mid)
+    Safe to call multiple times — fee rows carry a fee_key and the
+    (reference_user_id, fee_key) unique constraint skips fees already in
+    the ledger.
 
-    return {
-        "message": f"Backfill complete. {created} transaction(s) created, {skipped} skipped (already recorded or no fee).",
-        "created": created,
-        "skipped": skipped,
-    }
+    Runs in the background; poll GET /accounts/backfill for progress.
+    With dry_run=true nothing is written and the report is returned directly.
+    """
+    if dry_run:
+        return await fee_backfill.dry_run()
+    if fee_backfill.running:
+        raise HTTPException(status_code=409, detail="A backfill is already running")
+    logger.info("Admin %s started the membership fee backfill", admin["id"])
+    return fee_backfill.start(admin["id"])
+
+
+@router.get("/backfill")
+async def get_backfill_status(admin: dict = Depends(require_admin)):
+    """Progress of the current (or last) membership fee backfill."""
+    return fee_backfill.status()
@@ -0,0 +1,314 @@
+import os
+import re
+from datetime import date, datetime
+from typing import Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+from openpyxl import load_workbook
+
+TEMPLATE_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "../../../Parishat_Member_Onboarding_Template.xlsx")
+)
+DEFAULT_BATCH_SIZE = 1000
+
+# Legacy / hand-made headers → template column names (keys are normalized headers)
+HEADER_ALIASES = {
+    "name": "full_name",
+    "member_name": "full_name",
+    "cell_no": "phone",
+    "cell": "phone",
+    "mobile": "phone",
+    "mobile_no": "phone",
+    "phone_no": "phone",
+    "phone_number": "phone",
+    "dob": "date_of_birth",
+    "date_of_birth": "date_of_birth",
+    "zonal": "zonal_committee",
+    "regional": "regional_committee",
+}
+# Optional columns read when present even though the template doesn't have them
+EXTRA_COLUMNS = ("date_of_birth",)
+
+_PHONE_WIDTH = 32
+_EXCEL_EPOCH = np.datetime64("1899-12-30")
+_DATE_FORMATS = ("%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y", "%Y-%m-%d", "%Y/%m/%d")
+
+
+class IngestError(ValueError):
+    """The sheet can't be ingested at all (missing sheet or required columns)."""
+
+
+class ColumnSpec(NamedTuple):
+    name: str
+    required: bool
+    allowed: Optional[FrozenSet[str]]   # None = free text
+
+
+class RowError(NamedTuple):
+    row: int        # spreadsheet row number (header is row 1)
+    column: str
+    message: str
+
+
+class Batch(NamedTuple):
+    rows: List[dict]
+    errors: List[RowError]
+
+
+class _DigitsOnly(dict):
+    """str.translate table that deletes every non-digit character."""
+
+    def __missing__(self, codepoint):
+        return codepoint if 48 <= codepoint <= 57 else None
+
+
+_DIGITS_ONLY = _DigitsOnly()
+
+
+def _header_key(value) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(value or "").strip().lower()).strip("_")
+
+
+def load_schema(template_path: str = TEMPLATE_PATH) -> Dict[str, ColumnSpec]:
+    """
+    Column specs in template order, read from the onboarding template that
+    admins download from /admin/onboard: column names from the Members
+    header row, required flags from Instructions, allowed values from the
+    Valid Values sheet.
+    """
+    wb = load_workbook(template_path, read_only=True, data_only=True)
+    try:
+        header = next(wb["Members"].iter_rows(max_row=1, values_only=True))
+        columns = [_header_key(h) for h in header if h]
+
+        required = {}
+        for row in wb["Instructions"].iter_rows(values_only=True):
+            if len(row) >= 2 and row[0] and _header_key(row[0]) in columns:
+                required[_header_key(row[0])] = str(row[1] or "").strip().lower() == "yes"
+
+        allowed: Dict[str, set] = {}
+        values = wb["Valid Values"].iter_rows(values_only=True)
+        names = [_header_key(h) for h in next(values)]
+        for row in values:
+            for name, value in zip(names, row):
+                if value is not None and str(value).strip():
+                    allowed.setdefault(name, set()).add(str(value).strip())
+    finally:
+        wb.close()
+
+    return {
+        name: ColumnSpec(name, required.get(name, False), frozenset(allowed[name]) if name in allowed else None)
+        for name in columns
+    }
+
+
+# ── column normalizers (one numpy pass per column per batch) ────────────────
+
+def _as_text(values: np.ndarray) -> np.ndarray:
+    """Object column → stripped unicode array; empty cells become ''."""
+    text = np.where(np.equal(values, None), "", values).astype(str)
+    return np.char.strip(text)
+
+
+def normalize_names(values: np.ndarray) -> np.ndarray:
+    """Strip stray quotes/backticks and collapse whitespace."""
+    text = _as_text(values)
+    for char in ("`", "'", '"'):
+        text = np.char.replace(text, char, "")
+    return np.array([" ".join(parts) for parts in np.char.split(text)], dtype=str)
+
+
+def normalize_phones(values: np.ndarray) -> np.ndarray:
+    """
+    10-digit mobile numbers ('' where there aren't at least 10 digits).
+    Numeric cells (Excel stores most phone numbers as numbers) are converted
+    as integers so a float like 9848645899.0 doesn't gain a digit; text keeps
+    only its digits; the last 10 digits are kept (drops +91 / leading 0).
+    """
+    numeric = np.array([isinstance(v, (int, float)) and not isinstance(v, bool) for v in values], dtype=bool)
+    text = _as_text(values)
+    if numeric.any():
+        text[numeric] = np.asarray(values[numeric], dtype=np.float64).astype(np.int64).astype(str)
+    digits = np.char.translate(text, _DIGITS_ONLY)
+    long_enough = np.char.str_len(digits) >= 10
+    if not len(digits):
+        return digits
+    # Right-align into fixed-width cells and take the last 10 characters
+    grid = np.char.rjust(digits.astype(f"<U{_PHONE_WIDTH}"), _PHONE_WIDTH).view("<U1").reshape(len(digits), _PHONE_WIDTH)
+    last10 = np.ascontiguousarray(grid[:, -10:]).view("<U10").ravel()
+    return np.where(long_enough, last10, "")
+
+
+def normalize_dates(values: np.ndarray) -> np.ndarray:
+    """ISO dates (object array, None where empty or unparseable)."""
+    out = np.full(len(values), None, dtype=object)
+    serial = np.array([isinstance(v, (int, float)) and not isinstance(v, bool) for v in values], dtype=bool)
+    if serial.any():
+        # Excel serial day numbers
+        days = np.asarray(values[serial], dtype=np.float64).astype("timedelta64[D]")
+        out[serial] = (_EXCEL_EPOCH + days).astype(str)
+    for i in np.flatnonzero(~serial):
+        value = values[i]
+        if isinstance(value, datetime):
+            out[i] = value.date().isoformat()
+        elif isinstance(value, date):
+            out[i] = value.isoformat()
+        elif value is not None and str(value).strip():
+            out[i] = _parse_date(str(value).strip())
+    return out
+
+
+def _parse_date(text: str) -> Optional[str]:
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def _canonical(values: np.ndarray, allowed: FrozenSet[str]) -> np.ndarray:
+    """Map case-insensitive matches onto the allowed spelling; others are returned as-is."""
+    lookup = {value.lower(): value for value in allowed}
+    return np.array([lookup.get(v.lower(), v) for v in values], dtype=object)
+
+
+# ── batch validation ────────────────────────────────────────────────────────
+
+def _normalize_batch(
+    raw: List[Sequence],
+    line_numbers: List[int],
+    positions: Dict[str, int],
+    schema: Dict[str, ColumnSpec],
+    default_role: Optional[str],
+    seen_phones: Dict[str, int],
+) -> Batch:
+    n = len(raw)
+    columns: Dict[str, np.ndarray] = {}
+    for name, index in positions.items():
+        column = np.empty(n, dtype=object)
+        column[:] = [row[index] if index < len(row) else None for row in raw]
+        columns[name] = column
+
+    empty = np.full(n, "", dtype=str)
+    cleaned: Dict[str, np.ndarray] = {}
+    for name, spec in schema.items():
+        values = columns.get(name)
+        if name == "full_name":
+            text = normalize_names(values) if values is not None else empty
+        elif name == "phone":
+            text = normalize_phones(values) if values is not None else empty
+        else:
+            text = _as_text(values) if values is not None else empty
+        if name == "role":
+            text = np.char.upper(text)
+            if default_role:
+                text = np.where(text == "", default_role, text)
+        if spec.allowed is not None:
+            text = _canonical(text, spec.allowed)
+        cleaned[name] = np.asarray(text, dtype=object)
+    for name in EXTRA_COLUMNS:
+        if name in columns:
+            cleaned[name] = normalize_dates(columns[name])
+
+    invalid = np.zeros(n, dtype=bool)
+    errors: List[RowError] = []
+
+    def flag(mask: np.ndarray, column: str, message: str) -> None:
+        for i in np.flatnonzero(mask & ~invalid):
+            errors.append(RowError(line_numbers[i], column, message))
+        invalid[mask] = True
+
+    for name, spec in schema.items():
+        blank = cleaned[name] == ""
+        if spec.required:
+            flag(blank, name, "Required")
+        if spec.allowed is not None:
+            flag(~blank & ~np.isin(cleaned[name], list(spec.allowed)), name, f"Must be one of: {', '.join(sorted(spec.allowed))}")
+
+    if "phone" in positions:
+        raw_phone = _as_text(columns["phone"])
+        flag((cleaned["phone"] == "") & (raw_phone != ""), "phone", "Not a 10-digit phone number")
+
+    if "date_of_birth" in cleaned:
+        given = _as_text(columns["date_of_birth"]) != ""
+        flag(given & np.equal(cleaned["date_of_birth"], None), "date_of_birth", "Unrecognised date")
+
+    # Phones double as login IDs: first occurrence in the file wins
+    rows: List[dict] = []
+    for i in range(n):
+        if invalid[i]:
+            continue
+        phone = cleaned["phone"][i] if "phone" in cleaned else None
+        if phone:
+            if phone in seen_phones:
+                errors.append(RowError(line_numbers[i], "phone", f"Duplicate phone (first used on row {seen_phones[phone]})"))
+                continue
+            seen_phones[phone] = line_numbers[i]
+        rows.append({name: (column[i] if column[i] != "" else None) for name, column in cleaned.items()})
+
+    errors.sort(key=lambda e: e.row)
+    return Batch(rows, errors)
+
+
+def iter_batches(
+    path: str,
+    sheet: Optional[str] = None,
+    schema: Optional[Dict[str, ColumnSpec]] = None,
+    default_role: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[Batch]:
+    """
+    Stream an onboarding sheet (default: 'Members', else the first sheet)
+    as validated batches of up to `batch_size` input rows.
+
+    The workbook is opened read-only and columns are matched by header name
+    against the template schema (HEADER_ALIASES covers the legacy 'Members
+    List.xlsx' headers such as Name / Cell No / DOB), so reordered or extra
+    columns don't matter. Each batch is normalized column by column. Blank
+    rows are skipped. Every yielded row has the schema's columns (plus any
+    EXTRA_COLUMNS present), with None for empty optional values.
+    `default_role` fills the role of rows (or whole sheets) that don't
+    specify one.
+    Raises IngestError if the sheet or a required column is missing.
+    """
+    schema = schema or load_schema()
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet is None:
+            sheet = "Members" if "Members" in wb.sheetnames else wb.sheetnames[0]
+        if sheet not in wb.sheetnames:
+            raise IngestError(f"Sheet '{sheet}' not found (sheets: {', '.join(wb.sheetnames)})")
+
+        rows = wb[sheet].iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        positions: Dict[str, int] = {}
+        for index, title in enumerate(header):
+            key = _header_key(title)
+            key = key if key in schema or key in EXTRA_COLUMNS else HEADER_ALIASES.get(key, key)
+            if (key in schema or key in EXTRA_COLUMNS) and key not in positions:
+                positions[key] = index
+
+        missing = [
+            name for name, spec in schema.items()
+            if spec.required and name not in positions and not (name == "role" and default_role)
+        ]
+        if missing:
+            found = ", ".join(str(h).strip() for h in header if h) or "none"
+            raise IngestError(f"Sheet '{sheet}' is missing required column(s): {', '.join(missing)} (found: {found})")
+
+        seen_phones: Dict[str, int] = {}
+        raw: List[Sequence] = []
+        line_numbers: List[int] = []
+        for line, row in enumerate(rows, start=2):
+            if not any(cell is not None and str(cell).strip() for cell in row):
+                continue
+            raw.append(row)
+            line_numbers.append(line)
+            if len(raw) >= batch_size:
+                yield _normalize_batch(raw, line_numbers, positions, schema, default_role, seen_phones)
+                raw, line_numbers = [], []
+        if raw:
+            yield _normalize_batch(raw, line_numbers, positions, schema, default_role, seen_phones)
+    finally:
+        wb.close()
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 class MemberApprovalRequest(BaseModel):
     user_id: str
@@ -7,6 +7,9 @@ class MemberApprovalRequest(BaseModel):
     admin_notes: Optional[str] = None
     role: Optional[str] = None # 'PERMANENT', 'NORMAL', 'ASSOCIATED'
 
+class BulkApprovalRequest(BaseModel):
+    requests: List[MemberApprovalRequest] = Field(..., min_length=1, max_length=500)
+
 class ManualMemberCreate(BaseModel):
     phone: str
     full_name: str
@@ -14,6 +17,13 @@ class ManualMemberCreate(BaseModel):
     zonal_committee: Optional[str] = None
     regional_committee: Optional[str] = None
 
+class BulkMemberCreate(BaseModel):
+    members: List[ManualMemberCreate] = Field(..., min_length=1, max_length=500)
+
+class ReserveMemberIdsRequest(BaseModel):
+    role: str # 'PERMANENT', 'NORMAL', 'ASSOCIATED'
+    count: int = Field(..., ge=1, le=1000)
+
 class ResetPINRequest(BaseModel):
     user_id: str
 
@@ -25,3 +35,7 @@ class RenewMembershipRequest(BaseModel):
     user_id: str
     request_id: Optional[str] = None  # membership_request id (for renewal requests)
     admin_notes: Optional[str] = None
+
+class PhotoGCRequest(BaseModel):
+    dry_run: bool = True  # report only; set False to delete
+    grace_hours: int = Field(24, ge=1)  # keep recent uploads not yet on a profile
@@ -1,34 +1,47 @@
 import logging
+from collections import Counter, defaultdict
 from datetime import datetime, date, timezone, timedelta
+from typing import Dict, List
 from fastapi import APIRouter, Depends, HTTPException, status
-from app.auth.dependencies import require_admin
-from app.db import get_supabase_client, run_query
-from app.admin.models import MemberApprovalRequest, ManualMemberCreate, ResetPINRequest, MatrimonyApprovalRequest, RenewMembershipRequest
-from app.auth.utils import hash_pin
-
-# Membership registration fee by role (₹)
-MEMBERSHIP_FEES = {
-    "PERMANENT": 5000,
-    "NORMAL":    100,
-    "ASSOCIATED": 500,
-}
+from app.auth.dependencies import require_admin, invalidate_user, get_user_cache_stats, get_token_version_stats
+from app.db import get_supabase_client, run_query, get_pool_stats
+from app.admin.models import MemberApprovalRequest, BulkApprovalRequest, ManualMemberCreate, BulkMemberCreate, ResetPINRequest, MatrimonyApprovalRequest, RenewMembershipRequest, PhotoGCRequest, ReserveMemberIdsRequest
+from app.auth.utils import hash_pin_async, pin_hasher
+from app.members.directory import member_directory, directory_resync
+from app.matrimony.scoring import match_index, match_index_resync
+from app.matrimony.images import image_processor
+from app.matrimony.photo_store import collect_garbage
+from app.accounts.backfill import FEE_CONFLICT_COLUMNS, MEMBERSHIP_FEES, membership_fee_key
+from app.articles.janitor import article_janitor, article_cleanup
+from app.articles.feed import article_feed
+
+
+def _membership_fee_row(role: str, user_id: str, admin_id: str, member_id: str):
+    """INCOME transaction for the registration fee, or None if the role has no fee."""
+    fee = MEMBERSHIP_FEES.get(role)
+    if not fee:
+        return None
+    return {
+        "type":               "INCOME",
+        "category":           "MEMBERSHIP_FEE",
+        "amount":             fee,
+        "description":        f"Registration fee — {member_id} ({role})",
+        "reference_user_id":  user_id,
+        "recorded_by":        admin_id,
+        "transaction_date":   date.today().isoformat(),
+        "fee_key":            membership_fee_key(role, member_id),
+    }
 
 
 async def _record_membership_fee(supabase, role: str, user_id: str, admin_id: str, member_id: str):
     """Insert an INCOME transaction for the registration fee on membership approval."""
-    fee = MEMBERSHIP_FEES.get(role)
-    if not fee:
+    row = _membership_fee_row(role, user_id, admin_id, member_id)
+    if not row:
         return
     await run_query(
-        lambda: supabase.table("transactions").insert({
-            "type":               "INCOME",
-            "category":           "MEMBERSHIP_FEE",
-            "amount":             fee,
-            "description":        f"Registration fee — {member_id} ({role})",
-            "reference_user_id":  user_id,
-            "recorded_by":        admin_id,
-            "transaction_date":   date.today().isoformat(),
-        }).execute()
+        lambda: supabase.table("transactions")
+        .upsert(row, on_conflict=FEE_CONFLICT_COLUMNS, ignore_duplicates=True)
+        .execute()
     )
 
 logger = logging.getLogger(__name__)
@@ -51,26 +64,51 @@ def _membership_expiry() -> str:
     return (datetime.now(timezone.utc) + timedelta(days=365)).isoformat()
 
 
-async def _generate_member_id(supabase, role: str) -> str:
-    """
-    Generate a human-readable member ID (e.g. PID-003).
-    Derives the next number from the highest existing member_id with
-    the same prefix, so gaps or out-of-order inserts never cause duplicates.
-    """
-    prefix = ROLE_PREFIXES.get(role, "GEN")
+async def _reserve_member_ids(supabase, prefix: str, count: int) -> List[str]:
+    """Atomically reserve `count` consecutive member IDs for a prefix (one RPC)."""
     result = await run_query(
-        lambda: supabase.table("users")
-        .select("member_id")
-        .like("member_id", f"{prefix}-%")
-        .execute()
+        lambda: supabase.rpc("allocate_member_ids", {"p_prefix": prefix, "p_count": count}).execute()
     )
-    max_num = 0
-    for row in (result.data or []):
-        mid = row.get("member_id", "")
-        parts = mid.split("-")
-        if len(parts) == 2 and parts[1].isdigit():
-            max_num = max(max_num, int(parts[1]))
-    return f"{prefix}-{max_num + 1:03d}"
+    member_ids = [row["member_id"] for row in (result.data or [])]
+    if len(member_ids) != count:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to allocate member IDs")
+    return member_ids
+
+
+async def _allocate_member_ids(supabase, roles: List[str]) -> List[str]:
+    """
+    Allocate one human-readable member ID (e.g. PID-003) per entry in
+    `roles`, in order. IDs come from the per-prefix counters in
+    member_id_counters (see app/db/migration_member_id_counters.sql), one
+    block reservation per prefix, so concurrent approvals never collide.
+    """
+    prefixes = [ROLE_PREFIXES.get(role, "GEN") for role in roles]
+    blocks = {
+        prefix: iter(await _reserve_member_ids(supabase, prefix, count))
+        for prefix, count in Counter(prefixes).items()
+    }
+    return [next(blocks[prefix]) for prefix in prefixes]
+
+
+async def _generate_member_id(supabase, role: str) -> str:
+    """Generate the next member ID for a single role."""
+    return (await _allocate_member_ids(supabase, [role]))[0]
+
+
+@router.get("/metrics")
+async def get_metrics(admin: dict = Depends(require_admin)):
+    """Runtime metrics for capacity tuning (admin only)."""
+    return {
+        "db_pool": get_pool_stats(),
+        "user_cache": get_user_cache_stats(),
+        "token_versions": get_token_version_stats(),
+        "pin_hasher": pin_hasher.stats(),
+        "image_processor": image_processor.stats(),
+        "member_directory": {**member_directory.stats(), "resync": directory_resync.stats()},
+        "match_index": {**match_index.stats(), "resync": match_index_resync.stats()},
+        "article_feed": article_feed.stats(),
+        "article_cleanup": {**article_janitor.stats(), "schedule": article_cleanup.stats()},
+    }
 
 
 @router.get("/pending-requests")
@@ -142,6 +180,7 @@ async def approve_request(
     await run_query(
         lambda: supabase.table("users").update(user_update).eq("id", request.user_id).execute()
     )
+    invalidate_user(request.user_id)
 
     # Update membership request by its own ID (not user_id) to avoid touching wrong rows
     await run_query(
@@ -153,11 +192,179 @@ async def approve_request(
 
     # Auto-record registration fee in accounts
     await _record_membership_fee(supabase, final_role, request.user_id, admin["id"], new_member_id)
+    await member_directory.refresh_users([request.user_id])
 
     logger.info("Admin %s approved user %s — role=%s member_id=%s", admin["id"], request.user_id, final_role, new_member_id)
     return {"message": "User approved successfully", "member_id": new_member_id, "role": final_role}
 
 
+@router.post("/approve-requests")
+async def approve_requests(
+    request: BulkApprovalRequest,
+    admin: dict = Depends(require_admin),
+):
+    """
+    Approve or reject many membership requests in one call (admin only).
+
+    Same rules as /approve-request, applied with a fixed number of round
+    trips regardless of batch size: one read each for pending requests and
+    current users, one member ID block reservation per prefix, then bulk
+    writes for users, membership requests and fee transactions.
+    Returns one result per input item, in order.
+    """
+    supabase = get_supabase_client()
+    items = request.requests
+    results: List[dict] = [{"user_id": item.user_id} for item in items]
+
+    # A user may appear once per batch
+    seen = Counter(item.user_id for item in items)
+    active = []
+    for index, item in enumerate(items):
+        if seen[item.user_id] > 1:
+            results[index].update(status="error", detail="Duplicate user_id in batch")
+        else:
+            active.append(index)
+
+    user_ids = [items[i].user_id for i in active]
+    if not user_ids:
+        return {"results": results, "summary": dict(Counter(r["status"] for r in results))}
+    pending_res = await run_query(
+        lambda: supabase.table("membership_requests")
+        .select("id, user_id, requested_role, created_at")
+        .in_("user_id", user_ids)
+        .eq("approval_status", "PENDING")
+        .order("created_at", desc=True)
+        .execute()
+    )
+    latest_request: Dict[str, dict] = {}
+    for row in (pending_res.data or []):
+        latest_request.setdefault(row["user_id"], row)
+
+    rejects, approves = [], []
+    for index in active:
+        item = items[index]
+        if item.user_id not in latest_request:
+            results[index].update(status="error", detail="No pending membership request found")
+        elif item.action == "REJECT":
+            rejects.append(index)
+        else:
+            approves.append(index)
+
+    # Rejections: one update per distinct admin note (usually one)
+    by_notes = defaultdict(list)
+    for index in rejects:
+        by_notes[items[index].admin_notes].append(items[index].user_id)
+    for notes, ids in by_notes.items():
+        await run_query(
+            lambda: supabase.table("membership_requests")
+            .update({"approval_status": "REJECTED", "admin_notes": notes})
+            .in_("user_id", ids)
+            .eq("approval_status", "PENDING")
+            .execute()
+        )
+    for index in rejects:
+        results[index].update(status="rejected")
+
+    if approves:
+        approve_ids = [items[i].user_id for i in approves]
+        users_res = await run_query(
+            lambda: supabase.table("users").select("id, identifier, role").in_("id", approve_ids).execute()
+        )
+        users = {row["id"]: row for row in (users_res.data or [])}
+        missing = [i for i in approves if items[i].user_id not in users]
+        for index in missing:
+            results[index].update(status="error", detail="User not found")
+        approves = [i for i in approves if items[i].user_id in users]
+
+    if approves:
+        roles = [items[i].role or latest_request[items[i].user_id]["requested_role"] for i in approves]
+        member_ids = await _allocate_member_ids(supabase, roles)
+        now = _now_utc()
+
+        # Upsert payloads must share one set of keys, so perpetual roles
+        # (no membership expiry) go in a separate batch
+        user_rows = defaultdict(list)
+        fee_rows = []
+        for index, role, member_id in zip(approves, roles, member_ids):
+            user = users[items[index].user_id]
+            final_role = "HEAD" if user.get("role") == "HEAD" else role
+            row = {
+                "id": user["id"],
+                "identifier": user["identifier"],
+                "role": final_role,
+                "status": "ACTIVE",
+                "member_id": member_id,
+                "updated_at": now,
+            }
+            if final_role not in PERPETUAL_ROLES:
+                row["membership_expires_at"] = _membership_expiry()
+            user_rows[final_role in PERPETUAL_ROLES].append(row)
+            fee = _membership_fee_row(final_role, user["id"], admin["id"], member_id)
+            if fee:
+                fee_rows.append(fee)
+            results[index].update(member_id=member_id, role=final_role)
+
+        try:
+            for rows in user_rows.values():
+                await run_query(lambda: supabase.table("users").upsert(rows, on_conflict="id").execute())
+        except Exception as exc:
+            # Nothing else was written; the reserved IDs are skipped
+            logger.error("Bulk approval user update failed: %s", exc)
+            for index in approves:
+                results[index] = {"user_id": items[index].user_id, "status": "error", "detail": "Failed to update user; retry"}
+            approves = []
+
+    if approves:
+        for index in approves:
+            invalidate_user(items[index].user_id)
+
+        approved_by_notes = defaultdict(list)
+        for index in approves:
+            approved_by_notes[items[index].admin_notes].append(latest_request[items[index].user_id]["id"])
+        for notes, request_ids in approved_by_notes.items():
+            await run_query(
+                lambda: supabase.table("membership_requests")
+                .update({"approval_status": "APPROVED", "admin_notes": notes})
+                .in_("id", request_ids)
+                .execute()
+            )
+
+        if fee_rows:
+            await run_query(
+                lambda: supabase.table("transactions")
+                .upsert(fee_rows, on_conflict=FEE_CONFLICT_COLUMNS, ignore_duplicates=True)
+                .execute()
+            )
+        await member_directory.refresh_users([items[i].user_id for i in approves])
+        for index in approves:
+            results[index]["status"] = "approved"
+
+    counts = Counter(result["status"] for result in results)
+    logger.info(
+        "Admin %s bulk-processed %d requests: %d approved, %d rejected, %d errors",
+        admin["id"], len(items), counts["approved"], counts["rejected"], counts["error"],
+    )
+    return {"results": results, "summary": dict(counts)}
+
+
+@router.post("/member-ids/reserve")
+async def reserve_member_ids(
+    request: ReserveMemberIdsRequest,
+    admin: dict = Depends(require_admin),
+):
+    """
+    Reserve a block of consecutive member IDs for a role (admin only), e.g.
+    to pre-assign IDs on an onboarding sheet. Reserved IDs are never handed
+    out again; unused ones simply leave a gap.
+    """
+    if request.role not in ROLE_PREFIXES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid role")
+    supabase = get_supabase_client()
+    member_ids = await _reserve_member_ids(supabase, ROLE_PREFIXES[request.role], request.count)
+    logger.info("Admin %s reserved %d %s member IDs (%s … %s)", admin["id"], request.count, request.role, member_ids[0], member_ids[-1])
+    return {"role": request.role, "member_ids": member_ids}
+
+
 @router.post("/create-member")
 async def create_manual_member(
     request: ManualMemberCreate,
@@ -179,7 +386,7 @@ async def create_manual_member(
         logger.info("Manual member creation: found existing user %s", user_id)
     else:
         # Create a new user shell with the default PIN (1234)
-        hashed_pin = hash_pin("1234")
+        hashed_pin = await hash_pin_async("1234")
         clean_phone = "".join(filter(str.isdigit, request.phone))
 
         new_user = {
@@ -218,6 +425,7 @@ async def create_manual_member(
     await run_query(
         lambda: supabase.table("users").update(update_data).eq("id", user_id).execute()
     )
+    invalidate_user(user_id)
 
     # Create an audit record in membership_requests
     record = {
@@ -232,10 +440,244 @@ async def create_manual_member(
 
     # Auto-record registration fee in accounts
     await _record_membership_fee(supabase, request.role, user_id, admin["id"], new_member_id)
+    await member_directory.refresh_users([user_id])
 
     logger.info("Admin %s manually created member %s (%s)", admin["id"], new_member_id, user_id)
     return {"message": "Member created successfully", "member_id": new_member_id, "user_id": user_id}
 
+
+def _group_by_keys(rows: List[dict]) -> List[List[dict]]:
+    """Split rows into batches sharing one key set (PostgREST bulk writes need uniform keys)."""
+    groups = defaultdict(list)
+    for row in rows:
+        groups[tuple(sorted(row))].append(row)
+    return list(groups.values())
+
+
+async def _membership_records(supabase, user_ids: List[str]):
+    """
+    What a member's approval left behind: (user_id, role) pairs with an
+    APPROVED membership request, (user_id, fee_key) pairs with a fee row,
+    and the users with fee rows that predate fee_key (treated as paid).
+    """
+    requests = await run_query(
+        lambda: supabase.table("membership_requests")
+        .select("user_id, requested_role")
+        .in_("user_id", user_ids)
+        .eq("approval_status", "APPROVED")
+        .execute()
+    )
+    fees = await run_query(
+        lambda: supabase.table("transactions")
+        .select("reference_user_id, fee_key")
+        .in_("reference_user_id", user_ids)
+        .eq("category", "MEMBERSHIP_FEE")
+        .execute()
+    )
+    approved = {(row["user_id"], row["requested_role"]) for row in (requests.data or [])}
+    paid = {(row["reference_user_id"], row["fee_key"]) for row in (fees.data or [])}
+    unkeyed = {user_id for user_id, key in paid if key is None}
+    return approved, paid, unkeyed
+
+
+@router.post("/create-members")
+async def create_manual_members(
+    request: BulkMemberCreate,
+    admin: dict = Depends(require_admin),
+):
+    """
+    Create or upgrade many members in one call (admin only).
+
+    Same rules as /create-member, with a fixed number of round trips per
+    batch: one lookup of existing users by phone, one hash of the default
+    PIN for new users, one member ID block reservation per prefix, then bulk
+    writes for users, membership requests and fee transactions. Existing
+    users who are already ACTIVE in the requested role with a member ID,
+    an APPROVED request and their fee are reported as "exists" and left
+    untouched. If an earlier attempt stopped after writing the user, the
+    missing request or fee is written now (reported as "updated"), and a
+    failed request/fee write is reported per member instead of failing the
+    batch, so a batch can be safely retried. Returns one result per input
+    member, in order.
+    """
+    supabase = get_supabase_client()
+    items = request.members
+    phones = ["".join(filter(str.isdigit, item.phone)) for item in items]
+    results: List[dict] = [{"phone": phone, "full_name": item.full_name} for phone, item in zip(phones, items)]
+
+    seen = Counter(phones)
+    # Already-current members whose approval request / fee is still missing
+    repairs: List[int] = []
+    missing_request, missing_fee = set(), set()
+    update_data: Dict[int, dict] = {}
+    user_ids: Dict[str, str] = {}
+    active = []
+    for index, item in enumerate(items):
+        if item.role not in ROLE_PREFIXES:
+            results[index].update(status="error", detail="Invalid role")
+        elif not phones[index]:
+            results[index].update(status="error", detail="Invalid phone")
+        elif seen[phones[index]] > 1:
+            results[index].update(status="error", detail="Duplicate phone in batch")
+        else:
+            active.append(index)
+
+    if active:
+        existing_res = await run_query(
+            lambda: supabase.table("users")
+            .select("id, identifier, phone, role, status, member_id")
+            .in_("phone", [phones[i] for i in active])
+            .execute()
+        )
+        existing = {row["phone"]: row for row in (existing_res.data or [])}
+
+        current = []
+        for index in active:
+            user = existing.get(phones[index])
+            if user and user.get("status") == "ACTIVE" and user.get("role") == items[index].role and user.get("member_id"):
+                current.append(index)
+
+        if current:
+            approved, paid, unkeyed = await _membership_records(
+                supabase, [existing[phones[i]]["id"] for i in current]
+            )
+            for index in current:
+                user, role = existing[phones[index]], items[index].role
+                fee_key = membership_fee_key(role, user["member_id"])
+                results[index].update(user_id=user["id"], member_id=user["member_id"])
+                if (user["id"], role) not in approved:
+                    missing_request.add(index)
+                if role in MEMBERSHIP_FEES and (user["id"], fee_key) not in paid and user["id"] not in unkeyed:
+                    missing_fee.add(index)
+                if index in missing_request or index in missing_fee:
+                    repairs.append(index)
+                else:
+                    results[index]["status"] = "exists"
+        active = [i for i in active if i not in current]
+
+    if active:
+        member_ids = await _allocate_member_ids(supabase, [items[i].role for i in active])
+        new_count = sum(1 for i in active if phones[i] not in existing)
+        hashed_pin = await hash_pin_async("1234") if new_count else None
+        now = _now_utc()
+
+        new_rows, existing_rows = [], []
+        for index, member_id in zip(active, member_ids):
+            item = items[index]
+            data = {
+                "full_name": item.full_name,
+                "role": item.role,
+                "status": "ACTIVE",
+                "member_id": member_id,
+                "updated_at": now,
+            }
+            if item.role not in PERPETUAL_ROLES:
+                data["membership_expires_at"] = _membership_expiry()
+            if item.zonal_committee:
+                data["zonal_committee"] = item.zonal_committee
+            if item.regional_committee:
+                data["regional_committee"] = item.regional_committee
+            update_data[index] = data
+
+            user = existing.get(phones[index])
+            if user:
+                existing_rows.append({"id": user["id"], "identifier": user["identifier"], **data})
+            else:
+                # New users start with the default PIN (1234)
+                new_rows.append({"identifier": phones[index], "phone": phones[index], "pin_hash": hashed_pin, **data})
+            results[index]["member_id"] = member_id
+
+        user_ids.update({user["phone"]: user["id"] for user in existing.values()})
+        phone_by_id = {user_id: phone for phone, user_id in user_ids.items()}
+        failed_phones = set()
+        for rows in _group_by_keys(existing_rows):
+            try:
+                await run_query(lambda: supabase.table("users").upsert(rows, on_conflict="id").execute())
+            except Exception as exc:
+                logger.error("Bulk member creation: user update failed: %s", exc)
+                failed_phones.update(phone_by_id[r["id"]] for r in rows)
+        for rows in _group_by_keys(new_rows):
+            try:
+                inserted = await run_query(lambda: supabase.table("users").insert(rows).execute())
+                user_ids.update({user["phone"]: user["id"] for user in (inserted.data or [])})
+            except Exception as exc:
+                # e.g. a phone registered concurrently; the reserved IDs are skipped
+                logger.error("Bulk member creation: user insert failed: %s", exc)
+                failed_phones.update(r["phone"] for r in rows)
+
+        written = []
+        for index in active:
+            if phones[index] in failed_phones or phones[index] not in user_ids:
+                results[index] = {**results[index], "status": "error", "detail": "Failed to write user; retry"}
+                results[index].pop("member_id", None)
+            else:
+                written.append(index)
+        active = written
+
+    for index in repairs:
+        user = existing[phones[index]]
+        user_ids[phones[index]] = user["id"]
+        update_data[index] = {"full_name": items[index].full_name, "role": items[index].role, "status": "ACTIVE", "member_id": user["member_id"]}
+    missing_request.update(active)
+    missing_fee.update(active)
+    written = active + repairs
+
+    if written:
+        records, fee_rows = [], []
+        for index in written:
+            item, user_id = items[index], user_ids[phones[index]]
+            member_id = results[index]["member_id"]
+            invalidate_user(user_id)
+            if index in missing_request:
+                records.append({
+                    "user_id": user_id,
+                    "requested_role": item.role,
+                    "application_data": update_data[index],
+                    "payment_status": "PAID",
+                    "approval_status": "APPROVED",
+                    "admin_notes": f"Manually added by admin {admin['id']}",
+                })
+            fee = _membership_fee_row(item.role, user_id, admin["id"], member_id) if index in missing_fee else None
+            if fee:
+                fee_rows.append(fee)
+            results[index].update(
+                status="updated" if phones[index] in existing else "created",
+                user_id=user_id,
+            )
+
+        # The users are saved; a failure here is reported per member and the
+        # retry fills in whatever is still missing
+        failed: Dict[str, str] = {}
+        if records:
+            try:
+                await run_query(lambda: supabase.table("membership_requests").insert(records).execute())
+            except Exception as exc:
+                logger.error("Bulk member creation: membership request insert failed: %s", exc)
+                failed.update((row["user_id"], "Member saved but the approval record failed; retry") for row in records)
+        if fee_rows:
+            try:
+                await run_query(
+                    lambda: supabase.table("transactions")
+                    .upsert(fee_rows, on_conflict=FEE_CONFLICT_COLUMNS, ignore_duplicates=True)
+                    .execute()
+                )
+            except Exception as exc:
+                logger.error("Bulk member creation: fee upsert failed: %s", exc)
+                for row in fee_rows:
+                    failed.setdefault(row["reference_user_id"], "Member saved but the membership fee failed; retry")
+        for index in written:
+            detail = failed.get(user_ids[phones[index]])
+            if detail:
+                results[index].update(status="error", detail=detail)
+        await member_directory.refresh_users([user_ids[phones[i]] for i in written])
+
+    counts = Counter(result["status"] for result in results)
+    logger.info(
+        "Admin %s bulk-created %d members: %d created, %d updated, %d existing, %d errors",
+        admin["id"], len(items), counts["created"], counts["updated"], counts["exists"], counts["error"],
+    )
+    return {"results": results, "summary": dict(counts)}
+
 @router.post("/reset-pin")
 async def reset_pin(
     request: ResetPINRequest,
@@ -253,7 +695,7 @@ async def reset_pin(
 
     role = result.data[0].get("role")
     new_pin = "2244" if role == "PERMANENT" else "1234"
-    new_hash = hash_pin(new_pin)
+    new_hash = await hash_pin_async(new_pin)
 
     # 2. Update pin_hash
     await run_query(
@@ -262,6 +704,7 @@ async def reset_pin(
         .eq("id", request.user_id)
         .execute()
     )
+    invalidate_user(request.user_id)
 
     logger.info("Admin %s reset PIN for user %s to default", admin["id"], request.user_id)
     return {"message": f"PIN reset to {new_pin} successfully"}
@@ -299,6 +742,7 @@ async def renew_membership(
         .eq("id", request.user_id)
         .execute()
     )
+    invalidate_user(request.user_id)
 
     # Mark renewal request as approved if provided
     if request.request_id:
@@ -309,6 +753,8 @@ async def renew_membership(
             .execute()
         )
 
+    await member_directory.refresh_users([request.user_id])
+
     logger.info("Admin %s renewed membership for user %s", admin["id"], request.user_id)
     return {"message": "Membership renewed for 1 year"}
 
@@ -350,7 +796,20 @@ async def approve_matrimony(
         .eq("id", request.profile_id)
         .execute()
     )
+    await match_index.refresh_profiles([request.profile_id])
 
     action_str = "approved" if request.action == "APPROVE" else "rejected"
     logger.info("Admin %s %s matrimony profile %s", admin["id"], action_str, request.profile_id)
     return {"message": f"Matrimony profile {action_str} successfully"}
+
+
+@router.post("/matrimony-photos/gc")
+async def collect_matrimony_photo_garbage(
+    request: PhotoGCRequest,
+    admin: dict = Depends(require_admin),
+):
+    """Remove matrimony-photos objects no profile references (admin only).
+    Defaults to a dry run that only reports what would be deleted."""
+    report = await collect_garbage(dry_run=request.dry_run, grace_hours=request.grace_hours)
+    logger.info("Admin %s ran matrimony photo GC (dry_run=%s)", admin["id"], request.dry_run)
+    return report
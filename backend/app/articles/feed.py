@@ -0,0 +1,148 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.config import settings
+from app.db import get_supabase_client, run_query
+
+logger = logging.getLogger(__name__)
+
+FEED_COLUMNS = "id, title, summary, pdf_url, category, published_at, expires_at, submitted_by"
+
+
+def _parse_ts(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _key(article: dict) -> Tuple[str, str]:
+    return (article["published_at"] or "", article["id"])
+
+
+def encode_cursor(article: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(_key(article))).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        published_at, article_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(published_at), str(article_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+class ArticleFeed:
+    """
+    In-process copy of the published-article feed served by GET /articles.
+
+    Loaded from Supabase on first use, then held until an admin publishes,
+    reviews, deletes or cleans up articles (those routes call invalidate()).
+    Articles leave the feed locally when their expires_at passes, so expiry
+    needs no reload. Other workers' writes are picked up after
+    `ttl_seconds`, the same bound as the other per-worker caches.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._articles: Optional[List[dict]] = None
+        self._loaded_at = 0.0
+        self._next_expiry: Optional[datetime] = None
+        self._content_tag = ""
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.invalidations = 0
+        self.expired = 0
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        if self._loaded_at:
+            self.invalidations += 1
+        self._loaded_at = 0.0
+
+    def _fresh(self) -> bool:
+        return bool(self._loaded_at) and time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    def _set(self, articles: List[dict]) -> None:
+        self._articles = articles
+        expiries = [_parse_ts(a["expires_at"]) for a in articles if a.get("expires_at")]
+        self._next_expiry = min(expiries) if expiries else None
+        digest = hashlib.sha1()
+        for article in articles:
+            digest.update(f"{article['id']}:{article['published_at']};".encode("utf-8"))
+        self._content_tag = digest.hexdigest()
+
+    def _evict_expired(self) -> None:
+        """Drop articles whose expires_at has passed (checked against the earliest one)."""
+        now = datetime.now(timezone.utc)
+        if self._next_expiry is None or now < self._next_expiry:
+            return
+        live = [a for a in self._articles if not a.get("expires_at") or _parse_ts(a["expires_at"]) > now]
+        self.expired += len(self._articles) - len(live)
+        self._set(live)
+
+    async def _load(self) -> None:
+        supabase = get_supabase_client()
+        generation = self._generation
+        now = datetime.now(timezone.utc).isoformat()
+        result = await run_query(
+            lambda: supabase.table("articles")
+            .select(FEED_COLUMNS)
+            .eq("status", "PUBLISHED")
+            .gt("expires_at", now)
+            .order("published_at", desc=True)
+            .order("id", desc=True)
+            .execute()
+        )
+        self.loads += 1
+        self._set(result.data or [])
+        # An invalidation while the query ran means the result may predate that
+        # write: serve it to this request only and reload on the next one
+        self._loaded_at = time.monotonic() if generation == self._generation else 0.0
+
+    async def snapshot(self) -> Tuple[List[dict], str]:
+        """Current feed (newest first) and a digest of its contents for ETags."""
+        if self._fresh():
+            self.hits += 1
+        else:
+            async with self._lock:
+                if not self._fresh():
+                    await self._load()
+        self._evict_expired()
+        return self._articles, self._content_tag
+
+    @staticmethod
+    def page(articles: List[dict], cursor: Optional[str], limit: Optional[int]) -> Tuple[List[dict], Optional[str]]:
+        """Keyset page of a snapshot; the cursor is the (published_at, id) of the last row seen."""
+        start = 0
+        if cursor:
+            key = decode_cursor(cursor)
+            start = next((i for i, a in enumerate(articles) if _key(a) < key), len(articles))
+        if not limit:
+            return articles[start:], None
+        rows = articles[start:start + limit]
+        next_cursor = encode_cursor(rows[-1]) if start + limit < len(articles) else None
+        return rows, next_cursor
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self._fresh(),
+            "size": len(self._articles or []),
+            "ttl_seconds": self.ttl_seconds,
+            "next_expiry": self._next_expiry.isoformat() if self._next_expiry else None,
+            "hits": self.hits,
+            "loads": self.loads,
+            "invalidations": self.invalidations,
+            "expired": self.expired,
+        }
+
+
+article_feed = ArticleFeed(settings.article_feed_ttl_seconds)
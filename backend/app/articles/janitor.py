@@ -0,0 +1,90 @@
+import logging
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.db import get_supabase_client, run_query
+from app.tasks import PeriodicTask
+from app.articles.feed import article_feed
+
+logger = logging.getLogger(__name__)
+
+BUCKET = "articles"
+CLEANUP_BATCH_SIZE = 200    # rows per round; ids go in one PostgREST in.() filter
+REMOVE_BATCH_SIZE = 100     # paths per storage remove call
+
+
+class ArticleJanitor:
+    """
+    Deletes expired articles and their PDFs.
+
+    Expired rows are processed in rounds of CLEANUP_BATCH_SIZE: the round's
+    files are removed from storage in chunks, then its rows go in a single
+    DELETE ... WHERE id IN (...). If storage removal fails the rows are kept,
+    so the next run retries them instead of leaving orphaned PDFs.
+    Runs on the `article_cleanup` schedule and from POST /articles/cleanup.
+    """
+
+    def __init__(self):
+        self.rows_deleted = 0
+        self.files_removed = 0
+        self.bytes_reclaimed = 0
+        self.last_result: dict = {}
+
+    async def run(self) -> dict:
+        supabase = get_supabase_client()
+        now = datetime.now(timezone.utc).isoformat()
+        deleted = files = reclaimed = 0
+
+        while True:
+            expired = await run_query(
+                lambda: supabase.table("articles")
+                .select("id, pdf_path")
+                .lt("expires_at", now)
+                .limit(CLEANUP_BATCH_SIZE)
+                .execute()
+            )
+            rows = expired.data or []
+            if not rows:
+                break
+
+            paths = [a["pdf_path"] for a in rows if a.get("pdf_path")]
+            for start in range(0, len(paths), REMOVE_BATCH_SIZE):
+                batch = paths[start:start + REMOVE_BATCH_SIZE]
+                removed = await run_query(lambda: supabase.storage.from_(BUCKET).remove(batch))
+                # Storage returns the deleted objects; missing files are simply absent
+                for obj in removed or []:
+                    files += 1
+                    reclaimed += int((obj.get("metadata") or {}).get("size") or 0)
+
+            ids = [a["id"] for a in rows]
+            await run_query(
+                lambda: supabase.table("articles").delete().in_("id", ids).execute()
+            )
+            deleted += len(ids)
+            if len(rows) < CLEANUP_BATCH_SIZE:
+                break
+
+        self.rows_deleted += deleted
+        self.files_removed += files
+        self.bytes_reclaimed += reclaimed
+        self.last_result = {"deleted": deleted, "files_removed": files, "bytes_reclaimed": reclaimed}
+        if deleted:
+            article_feed.invalidate()
+            logger.info("Cleanup: deleted %d expired articles (%d files, %d bytes)", deleted, files, reclaimed)
+        return self.last_result
+
+    def stats(self) -> dict:
+        return {
+            "rows_deleted": self.rows_deleted,
+            "files_removed": self.files_removed,
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "last_result": self.last_result,
+        }
+
+
+article_janitor = ArticleJanitor()
+article_cleanup = PeriodicTask(
+    "article-cleanup",
+    settings.article_cleanup_interval_seconds,
+    article_janitor.run,
+)
@@ -1,30 +1,48 @@
 import logging
 from datetime import datetime, timedelta, timezone
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from app.auth.dependencies import require_active_status, require_admin
 from app.db import get_supabase_client, run_query
 from app.articles.models import ArticleSubmitRequest, ArticlePublishRequest, ArticleReviewRequest
+from app.articles.janitor import article_janitor
+from app.articles.feed import article_feed
+from app.http_cache import make_etag, is_not_modified, not_modified
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+FEED_MAX_PAGE_SIZE = 100
+# Members-only content: browsers may keep it but must revalidate every time
+FEED_CACHE_CONTROL = "private, no-cache"
+
 
 @router.get("")
 async def list_published_articles(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="From X-Next-Cursor of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=FEED_MAX_PAGE_SIZE, description="Page size; omit for the full feed"),
     current_user: dict = Depends(require_active_status),
 ):
-    """List all currently published (non-expired) articles."""
-    supabase = get_supabase_client()
-    now = datetime.now(timezone.utc).isoformat()
-    result = await run_query(
-        lambda: supabase.table("articles")
-        .select("id, title, summary, pdf_url, category, published_at, expires_at, submitted_by")
-        .eq("status", "PUBLISHED")
-        .gt("expires_at", now)
-        .order("published_at", desc=True)
-        .execute()
-    )
-    return result.data
+    """
+    List all currently published (non-expired) articles, newest first.
+
+    Served from the in-process feed cache. Pass `limit` to paginate; the
+    next page's cursor is in X-Next-Cursor. Responses carry an ETag, so
+    conditional requests get 304 Not Modified.
+    """
+    articles, content_tag = await article_feed.snapshot()
+    etag = make_etag("articles", content_tag, cursor, limit)
+    if is_not_modified(request, etag):
+        return not_modified(etag, FEED_CACHE_CONTROL)
+
+    rows, next_cursor = article_feed.page(articles, cursor, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = FEED_CACHE_CONTROL
+    return rows
 
 
 @router.get("/my-submissions")
@@ -108,6 +126,7 @@ async def publish_article(
     )
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to publish article")
+    article_feed.invalidate()
     logger.info("Admin %s published article: %s", current_user["id"], request.title)
     return {"message": "Article published.", "id": result.data[0]["id"]}
 
@@ -155,6 +174,7 @@ async def review_article(
     await run_query(
         lambda: supabase.table("articles").update(update).eq("id", article_id).execute()
     )
+    article_feed.invalidate()
     logger.info("Admin %s %s article %s", current_user["id"], request.action, article_id)
     return {"message": msg}
 
@@ -189,6 +209,7 @@ async def delete_article(
     await run_query(
         lambda: supabase.table("articles").delete().eq("id", article_id).execute()
     )
+    article_feed.invalidate()
     logger.info("Admin %s deleted article %s", current_user["id"], article_id)
     return {"message": "Article deleted."}
 
@@ -197,32 +218,12 @@ async def delete_article(
 async def cleanup_expired_articles(
     current_user: dict = Depends(require_admin),
 ):
-    """Admin: manually delete all expired articles and their storage files."""
-    supabase = get_supabase_client()
-    now = datetime.now(timezone.utc).isoformat()
-
-    expired = await run_query(
-        lambda: supabase.table("articles")
-        .select("id, pdf_path")
-        .lt("expires_at", now)
-        .execute()
-    )
-
-    if not expired.data:
-        return {"message": "No expired articles found.", "deleted": 0}
-
-    paths = [a["pdf_path"] for a in expired.data if a.get("pdf_path")]
-    ids = [a["id"] for a in expired.data]
-
-    # Remove storage files in batch
-    if paths:
-        await run_query(lambda: supabase.storage.from_("articles").remove(paths))
-
-    # Delete DB records
-    for article_id in ids:
-        await run_query(
-            lambda: supabase.table("articles").delete().eq("id", article_id).execute()
-        )
-
-    logger.info("Cleanup: deleted %d expired articles", len(ids))
-    return {"message": f"Deleted {len(ids)} expired article(s).", "deleted": len(ids)}
+    """
+    Admin: delete all expired articles and their storage files now.
+    The same cleanup also runs on a schedule (ARTICLE_CLEANUP_INTERVAL_SECONDS).
+    """
+    result = await article_janitor.run()
+    deleted = result["deleted"]
+    if not deleted:
+        return {"message": "No expired articles found.", **result}
+    return {"message": f"Deleted {deleted} expired article(s).", **result}
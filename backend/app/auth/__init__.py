@@ -1,15 +1,23 @@
 from app.auth.routes import router
 from app.auth.dependencies import (
+    get_token_payload,
     get_current_user_id,
     get_current_user,
+    get_authorized_user,
     require_admin,
-    require_active_status
+    require_active_status,
+    invalidate_user,
+    get_user_cache_stats,
 )
 
 __all__ = [
     "router",
+    "get_token_payload",
     "get_current_user_id",
     "get_current_user",
+    "get_authorized_user",
     "require_admin",
-    "require_active_status"
+    "require_active_status",
+    "invalidate_user",
+    "get_user_cache_stats",
 ]
@@ -2,7 +2,10 @@ import logging
 from datetime import datetime, timezone
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from app.auth.token_versions import TokenVersionRegistry
 from app.auth.utils import decode_access_token
+from app.cache import TTLCache
+from app.config import settings
 from app.db import get_supabase_client, run_query
 
 PERPETUAL_ROLES = {"PERMANENT", "HEAD"}
@@ -10,12 +13,35 @@ PERPETUAL_ROLES = {"PERMANENT", "HEAD"}
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
+# Authenticated user records keyed by user id. Routes that mutate a user row
+# must call invalidate_user() so the next request re-reads it.
+_user_cache = TTLCache(settings.user_cache_max_entries, settings.user_cache_ttl_seconds)
 
-async def get_current_user_id(
+# Local view of per-user token versions for the stateless authorization path
+_token_versions = TokenVersionRegistry(settings.token_version_sync_seconds)
+
+
+def invalidate_user(user_id: str) -> None:
+    """Drop a user's cached record after it has been modified."""
+    _user_cache.invalidate(user_id)
+    _token_versions.mark_dirty(user_id)
+
+
+def get_user_cache_stats() -> dict:
+    """Hit/miss/eviction counters of the authenticated user cache."""
+    return _user_cache.stats()
+
+
+def get_token_version_stats() -> dict:
+    """Fresh/stale counters of the stateless authorization path."""
+    return {"enabled": settings.jwt_stateless_auth, **_token_versions.stats()}
+
+
+async def get_token_payload(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> str:
+) -> dict:
     """
-    Dependency: extract and verify user ID from a signed JWT.
+    Dependency: verify a signed JWT and return its claims.
     Only tokens issued by this backend (signed with JWT_SECRET) are accepted.
     """
     token = credentials.credentials
@@ -29,21 +55,33 @@ async def get_current_user_id(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_id = payload.get("sub")
-    if not user_id:
+    if not payload.get("sub"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token missing subject claim",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return user_id
+    return payload
+
+
+async def get_current_user_id(payload: dict = Depends(get_token_payload)) -> str:
+    """
+    Dependency: extract and verify user ID from a signed JWT.
+    """
+    return payload["sub"]
 
 
 async def get_current_user(user_id: str = Depends(get_current_user_id)) -> dict:
     """
     Dependency: fetch full user record for the authenticated user.
+    Served from a short-TTL in-process cache when possible.
     """
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        return dict(cached)
+
+    generation = _user_cache.generation
     supabase = get_supabase_client()
     result = await run_query(
         lambda: supabase.table("users")
@@ -59,10 +97,35 @@ async def get_current_user(user_id: str = Depends(get_current_user_id)) -> dict:
             detail="User not found",
         )
 
-    return result.data[0]
+    user = result.data[0]
+    _user_cache.set(user_id, user, generation=generation)
+    return dict(user)
+
 
+async def get_authorized_user(payload: dict = Depends(get_token_payload)) -> dict:
+    """
+    Dependency: the user record that authorization decisions are made on.
 
-async def require_role(required_role: str, current_user: dict = Depends(get_current_user)) -> dict:
+    With JWT_STATELESS_AUTH enabled, tokens carrying a current `ver` claim are
+    trusted as-is: role, status and membership expiry come from the verified
+    claims and no DB round trip is made. Tokens without the claim, or whose
+    version is stale, fall back to get_current_user.
+    """
+    user_id = payload["sub"]
+    token_version = payload.get("ver")
+    if settings.jwt_stateless_auth and isinstance(token_version, int):
+        if await _token_versions.is_fresh(user_id, token_version):
+            return {
+                "id": user_id,
+                "identifier": payload.get("identifier"),
+                "role": payload.get("role"),
+                "status": payload.get("status"),
+                "membership_expires_at": payload.get("membership_expires_at"),
+            }
+    return await get_current_user(user_id)
+
+
+async def require_role(required_role: str, current_user: dict = Depends(get_authorized_user)) -> dict:
     """
     Dependency: enforce a specific role.
     """
@@ -74,12 +137,12 @@ async def require_role(required_role: str, current_user: dict = Depends(get_curr
     return current_user
 
 
-async def require_admin(current_user: dict = Depends(get_current_user)) -> dict:
+async def require_admin(current_user: dict = Depends(get_authorized_user)) -> dict:
     """Dependency: require HEAD (admin) role."""
     return await require_role("HEAD", current_user)
 
 
-async def require_active_status(current_user: dict = Depends(get_current_user)) -> dict:
+async def require_active_status(current_user: dict = Depends(get_authorized_user)) -> dict:
     """Dependency: require ACTIVE account status and non-expired membership."""
     if current_user.get("status") != "ACTIVE":
         raise HTTPException(
@@ -1,5 +1,5 @@
 import logging
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 from fastapi import APIRouter, HTTPException, Request, status, Depends
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -14,13 +14,15 @@ from app.auth.models import (
     MessageResponse,
     UpdateProfileRequest,
 )
-from app.auth.utils import hash_pin, verify_pin, create_access_token, generate_random_password
-from app.auth.dependencies import get_current_user_id, require_admin
+from app.auth.utils import hash_pin_async, verify_pin_async, create_access_token, generate_random_password
+from app.auth.dependencies import get_current_user_id, require_admin, invalidate_user
+from app.config import settings
 from app.db import get_supabase_client, run_query
+from app.members.directory import member_directory
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=get_remote_address, enabled=settings.rate_limit_enabled)
 
 # Account lockout configuration
 MAX_LOGIN_ATTEMPTS = 5
@@ -35,6 +37,23 @@ def _now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
 
+async def _record_login_attempt(supabase, user_id: str, success: bool) -> dict:
+    """
+    Apply a login outcome in one atomic statement (record_login_attempt RPC,
+    see login_attempts_schema.sql). Returns the updated counter/lockout row.
+    """
+    result = await run_query(
+        lambda: supabase.rpc("record_login_attempt", {
+            "p_user_id": user_id,
+            "p_success": success,
+            "p_max_attempts": MAX_LOGIN_ATTEMPTS,
+            "p_lockout_minutes": LOCKOUT_DURATION_MINUTES,
+        }).execute()
+    )
+    invalidate_user(user_id)
+    return result.data[0] if result.data else {}
+
+
 async def _authenticate_user(identifier: str, pin: str) -> dict:
     """
     Shared authentication logic used by /login and /verify-pin.
@@ -42,16 +61,21 @@ async def _authenticate_user(identifier: str, pin: str) -> dict:
     1. Looks up user by identifier (digits-only phone).
     2. Checks account lockout.
     3. Verifies PIN.
-    4. Resets / increments failed attempt counter.
+    4. Resets / increments failed attempt counter in a single atomic write
+       (skipped entirely when a successful login has nothing to reset).
     5. Returns the user record on success.
 
+    A login therefore costs one lookup plus at most one write.
     Raises HTTPException on any auth failure.
     """
     supabase = get_supabase_client()
+    columns = "id, identifier, role, status, pin_hash, failed_login_attempts, locked_until"
+    if settings.jwt_stateless_auth:
+        columns += ", membership_expires_at, token_version"
 
     result = await run_query(
         lambda: supabase.table("users")
-        .select("id, identifier, role, status, pin_hash, failed_login_attempts, locked_until")
+        .select(columns)
         .eq("identifier", identifier)
         .limit(1)
         .execute()
@@ -63,6 +87,7 @@ async def _authenticate_user(identifier: str, pin: str) -> dict:
     user = result.data[0]
 
     # --- Lockout check ---
+    # An expired lockout is cleared by the RPC below, together with the counter update
     if user.get("locked_until"):
         locked_until = datetime.fromisoformat(user["locked_until"].replace("Z", "+00:00"))
         if locked_until.tzinfo is None:
@@ -72,57 +97,47 @@ async def _authenticate_user(identifier: str, pin: str) -> dict:
                 status_code=status.HTTP_423_LOCKED,
                 detail=f"Account locked until {locked_until.isoformat()}",
             )
-        # Lockout expired — reset
-        await run_query(
-            lambda: supabase.table("users")
-            .update({"locked_until": None, "failed_login_attempts": 0})
-            .eq("id", user["id"])
-            .execute()
-        )
 
     # --- PIN check ---
     if not user.get("pin_hash"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="PIN not set for this account")
 
-    if not verify_pin(pin, user["pin_hash"]):
-        failed = user.get("failed_login_attempts", 0) + 1
-        update = {"failed_login_attempts": failed, "updated_at": _now_utc().isoformat()}
+    if not await verify_pin_async(pin, user["pin_hash"]):
+        attempt = await _record_login_attempt(supabase, user["id"], success=False)
+        failed = attempt.get("failed_login_attempts", (user.get("failed_login_attempts") or 0) + 1)
 
-        if failed >= MAX_LOGIN_ATTEMPTS:
-            lockout_until = _now_utc() + timedelta(minutes=LOCKOUT_DURATION_MINUTES)
-            update["locked_until"] = lockout_until.isoformat()
-            await run_query(lambda: supabase.table("users").update(update).eq("id", user["id"]).execute())
+        if attempt.get("locked_until") or failed >= MAX_LOGIN_ATTEMPTS:
             raise HTTPException(
                 status_code=status.HTTP_423_LOCKED,
                 detail=f"Account locked for {LOCKOUT_DURATION_MINUTES} minutes due to too many failed attempts.",
             )
 
-        await run_query(lambda: supabase.table("users").update(update).eq("id", user["id"]).execute())
         remaining = MAX_LOGIN_ATTEMPTS - failed
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid PIN. {remaining} attempt(s) remaining.",
         )
 
-    # --- Success: reset counters ---
-    await run_query(
-        lambda: supabase.table("users")
-        .update({"failed_login_attempts": 0, "locked_until": None, "updated_at": _now_utc().isoformat()})
-        .eq("id", user["id"])
-        .execute()
-    )
+    # --- Success: reset counters (only if there is anything to reset) ---
+    if user.get("failed_login_attempts") or user.get("locked_until"):
+        await _record_login_attempt(supabase, user["id"], success=True)
+        user["failed_login_attempts"] = 0
+        user["locked_until"] = None
     return user
 
 
 def _build_token(user: dict) -> str:
-    return create_access_token(
-        data={
-            "sub": user["id"],
-            "identifier": user["identifier"],
-            "role": user.get("role"),
-            "status": user["status"],
-        }
-    )
+    claims = {
+        "sub": user["id"],
+        "identifier": user["identifier"],
+        "role": user.get("role"),
+        "status": user["status"],
+    }
+    if settings.jwt_stateless_auth:
+        # Claims authorized on directly while `ver` matches the user's current version
+        claims["membership_expires_at"] = user.get("membership_expires_at")
+        claims["ver"] = user.get("token_version", 0)
+    return create_access_token(data=claims)
 
 
 def _auth_response(user: dict) -> AuthResponse:
@@ -172,7 +187,7 @@ async def register(request: RegisterRequest):
     if not auth_response.user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Registration failed")
 
-    hashed_pin = hash_pin(request.pin)
+    hashed_pin = await hash_pin_async(request.pin)
     user_id = auth_response.user.id
     now = _now_utc().isoformat()
 
@@ -225,7 +240,7 @@ async def set_pin(
 ):
     """Set or update the current user's 4-digit PIN."""
     supabase = get_supabase_client()
-    hashed_pin = hash_pin(request.pin)
+    hashed_pin = await hash_pin_async(request.pin)
 
     result = await run_query(
         lambda: supabase.table("users")
@@ -259,6 +274,7 @@ async def unlock_account(
     if not result.data:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
+    invalidate_user(request.user_id)
     logger.info("Account unlocked by admin %s for user %s", admin_user["id"], request.user_id)
     return MessageResponse(message="Account unlocked successfully")
 
@@ -305,5 +321,8 @@ async def update_current_user_info(
     
     if not result.data:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to update profile")
-        
+
+    invalidate_user(user_id)
+    await member_directory.refresh_users([user_id])
+
     return {"message": "Profile updated successfully"}
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from app.db import get_supabase_client, run_query
+
+logger = logging.getLogger(__name__)
+
+# Re-read this far behind the watermark so rows committed slightly out of
+# updated_at order are not missed.
+SYNC_OVERLAP = timedelta(seconds=5)
+SYNC_BATCH_SIZE = 1000
+
+
+class TokenVersionRegistry:
+    """
+    Worker-local copy of the token_versions table.
+
+    A token is fresh when the version it was issued with is at least the
+    user's current version. Deleting a user bumps its version too (see
+    migration_token_versions.sql), so a deleted user's tokens go stale and
+    fall back to the DB lookup. The table is synced incrementally at most once
+    per `sync_interval` seconds, so checking a token costs no DB round trip
+    on the request path. Users modified by this worker are marked dirty until
+    the next sync has had time to pick up the trigger-bumped version.
+    """
+
+    def __init__(self, sync_interval: float):
+        self.sync_interval = sync_interval
+        self._versions: Dict[str, int] = {}
+        self._dirty_until: Dict[str, float] = {}
+        self._watermark: Optional[datetime] = None
+        self._synced_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.syncs = 0
+        self.sync_errors = 0
+        self.fresh = 0
+        self.stale = 0
+
+    def mark_dirty(self, user_id: str) -> None:
+        self._dirty_until[user_id] = time.monotonic() + 2 * self.sync_interval
+
+    async def is_fresh(self, user_id: str, token_version: int) -> bool:
+        dirty_until = self._dirty_until.get(user_id)
+        if dirty_until is not None:
+            if dirty_until > time.monotonic():
+                self.stale += 1
+                return False
+            del self._dirty_until[user_id]
+
+        if not await self._sync():
+            self.stale += 1
+            return False
+
+        if token_version >= self._versions.get(user_id, 0):
+            self.fresh += 1
+            return True
+        self.stale += 1
+        return False
+
+    async def _sync(self) -> bool:
+        """Pull versions changed since the last sync. Returns False if the local view is unusable."""
+        if self._synced_at is not None and time.monotonic() - self._synced_at < self.sync_interval:
+            return True
+
+        async with self._lock:
+            if self._synced_at is not None and time.monotonic() - self._synced_at < self.sync_interval:
+                return True
+
+            supabase = get_supabase_client()
+            since = (self._watermark - SYNC_OVERLAP).isoformat() if self._watermark else None
+            try:
+                while True:
+                    def _fetch():
+                        query = supabase.table("token_versions").select("user_id, version, updated_at")
+                        if since:
+                            query = query.gte("updated_at", since)
+                        return query.order("updated_at").limit(SYNC_BATCH_SIZE).execute()
+
+                    result = await run_query(_fetch)
+                    rows = result.data or []
+                    for row in rows:
+                        self._versions[row["user_id"]] = row["version"]
+                        updated_at = datetime.fromisoformat(row["updated_at"].replace("Z", "+00:00"))
+                        if self._watermark is None or updated_at > self._watermark:
+                            self._watermark = updated_at
+                    if len(rows) < SYNC_BATCH_SIZE or rows[-1]["updated_at"] == since:
+                        break
+                    since = rows[-1]["updated_at"]
+            except Exception as exc:
+                self.sync_errors += 1
+                logger.warning("token_versions sync failed: %s", exc)
+                if self._synced_at is None:
+                    return False
+                # Keep serving the last synced view; retry after another interval
+                self._synced_at = time.monotonic()
+                return True
+
+            self._synced_at = time.monotonic()
+            self.syncs += 1
+            return True
+
+    def stats(self) -> dict:
+        return {
+            "tracked_users": len(self._versions),
+            "dirty_users": len(self._dirty_until),
+            "syncs": self.syncs,
+            "sync_errors": self.sync_errors,
+            "fresh": self.fresh,
+            "stale": self.stale,
+        }
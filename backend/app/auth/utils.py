@@ -6,9 +6,19 @@ from datetime import datetime, timezone, timedelta
 from jose import JWTError, jwt
 from typing import Optional, Dict, Any
 from app.config import settings
+from app.workers import BoundedExecutor
 
 logger = logging.getLogger(__name__)
 
+# bcrypt is deliberately slow (tens of ms per call), so routes must not run it
+# on the event loop. All PIN hashing from async code goes through this pool.
+pin_hasher = BoundedExecutor(
+    "pin-hasher",
+    settings.pin_hash_executor,
+    settings.pin_hash_workers,
+    settings.pin_hash_max_pending,
+)
+
 
 def hash_pin(pin: str) -> str:
     """Hash a PIN using bcrypt."""
@@ -23,6 +33,16 @@ def verify_pin(plain_pin: str, hashed_pin: str) -> bool:
         return False
 
 
+async def hash_pin_async(pin: str) -> str:
+    """Hash a PIN in the bcrypt worker pool."""
+    return await pin_hasher.run(hash_pin, pin)
+
+
+async def verify_pin_async(plain_pin: str, hashed_pin: str) -> bool:
+    """Verify a PIN in the bcrypt worker pool."""
+    return await pin_hasher.run(verify_pin, plain_pin, hashed_pin)
+
+
 def generate_random_password(length: int = 16) -> str:
     """Generate a cryptographically secure random password."""
     alphabet = string.ascii_letters + string.digits
@@ -10,6 +10,33 @@ class Settings(BaseSettings):
     supabase_service_key: str
     supabase_anon_key: str
     
+    # Database client pool — each pooled client owns its own httpx connection,
+    # so up to db_pool_size PostgREST calls can be in flight per worker.
+    db_pool_size: int = 8
+    db_pool_timeout_seconds: float = 10.0
+    # "thread": sync clients from the pool run in worker threads.
+    # "async": queries are awaited natively on a shared async client.
+    # "fake": in-memory Supabase stand-in (app/db/fake_client.py) for offline
+    # load testing; every simulated request sleeps the configured latency.
+    db_backend: str = "thread"
+    fake_db_latency_ms: float = 0.0
+    fake_db_latency_jitter_ms: float = 0.0
+    fake_db_fixture: str = ""  # JSON {table: [rows]} loaded into the fake database
+    
+    # In-process member directory snapshot served by /members/active
+    member_directory_enabled: bool = True
+    member_directory_resync_seconds: float = 60.0
+    
+    # Precomputed matrimony compatibility ranking served by /matrimony/matches
+    match_ranking_enabled: bool = True
+    match_top_k: int = 100  # ranked ids are sent in one PostgREST in.() filter; keep it modest
+    match_index_resync_seconds: float = 300.0
+    
+    # Scheduled deletion of expired articles and their PDFs (0 disables)
+    article_cleanup_interval_seconds: float = 3600.0
+    # Per-worker cache of the published-article feed (GET /articles)
+    article_feed_ttl_seconds: float = 300.0
+    
     # Razorpay (optional until payment feature is enabled)
     razorpay_key_id: str = ""
     razorpay_key_secret: str = ""
@@ -19,10 +46,31 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     jwt_expiration_minutes: int = 1440  # 24 hours
     
+    # Authenticated user cache (per worker)
+    user_cache_ttl_seconds: float = 30.0
+    user_cache_max_entries: int = 2048
+    
+    # Stateless authorization: trust role/status/expiry claims of tokens whose
+    # version is current (requires app/db/migration_token_versions.sql)
+    jwt_stateless_auth: bool = False
+    token_version_sync_seconds: float = 5.0
+    
+    # bcrypt PIN hashing pool ("process" or "thread"); requests beyond
+    # pin_hash_max_pending queued/running jobs get 503
+    pin_hash_executor: str = "process"
+    pin_hash_workers: int = 2
+    pin_hash_max_pending: int = 64
+    
+    # Photo resizing / WebP encoding pool for /matrimony/upload-photo
+    image_executor: str = "process"
+    image_workers: int = 2
+    image_max_pending: int = 16
+    
     # API
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     cors_origins: str = "http://localhost:5173,http://localhost:3000"
+    rate_limit_enabled: bool = True  # disable only for local load testing
     
     # Environment
     environment: str = "development"
@@ -1,3 +1,3 @@
-from app.db.supabase_client import get_supabase_client, run_query
+from app.db.supabase_client import get_supabase_client, get_async_supabase_client, run_query, get_pool_stats
 
-__all__ = ["get_supabase_client", "run_query"]
+__all__ = ["get_supabase_client", "get_async_supabase_client", "run_query", "get_pool_stats"]
@@ -0,0 +1,904 @@
+"""
+In-memory stand-in for Supabase, selected with DB_BACKEND=fake.
+
+create_fake_client() returns a real supabase Client whose httpx transport
+answers PostgREST, storage and auth requests from in-process tables, so
+every query builder call the app makes (select/insert/upsert/update/delete,
+filters, or=(...), embedded resources, order/range/limit, single(), count,
+rpc, storage upload/remove, auth.admin.create_user) goes through the same
+client library code as in production. Nothing leaves the process.
+
+Emulated database behaviour: primary keys and the UNIQUE constraints the app
+relies on (23505 conflicts, upsert on_conflict targets), column defaults, the
+updated_at / token_version / transaction member_role triggers, and the RPCs
+record_login_attempt, allocate_member_ids, transaction_rollup and
+list_storage_objects. Each request is applied atomically.
+
+Every simulated request sleeps FAKE_DB_LATENCY_MS (+ up to
+FAKE_DB_LATENCY_JITTER_MS) outside the database lock, like a network round
+trip, and is counted per operation and table:
+
+    db = get_fake_database()
+    with db.track() as queries:
+        client.get("/members/active")
+    assert queries["select users"] == 1
+
+Queries are evaluated by scanning Python dicts, so use the fake for query
+counts and latency-bound behaviour rather than absolute database timings.
+
+FAKE_DB_FIXTURE may point to a JSON file of {table: [rows]} loaded at start
+(scripts/seed_test_matrimony.py --synthetic N --synthetic-fixture PATH
+writes one).
+"""
+
+import heapq
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import httpx
+from supabase import Client, ClientOptions, create_client
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# ── schema (mirrors the SQL files in this repo) ─────────────────────────────
+
+PRIMARY_KEYS = {
+    "token_versions": "user_id",
+    "presence": "user_id",
+    "matrimony_photo_objects": "sha256",
+    "member_id_counters": "prefix",
+}
+UNIQUE_KEYS = {
+    "users": [("identifier",), ("member_id",)],
+    "matrimony_profiles": [("user_id",)],
+    "transactions": [("reference_user_id", "fee_key")],
+    "channel_members": [("channel_id", "user_id")],
+}
+# (table, column, referenced table); constraint names follow "<table>_<column>_fkey"
+FOREIGN_KEYS = [
+    ("membership_requests", "user_id", "users"),
+    ("payments", "user_id", "users"),
+    ("payments", "membership_request_id", "membership_requests"),
+    ("matrimony_profiles", "user_id", "users"),
+    ("matrimony_photo_objects", "uploaded_by", "users"),
+    ("articles", "submitted_by", "users"),
+    ("articles", "reviewed_by", "users"),
+    ("transactions", "reference_user_id", "users"),
+    ("transactions", "recorded_by", "users"),
+    ("channels", "created_by", "users"),
+    ("channel_members", "channel_id", "channels"),
+    ("channel_members", "user_id", "users"),
+    ("messages", "channel_id", "channels"),
+    ("messages", "sender_id", "users"),
+]
+COLUMN_DEFAULTS = {
+    "users": {"status": "PENDING", "failed_login_attempts": 0, "token_version": 0},
+    "membership_requests": {"payment_status": "PENDING", "approval_status": "PENDING", "request_type": "APPLICATION"},
+    "matrimony_profiles": {"payment_status": "PENDING", "status": "ACTIVE"},
+}
+# Tables with a BEFORE UPDATE trigger setting updated_at = NOW()
+TOUCHED_ON_UPDATE = {"users", "membership_requests", "channels", "messages", "presence"}
+# users columns whose change bumps token_versions (migration_token_versions.sql)
+TOKEN_VERSION_COLUMNS = ("role", "status", "membership_expires_at")
+
+_TEMPORAL = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+class PostgrestError(Exception):
+    """Error answered to the client in PostgREST's JSON error format."""
+
+    def __init__(self, status: int, code: str, message: str, details: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+        self.details = details
+
+    def response(self) -> httpx.Response:
+        body = {"code": self.code, "message": self.message, "details": self.details, "hint": None}
+        return httpx.Response(self.status, json=body)
+
+
+class Embed(NamedTuple):
+    alias: str
+    table: str
+    hint: Optional[str]
+    inner: bool
+    items: list
+
+
+class Filter(NamedTuple):
+    path: Tuple[str, ...]   # ("col",) or ("embed_alias", "col")
+    negate: bool
+    op: str
+    value: Any              # str, or list of str for "in"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# ── PostgREST syntax ────────────────────────────────────────────────────────
+
+def _split(text: str, sep: str = ",") -> List[str]:
+    """Split on `sep` outside parentheses and double quotes."""
+    parts, depth, quoted, start, i = [], 0, False, 0, 0
+    while i < len(text):
+        char = text[i]
+        if quoted and char == "\\":
+            i += 2
+            continue
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == sep:
+            parts.append(text[start:i])
+            start = i + 1
+        i += 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+_EMBED = re.compile(r"^(?:(\w+):)?(\w+)((?:!\w+)*)\((.*)\)$", re.S)
+_COLUMN = re.compile(r"^(?:(\w+):)?(\w+|\*)(?:::\w+)?$")
+
+
+def parse_select(text: str) -> list:
+    """select=... → list of "*", (alias, column) and Embed items."""
+    items = []
+    for part in _split(text or "*"):
+        embed = _EMBED.match(part)
+        if embed:
+            alias, table, bangs, inner = embed.groups()
+            flags = [flag for flag in bangs.split("!") if flag]
+            hints = [flag for flag in flags if flag not in ("inner", "left")]
+            items.append(Embed(alias or table, table, hints[0] if hints else None, "inner" in flags, parse_select(inner)))
+            continue
+        column = _COLUMN.match(part)
+        if not column:
+            raise PostgrestError(400, "PGRST100", f"failed to parse select parameter ({part})")
+        alias, name = column.groups()
+        items.append("*" if name == "*" else (alias or name, name))
+    return items
+
+
+def parse_operation(path: Tuple[str, ...], expression: str, quoted: bool = False) -> Filter:
+    """'not.ilike.x' / 'in.(a,b)' / 'eq.5' for the column at `path`."""
+    negate = False
+    op, _, value = expression.partition(".")
+    if op == "not":
+        negate = True
+        op, _, value = value.partition(".")
+    if op not in ("eq", "neq", "gt", "gte", "lt", "lte", "like", "ilike", "is", "in"):
+        raise PostgrestError(400, "PGRST100", f"unsupported operator '{op}'")
+    if op == "in":
+        value = [_unquote(v) for v in _split(value.strip()[1:-1])]
+    elif quoted:
+        value = _unquote(value)
+    return Filter(path, negate, op, value)
+
+
+def parse_logic(kind: str, expression: str) -> tuple:
+    """or=(a.eq.1,and(b.lt.2,...)) → ("or", [Filter | nested tuple, ...])."""
+    children = []
+    for part in _split(expression.strip()[1:-1]):
+        nested = re.match(r"^(not\.)?(and|or)(\(.*\))$", part, re.S)
+        if nested:
+            children.append(parse_logic(("not." if nested.group(1) else "") + nested.group(2), nested.group(3)))
+        else:
+            column, _, rest = part.partition(".")
+            children.append(parse_operation((column,), rest, quoted=True))
+    return (kind, children)
+
+
+def _like_regex(pattern: str, ignore_case: bool) -> "re.Pattern":
+    out, i = [], 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        out.append(".*" if char in "%*" else "." if char == "_" else re.escape(char))
+        i += 1
+    return re.compile("".join(out), re.S | (re.I if ignore_case else 0))
+
+
+@lru_cache(maxsize=1 << 17)
+def _temporal(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00").replace(" ", "T"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _comparable(actual, text: str):
+    """(actual, expected) coerced to one comparable type, like Postgres casting the literal."""
+    if isinstance(actual, bool):
+        return actual, text.lower() in ("true", "t", "1")
+    if isinstance(actual, (int, float)):
+        try:
+            return float(actual), float(text)
+        except ValueError:
+            return str(actual), text
+    if isinstance(actual, str) and _TEMPORAL.match(actual) and _TEMPORAL.match(text):
+        try:
+            return _temporal(actual), _temporal(text)
+        except ValueError:
+            pass
+    return str(actual) if not isinstance(actual, str) else actual, text
+
+
+def _test(op: str, actual, expected) -> bool:
+    if op == "is":
+        target = str(expected).lower()
+        if target in ("true", "false"):
+            return actual is (target == "true")
+        return actual is None or actual == []
+    if actual is None:
+        return False
+    if op == "in":
+        return any(a == e for a, e in (_comparable(actual, value) for value in expected))
+    if op in ("like", "ilike"):
+        return bool(_like_regex(expected, op == "ilike").fullmatch(str(actual)))
+    a, e = _comparable(actual, expected)
+    try:
+        return {
+            "eq": a == e, "neq": a != e, "gt": a > e, "gte": a >= e, "lt": a < e, "lte": a <= e,
+        }[op]
+    except TypeError:
+        return False
+
+
+def _evaluate(condition, row: dict) -> bool:
+    if isinstance(condition, Filter):
+        actual = row.get(condition.path[-1])
+        if actual is None and condition.op != "is":
+            return False        # NULL compares as unknown, negated or not
+        result = _test(condition.op, actual, condition.value)
+        return not result if condition.negate else result
+    kind, children = condition
+    negate = kind.startswith("not.")
+    combine = any if kind.endswith("or") else all
+    result = combine(_evaluate(child, row) for child in children)
+    return not result if negate else result
+
+
+def _sort_value(value):
+    if isinstance(value, bool):
+        return (0, int(value))
+    if isinstance(value, (int, float)):
+        return (0, float(value))
+    return _sort_text(str(value))
+
+
+@lru_cache(maxsize=1 << 17)
+def _sort_text(value: str) -> tuple:
+    if _TEMPORAL.match(value):
+        try:
+            return (1, _temporal(value).timestamp())
+        except ValueError:
+            pass
+    return (2, value)
+
+
+def _order(rows: List[dict], spec: Optional[str], needed: Optional[int] = None) -> List[dict]:
+    """
+    order=col.desc.nullslast,... (Postgres default: NULLS LAST ascending,
+    FIRST descending). With `needed`, only that many leading rows are
+    guaranteed to be in order (top-k selection when directions agree).
+    """
+    terms = []
+    for term in _split(spec or ""):
+        column, *modifiers = term.split(".")
+        desc = "desc" in modifiers
+        terms.append((column, desc, "nullsfirst" in modifiers or (desc and "nullslast" not in modifiers)))
+    if not terms:
+        return rows
+
+    if len({desc for _, desc, _ in terms}) == 1:
+        desc = terms[0][1]
+        # One composite key; NULLs ranked so they land first/last after any reverse
+        ranks = [(2 if nulls_first == desc else 0) for _, _, nulls_first in terms]
+
+        def key(row):
+            return tuple(
+                (1, _sort_value(row[column])) if row.get(column) is not None else (rank, (0, 0))
+                for (column, _, _), rank in zip(terms, ranks)
+            )
+
+        if needed is not None and needed < len(rows):
+            return (heapq.nlargest if desc else heapq.nsmallest)(needed, rows, key=key)
+        return sorted(rows, key=key, reverse=desc)
+
+    for column, desc, nulls_first in reversed(terms):
+        present = [row for row in rows if row.get(column) is not None]
+        missing = [row for row in rows if row.get(column) is None]
+        present.sort(key=lambda row: _sort_value(row[column]), reverse=desc)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+
+# ── storage ─────────────────────────────────────────────────────────────────
+
+class _Table:
+    """Rows by primary key, with hash indexes for the UNIQUE constraints."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pk = PRIMARY_KEYS.get(name, "id")
+        self.rows: Dict[Any, dict] = {}
+        self.unique: Dict[Tuple[str, ...], Dict[tuple, Any]] = {cols: {} for cols in UNIQUE_KEYS.get(name, [])}
+
+    @staticmethod
+    def key(row: dict, columns: Tuple[str, ...]) -> Optional[tuple]:
+        values = tuple(row.get(column) for column in columns)
+        return None if any(value is None for value in values) else values   # NULLs never collide
+
+    def find(self, columns: Tuple[str, ...], row: dict) -> Optional[dict]:
+        if columns == (self.pk,):
+            return self.rows.get(row.get(self.pk))
+        pk = self.unique[columns].get(self.key(row, columns))
+        return self.rows.get(pk) if pk is not None else None
+
+    def check(self, row: dict, replacing=None) -> None:
+        pk = row.get(self.pk)
+        if pk is None:
+            raise PostgrestError(400, "23502", f'null value in column "{self.pk}" of relation "{self.name}" violates not-null constraint')
+        if pk != replacing and pk in self.rows:
+            raise PostgrestError(409, "23505", f'duplicate key value violates unique constraint "{self.name}_pkey"')
+        for columns, index in self.unique.items():
+            owner = index.get(self.key(row, columns))
+            if owner is not None and owner != replacing:
+                raise PostgrestError(
+                    409, "23505",
+                    f'duplicate key value violates unique constraint "{self.name}_{"_".join(columns)}_key"',
+                )
+
+    def put(self, row: dict) -> None:
+        self.rows[row[self.pk]] = row
+        for columns, index in self.unique.items():
+            key = self.key(row, columns)
+            if key is not None:
+                index[key] = row[self.pk]
+
+    def remove(self, pk) -> Optional[dict]:
+        row = self.rows.pop(pk, None)
+        if row is not None:
+            for columns, index in self.unique.items():
+                key = self.key(row, columns)
+                if key is not None and index.get(key) == pk:
+                    del index[key]
+        return row
+
+
+class FakeDatabase:
+    """Tables, storage buckets and auth users behind the fake transport."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._tables: Dict[str, _Table] = {}
+        self._objects: Dict[str, Dict[str, dict]] = defaultdict(dict)
+        self._auth_users: Dict[str, dict] = {}
+        self._undo: Optional[list] = None
+        self.queries: Counter = Counter()
+        self._trackers: List[Counter] = []
+
+    # ── test / load-test helpers ───────────────────────────────────────────
+
+    def table(self, name: str) -> _Table:
+        if name not in self._tables:
+            self._tables[name] = _Table(name)
+        return self._tables[name]
+
+    def load(self, data: Dict[str, List[dict]]) -> None:
+        """Bulk-load rows ({table: [rows]}) with defaults and constraint checks."""
+        with self._lock:
+            for name, rows in data.items():
+                for row in rows:
+                    self._insert(name, dict(row))
+
+    def rows(self, name: str) -> List[dict]:
+        with self._lock:
+            return [dict(row) for row in self.table(name).rows.values()]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tables.clear()
+            self._objects.clear()
+            self._auth_users.clear()
+            self.queries.clear()
+
+    @contextmanager
+    def track(self) -> Iterator[Counter]:
+        """Count the requests made while the block runs ("select users", "rpc ...", ...)."""
+        counter: Counter = Counter()
+        with self._lock:
+            self._trackers.append(counter)
+        try:
+            yield counter
+        finally:
+            with self._lock:
+                self._trackers.remove(counter)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queries": sum(self.queries.values()),
+                "by_operation": dict(self.queries.most_common()),
+                "rows": {name: len(table.rows) for name, table in sorted(self._tables.items())},
+                "storage_objects": sum(len(objects) for objects in self._objects.values()),
+            }
+
+    # ── request dispatch ───────────────────────────────────────────────────
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        with self._lock:
+            try:
+                if path.startswith("/rest/v1/rpc/"):
+                    return self._rpc(path[len("/rest/v1/rpc/"):], request)
+                if path.startswith("/rest/v1/"):
+                    return self._rest(path[len("/rest/v1/"):], request)
+                if path.startswith("/storage/v1/object/"):
+                    return self._storage(path[len("/storage/v1/object/"):], request)
+                if path == "/auth/v1/admin/users" and request.method == "POST":
+                    return self._create_auth_user(request)
+            except PostgrestError as exc:
+                return exc.response()
+        return httpx.Response(404, json={"code": "PGRST125", "message": f"Fake Supabase has no route {request.method} {path}"})
+
+    def _count(self, operation: str) -> None:
+        self.queries[operation] += 1
+        for counter in self._trackers:
+            counter[operation] += 1
+
+    @contextmanager
+    def _transaction(self):
+        """Apply a whole request or none of it (undo log of replaced rows)."""
+        self._undo = []
+        try:
+            yield
+        except BaseException:
+            for name, pk, previous in reversed(self._undo):
+                table = self.table(name)
+                table.remove(pk)
+                if previous is not None:
+                    table.put(previous)
+            raise
+        finally:
+            self._undo = None
+
+    def _write(self, name: str, row: dict, replacing=None) -> None:
+        table = self.table(name)
+        table.check(row, replacing=replacing)
+        previous = table.remove(replacing) if replacing is not None else None
+        if self._undo is not None:
+            if replacing is not None and replacing != row[table.pk]:
+                self._undo.append((name, replacing, previous))
+                previous = None
+            self._undo.append((name, row[table.pk], previous))
+        table.put(row)
+
+    def _delete(self, name: str, pk) -> dict:
+        row = self.table(name).remove(pk)
+        if self._undo is not None:
+            self._undo.append((name, pk, row))
+        if name == "users":
+            self._bump_token_version(row["id"], (row.get("token_version") or 0) + 1)
+        return row
+
+    def _bump_token_version(self, user_id: str, version: int) -> None:
+        current = self.table("token_versions").rows.get(user_id)
+        version_row = {"user_id": user_id, "version": version, "updated_at": _now()}
+        self._write("token_versions", version_row, replacing=user_id if current else None)
+
+    # ── rows and triggers ──────────────────────────────────────────────────
+
+    def _insert(self, name: str, row: dict) -> dict:
+        table = self.table(name)
+        now = _now()
+        for column, value in COLUMN_DEFAULTS.get(name, {}).items():
+            row.setdefault(column, value)
+        if table.pk == "id":
+            row.setdefault("id", str(uuid.uuid4()))
+        row.setdefault("created_at", now)
+        row.setdefault("updated_at", now)
+        if name == "transactions" and row.get("member_role") is None and row.get("reference_user_id"):
+            member = self.table("users").rows.get(row["reference_user_id"])
+            row["member_role"] = member.get("role") if member else None
+        self._write(name, row)
+        return row
+
+    def _update(self, name: str, old: dict, changes: dict) -> dict:
+        row = {**old, **changes}
+        if name in TOUCHED_ON_UPDATE:
+            row["updated_at"] = _now()
+        if name == "users" and any(row.get(c) != old.get(c) for c in TOKEN_VERSION_COLUMNS):
+            row["token_version"] = (old.get("token_version") or 0) + 1
+            self._bump_token_version(row["id"], row["token_version"])
+        table = self.table(name)
+        self._write(name, row, replacing=old[table.pk])
+        return row
+
+    # ── PostgREST ──────────────────────────────────────────────────────────
+
+    def _rest(self, name: str, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        prefer = request.headers.get("prefer", "")
+        conditions = []
+        for key, value in params.multi_items():
+            if key in ("select", "order", "limit", "offset", "on_conflict", "columns"):
+                continue
+            if key in ("or", "and", "not.or", "not.and"):
+                conditions.append(parse_logic(key, value))
+            else:
+                conditions.append(parse_operation(tuple(key.split(".")), value))
+
+        if request.method == "GET":
+            self._count(f"select {name}")
+            return self._select_response(name, params, conditions, prefer, request.headers.get("accept", ""))
+
+        if request.method == "POST":
+            body = json.loads(request.content or b"[]")
+            rows = body if isinstance(body, list) else [body]
+            resolution = re.search(r"resolution=(merge|ignore)-duplicates", prefer)
+            self._count(f"{'upsert' if resolution else 'insert'} {name}")
+            with self._transaction():
+                written = self._post(name, rows, resolution.group(1) if resolution else None, params.get("on_conflict"))
+        elif request.method == "PATCH":
+            self._count(f"update {name}")
+            changes = json.loads(request.content or b"{}")
+            with self._transaction():
+                written = [self._update(name, row, changes) for row in self._matching(name, conditions)]
+        elif request.method == "DELETE":
+            self._count(f"delete {name}")
+            table = self.table(name)
+            with self._transaction():
+                written = [self._delete(name, row[table.pk]) for row in self._matching(name, conditions)]
+        else:
+            raise PostgrestError(405, "PGRST117", f"Unsupported HTTP method {request.method}")
+
+        status = 201 if request.method == "POST" else 200
+        if "return=minimal" in prefer:
+            return httpx.Response(204 if status == 200 else status)
+        items = parse_select(params.get("select", "*"))
+        return httpx.Response(status, json=[self._project(name, row, items, {}) for row in written])
+
+    def _post(self, name: str, rows: List[dict], resolution: Optional[str], on_conflict: Optional[str]) -> List[dict]:
+        table = self.table(name)
+        target = tuple(c.strip() for c in on_conflict.split(",")) if on_conflict else (table.pk,)
+        if resolution and target != (table.pk,) and target not in table.unique:
+            raise PostgrestError(400, "42P10", "there is no unique or exclusion constraint matching the ON CONFLICT specification")
+        written = []
+        for row in rows:
+            row = dict(row)
+            existing = table.find(target, row) if resolution else None
+            if existing is None:
+                written.append(self._insert(name, row))
+            elif resolution == "merge":
+                written.append(self._update(name, existing, row))
+        return written
+
+    def _matching(self, name: str, conditions: list) -> List[dict]:
+        return [row for row in list(self.table(name).rows.values()) if all(_evaluate(c, row) for c in conditions)]
+
+    def _relation(self, table: str, embed: Embed) -> Tuple[str, str, bool]:
+        """(child table, FK column, to_many) for embedding `embed` into rows of `table`."""
+        resolved = []
+        for child, column, ref in FOREIGN_KEYS:
+            if embed.hint and embed.hint not in (column, f"{child}_{column}_fkey"):
+                continue
+            if child == table and ref == embed.table:
+                resolved.append((child, column, False))     # the row this one references
+            elif child == embed.table and ref == table:
+                resolved.append((child, column, True))      # the rows referencing this one
+        if not resolved:
+            raise PostgrestError(400, "PGRST200", f"Could not find a relationship between '{table}' and '{embed.table}'")
+        if len(resolved) > 1:
+            raise PostgrestError(300, "PGRST201", f"More than one relationship was found for '{table}' and '{embed.table}'")
+        return resolved[0]
+
+    def _embed(self, table: str, rows: List[dict], embed: Embed, conditions: list, cache: dict) -> Dict[Any, Any]:
+        """Raw embedded value per parent pk: a row (or None), or a list of rows."""
+        child, column, to_many = self._relation(table, embed)
+        parent_pk = self.table(table).pk
+        if to_many:
+            key = (child, column)
+            if key not in cache:
+                grouped = defaultdict(list)
+                for row in self.table(child).rows.values():
+                    if row.get(column) is not None:
+                        grouped[row[column]].append(row)
+                cache[key] = grouped
+            grouped = cache[key]
+            return {
+                row[parent_pk]: [c for c in grouped.get(row[parent_pk], []) if all(_evaluate(f, c) for f in conditions)]
+                for row in rows
+            }
+        targets = self.table(embed.table).rows
+        values = {}
+        for row in rows:
+            target = targets.get(row.get(column))
+            if target is not None and not all(_evaluate(f, target) for f in conditions):
+                target = None
+            values[row[parent_pk]] = target
+        return values
+
+    def _project(self, table: str, row: dict, items: list, embedded: Dict[str, Any]) -> dict:
+        out = {}
+        for item in items:
+            if item == "*":
+                out.update(row)
+            elif isinstance(item, Embed):
+                if item.alias in embedded:
+                    value = embedded[item.alias]
+                else:
+                    value = self._embed(table, [row], item, [], {})[row[self.table(table).pk]]
+                if isinstance(value, list):
+                    out[item.alias] = [self._project(item.table, v, item.items, {}) for v in value]
+                else:
+                    out[item.alias] = self._project(item.table, value, item.items, {}) if value is not None else None
+            else:
+                alias, column = item
+                out[alias] = row.get(column)
+        return out
+
+    def _select_response(self, name: str, params, conditions: list, prefer: str, accept: str) -> httpx.Response:
+        items = parse_select(params.get("select", "*"))
+        embeds = {item.alias: item for item in items if isinstance(item, Embed)}
+        root, on_embeds, by_embed = [], [], defaultdict(list)
+        for condition in conditions:
+            first = condition.path[0] if isinstance(condition, Filter) else None
+            if first in embeds and len(condition.path) > 1:
+                by_embed[first].append(condition._replace(path=condition.path[1:]))
+            elif first in embeds:
+                on_embeds.append(condition)
+            else:
+                root.append(condition)
+
+        table = self.table(name)
+        rows = [row for row in table.rows.values() if all(_evaluate(c, row) for c in root)]
+        embedded: Dict[Any, Dict[str, Any]] = defaultdict(dict)
+        cache: dict = {}
+
+        def resolve(aliases, rows):
+            for alias in aliases:
+                for pk, value in self._embed(name, rows, embeds[alias], by_embed[alias], cache).items():
+                    embedded[pk][alias] = value
+
+        # Embeds that decide which rows match are resolved first, the rest only for the page
+        filtering = [alias for alias, embed in embeds.items() if embed.inner or any(c.path[0] == alias for c in on_embeds)]
+        resolve(filtering, rows)
+        for alias in filtering:
+            if embeds[alias].inner:
+                rows = [row for row in rows if embedded[row[table.pk]][alias]]
+        if on_embeds:
+            rows = [row for row in rows if all(_evaluate(c, embedded[row[table.pk]]) for c in on_embeds)]
+
+        total = len(rows)
+        offset = int(params.get("offset", 0))
+        limit = params.get("limit")
+        rows = _order(rows, params.get("order"), offset + int(limit) if limit is not None else None)
+        rows = rows[offset:offset + int(limit)] if limit is not None else rows[offset:]
+        resolve([alias for alias in embeds if alias not in filtering], rows)
+        data = [self._project(name, row, items, embedded[row[table.pk]]) for row in rows]
+
+        headers = {"content-range": f"{offset}-{offset + len(data) - 1}/{total}" if data else f"*/{total}"}
+        if "vnd.pgrst.object" in accept:
+            if len(data) != 1:
+                raise PostgrestError(
+                    406, "PGRST116", "JSON object requested, multiple (or no) rows returned",
+                    f"The result contains {len(data)} rows",
+                )
+            return httpx.Response(200, json=data[0], headers=headers)
+        return httpx.Response(200, json=data, headers=headers)
+
+    # ── RPCs (see the SQL functions of the same name) ──────────────────────
+
+    def _rpc(self, name: str, request: httpx.Request) -> httpx.Response:
+        handler = getattr(self, f"_rpc_{name}", None)
+        if handler is None:
+            raise PostgrestError(404, "PGRST202", f"Could not find the function public.{name} in the schema cache")
+        self._count(f"rpc {name}")
+        args = json.loads(request.content or b"{}")
+        with self._transaction():
+            return httpx.Response(200, json=handler(**args))
+
+    def _rpc_record_login_attempt(self, p_user_id, p_success, p_max_attempts=5, p_lockout_minutes=30):
+        user = self.table("users").rows.get(p_user_id)
+        if user is None:
+            return []
+        now = datetime.now(timezone.utc)
+        locked = _temporal(user["locked_until"]) if user.get("locked_until") else None
+        if p_success:
+            attempts, locked_until = 0, None
+        else:
+            attempts = 1 if locked is not None and locked <= now else (user.get("failed_login_attempts") or 0) + 1
+            if locked is not None and locked > now:
+                locked_until = user["locked_until"]
+            elif attempts >= p_max_attempts:
+                # TIMESTAMP column: naive UTC, as Postgres returns it
+                locked_until = (now + timedelta(minutes=p_lockout_minutes)).replace(tzinfo=None).isoformat()
+            else:
+                locked_until = None
+        row = self._update("users", user, {"failed_login_attempts": attempts, "locked_until": locked_until})
+        return [{"failed_login_attempts": row["failed_login_attempts"], "locked_until": row["locked_until"]}]
+
+    def _rpc_allocate_member_ids(self, p_prefix, p_count=1):
+        counters = self.table("member_id_counters")
+        current = counters.rows.get(p_prefix)
+        last = (current["last_value"] if current else 0) + p_count
+        row = {"prefix": p_prefix, "last_value": last, "updated_at": _now()}
+        self._write("member_id_counters", row, replacing=p_prefix if current else None)
+        return [
+            {"member_id": f"{p_prefix}-{n:03d}" if n < 1000 else f"{p_prefix}-{n}"}
+            for n in range(last - p_count + 1, last + 1)
+        ]
+
+    def _rpc_transaction_rollup(self, p_dimension, p_from=None, p_to=None):
+        # Computed from the ledger instead of a maintained transaction_rollups table
+        first = p_from[:7] if p_from else None
+        last = p_to[:7] if p_to else None
+        buckets: Dict[str, dict] = {}
+        for tx in self.table("transactions").rows.values():
+            month = str(tx.get("transaction_date") or "")[:7]
+            if (first and month < first) or (last and month > last):
+                continue
+            bucket = {
+                "month": month,
+                "category": tx.get("category") or "OTHER",
+                "role": tx.get("member_role") or "NONE",
+            }.get(p_dimension, "all")
+            totals = buckets.setdefault(bucket, {"bucket": bucket, "income": 0.0, "expense": 0.0, "tx_count": 0})
+            amount = float(tx.get("amount") or 0)
+            if tx.get("type") == "INCOME":
+                totals["income"] += amount
+            elif tx.get("type") == "EXPENSE":
+                totals["expense"] += amount
+            totals["tx_count"] += 1
+        return [buckets[key] for key in sorted(buckets)]
+
+    def _rpc_list_storage_objects(self, p_bucket):
+        return [
+            {"name": obj["name"], "size": obj["size"], "created_at": obj["created_at"]}
+            for obj in self._objects.get(p_bucket, {}).values()
+        ]
+
+    # ── storage and auth ───────────────────────────────────────────────────
+
+    def _storage(self, path: str, request: httpx.Request) -> httpx.Response:
+        if request.method == "DELETE":
+            bucket = path.strip("/")
+            self._count(f"storage remove {bucket}")
+            names = json.loads(request.content or b"{}").get("prefixes", [])
+            removed = [self._objects[bucket].pop(name) for name in names if name in self._objects[bucket]]
+            return httpx.Response(200, json=[
+                {
+                    "name": obj["name"], "bucket_id": bucket, "id": obj["id"],
+                    "created_at": obj["created_at"], "updated_at": obj["created_at"],
+                    "metadata": {"size": obj["size"], "mimetype": obj["mimetype"]},
+                }
+                for obj in removed
+            ])
+
+        if request.method in ("POST", "PUT") and not path.startswith(("public/", "list/", "sign/")):
+            bucket, _, name = path.partition("/")
+            self._count(f"storage upload {bucket}")
+            upsert = request.headers.get("x-upsert", "false") == "true" or request.method == "PUT"
+            if name in self._objects[bucket] and not upsert:
+                return httpx.Response(400, json={"statusCode": "409", "error": "Duplicate", "message": "The resource already exists"})
+            content, mimetype = _uploaded_file(request)
+            self._objects[bucket][name] = {
+                "id": str(uuid.uuid4()), "name": name, "size": len(content),
+                "mimetype": mimetype, "created_at": _now(),
+            }
+            return httpx.Response(200, json={"Key": f"{bucket}/{name}", "Id": self._objects[bucket][name]["id"]})
+
+        return httpx.Response(404, json={"statusCode": "404", "error": "not_found", "message": f"Fake storage has no route {request.method} {path}"})
+
+    def _create_auth_user(self, request: httpx.Request) -> httpx.Response:
+        self._count("auth create_user")
+        attributes = json.loads(request.content or b"{}")
+        email = attributes.get("email")
+        if email and any(user.get("email") == email for user in self._auth_users.values()):
+            return httpx.Response(422, json={
+                "code": 422, "error_code": "email_exists",
+                "msg": "A user with this email address has already been registered",
+            })
+        now = _now()
+        user = {
+            "id": str(uuid.uuid4()),
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": email,
+            "phone": attributes.get("phone", ""),
+            "email_confirmed_at": now if attributes.get("email_confirm") else None,
+            "app_metadata": attributes.get("app_metadata") or {"provider": "email", "providers": ["email"]},
+            "user_metadata": attributes.get("user_metadata") or {},
+            "identities": [],
+            "created_at": now,
+            "updated_at": now,
+        }
+        self._auth_users[user["id"]] = user
+        return httpx.Response(200, json=user)
+
+
+def _uploaded_file(request: httpx.Request) -> Tuple[bytes, str]:
+    """File part of a multipart storage upload (or the raw body)."""
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("multipart/form-data"):
+        return request.content, content_type or "application/octet-stream"
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + request.content
+    )
+    for part in message.iter_parts():
+        if part.get_param("name", header="content-disposition") == "file":
+            return part.get_payload(decode=True) or b"", part.get_content_type()
+    return b"", "application/octet-stream"
+
+
+class FakeTransport(httpx.BaseTransport):
+    """httpx transport answering from a FakeDatabase after the configured latency."""
+
+    def __init__(self, database: FakeDatabase, latency_ms: float = 0.0, jitter_ms: float = 0.0):
+        self.database = database
+        self.latency = max(0.0, latency_ms) / 1000
+        self.jitter = max(0.0, jitter_ms) / 1000
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        return self.database.handle(request)
+
+
+_database: Optional[FakeDatabase] = None
+_database_lock = threading.Lock()
+
+
+def get_fake_database() -> FakeDatabase:
+    """The process-wide fake database, loading FAKE_DB_FIXTURE on first use."""
+    global _database
+    if _database is None:
+        with _database_lock:
+            if _database is None:
+                database = FakeDatabase()
+                if settings.fake_db_fixture:
+                    with open(settings.fake_db_fixture, encoding="utf-8") as f:
+                        database.load(json.load(f))
+                    logger.info("Fake database loaded %s: %s", settings.fake_db_fixture, database.stats()["rows"])
+                _database = database
+    return _database
+
+
+def create_fake_client() -> Client:
+    """A supabase Client whose HTTP calls are all served by the fake database."""
+    transport = FakeTransport(get_fake_database(), settings.fake_db_latency_ms, settings.fake_db_latency_jitter_ms)
+    return create_client(
+        settings.supabase_url,
+        settings.supabase_service_key,
+        options=ClientOptions(httpx_client=httpx.Client(transport=transport)),
+    )
@@ -0,0 +1,12 @@
+-- Indexes backing the public member directory (/members/active)
+-- Run this in your Supabase SQL Editor
+
+-- Keyset pagination over active members ordered by member_id
+CREATE INDEX IF NOT EXISTS idx_users_active_member_id
+  ON users(member_id)
+  WHERE status = 'ACTIVE';
+
+-- ETag lookup: latest updated_at among active members
+CREATE INDEX IF NOT EXISTS idx_users_active_updated_at
+  ON users(updated_at DESC)
+  WHERE status = 'ACTIVE';
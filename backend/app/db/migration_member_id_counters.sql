@@ -0,0 +1,56 @@
+-- SQL Migration: atomic member ID allocation
+-- Run this in your Supabase SQL Editor.
+--
+-- One counter row per member ID prefix (PID / NID / AID). allocate_member_ids
+-- bumps the counter in a single UPDATE, so concurrent approvals never receive
+-- the same ID and allocation cost no longer grows with membership. A block of
+-- IDs can be reserved in one call for bulk onboarding. IDs belonging to a
+-- failed approval are simply skipped (gaps are harmless).
+
+CREATE TABLE IF NOT EXISTS member_id_counters (
+  prefix TEXT PRIMARY KEY,
+  last_value INT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+ALTER TABLE member_id_counters ENABLE ROW LEVEL SECURITY;
+
+-- One-time seed from existing member IDs (safe to re-run: never moves a counter backwards)
+INSERT INTO member_id_counters (prefix, last_value)
+SELECT split_part(member_id, '-', 1), MAX(split_part(member_id, '-', 2)::INT)
+FROM users
+WHERE member_id ~ '^[A-Z]+-[0-9]+$'
+GROUP BY split_part(member_id, '-', 1)
+ON CONFLICT (prefix) DO UPDATE
+  SET last_value = GREATEST(member_id_counters.last_value, EXCLUDED.last_value),
+      updated_at = NOW();
+
+INSERT INTO member_id_counters (prefix, last_value)
+VALUES ('PID', 0), ('NID', 0), ('AID', 0)
+ON CONFLICT (prefix) DO NOTHING;
+
+-- Reserve p_count consecutive IDs for p_prefix, e.g. ('NID', 3) → NID-041, NID-042, NID-043
+CREATE OR REPLACE FUNCTION allocate_member_ids(p_prefix TEXT, p_count INT DEFAULT 1)
+RETURNS TABLE (member_id TEXT)
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  WITH bumped AS (
+    INSERT INTO member_id_counters AS c (prefix, last_value)
+    VALUES (p_prefix, p_count)
+    ON CONFLICT (prefix) DO UPDATE
+      SET last_value = c.last_value + p_count,
+          updated_at = NOW()
+    RETURNING c.last_value
+  )
+  SELECT p_prefix || '-' || CASE WHEN n < 1000 THEN lpad(n::TEXT, 3, '0') ELSE n::TEXT END
+  FROM bumped, generate_series(bumped.last_value - p_count + 1, bumped.last_value) AS n
+  ORDER BY n;
+$$;
+
+-- Only the backend (service role) may call it
+REVOKE ALL ON FUNCTION allocate_member_ids(TEXT, INT) FROM PUBLIC, anon, authenticated;
+
+-- Force schema cache refresh so the RPC is visible immediately
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,56 @@
+-- SQL Migration: one membership fee per membership
+-- Run this in your Supabase SQL Editor.
+--
+-- Makes the membership fee backfill and approvals idempotent. Each fee row
+-- carries a fee_key ("<ROLE>:<member_id>", see membership_fee_key() in
+-- app/accounts/backfill.py) and is written with
+-- ON CONFLICT (reference_user_id, fee_key) DO NOTHING. A retried approval
+-- therefore can't book the same fee twice, while an upgrade
+-- (e.g. NORMAL ₹100, then PERMANENT ₹5000) gets a new member ID and its own
+-- fee.
+--
+-- The constraint is a plain UNIQUE rather than a partial index
+-- WHERE category = 'MEMBERSHIP_FEE': PostgREST's on_conflict emits
+-- ON CONFLICT (columns) without a predicate, which Postgres can't match to a
+-- partial index. Only MEMBERSHIP_FEE rows get a fee_key, and NULLs never
+-- conflict, so it constrains exactly the fee rows.
+
+ALTER TABLE transactions ADD COLUMN IF NOT EXISTS fee_key TEXT;
+
+-- Key existing fees from their description ("Registration fee — PID-001 (PERMANENT)").
+-- Only the oldest row per (member, key) is keyed, so duplicates left by
+-- earlier overlapping backfills don't block the constraint; they are listed below.
+UPDATE transactions t
+SET fee_key = k.fee_key
+FROM (
+  SELECT id, fee_key,
+         row_number() OVER (PARTITION BY reference_user_id, fee_key ORDER BY created_at, id) AS n
+  FROM (
+    SELECT id, reference_user_id, created_at,
+           substring(description FROM '\(([A-Z]+)\)\s*$') || ':' ||
+           coalesce(nullif(substring(description FROM '—\s*(\S+)\s*\('), '—'), '') AS fee_key
+    FROM transactions
+    WHERE category = 'MEMBERSHIP_FEE' AND reference_user_id IS NOT NULL
+  ) parsed
+  WHERE fee_key IS NOT NULL
+) k
+WHERE t.id = k.id AND k.n = 1 AND t.fee_key IS NULL;
+
+ALTER TABLE transactions
+  DROP CONSTRAINT IF EXISTS transactions_reference_user_id_fee_key_key;
+ALTER TABLE transactions
+  ADD CONSTRAINT transactions_reference_user_id_fee_key_key UNIQUE (reference_user_id, fee_key);
+
+NOTIFY pgrst, 'reload schema';
+
+-- Fees left without a key: repeats of an already-keyed fee for the same
+-- membership, or rows whose description didn't parse. Nothing is deleted
+-- automatically; review these and remove or re-key them by hand.
+SELECT t.id, t.reference_user_id, u.member_id, u.full_name, t.amount,
+       t.description, t.transaction_date, t.created_at
+FROM transactions t
+LEFT JOIN users u ON u.id = t.reference_user_id
+WHERE t.category = 'MEMBERSHIP_FEE'
+  AND t.reference_user_id IS NOT NULL
+  AND t.fee_key IS NULL
+ORDER BY t.reference_user_id, t.created_at;
@@ -0,0 +1,60 @@
+-- SQL Migration for stateless JWT authorization (JWT_STATELESS_AUTH=true)
+-- Run this in your Supabase SQL Editor before enabling the setting.
+--
+-- Every user carries a token_version that is bumped whenever a field used for
+-- authorization changes. Tokens embed the version they were issued with; the
+-- backend keeps a local copy of token_versions (synced incrementally by
+-- updated_at) and only re-reads the users row when a token is stale.
+-- Deleting a user also bumps the version, so the user's outstanding tokens
+-- go stale and the re-read answers 404.
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version INT NOT NULL DEFAULT 0;
+
+-- No foreign key to users: the row written on delete must outlive the user
+CREATE TABLE IF NOT EXISTS token_versions (
+  user_id UUID PRIMARY KEY,
+  version INT NOT NULL,
+  updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_token_versions_updated_at ON token_versions(updated_at);
+
+ALTER TABLE token_versions ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION bump_token_version()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF NEW.role IS DISTINCT FROM OLD.role
+     OR NEW.status IS DISTINCT FROM OLD.status
+     OR NEW.membership_expires_at IS DISTINCT FROM OLD.membership_expires_at THEN
+    NEW.token_version = COALESCE(OLD.token_version, 0) + 1;
+    INSERT INTO token_versions (user_id, version, updated_at)
+    VALUES (NEW.id, NEW.token_version, NOW())
+    ON CONFLICT (user_id) DO UPDATE
+      SET version = EXCLUDED.version, updated_at = EXCLUDED.updated_at;
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS bump_users_token_version ON users;
+CREATE TRIGGER bump_users_token_version BEFORE UPDATE ON users
+  FOR EACH ROW EXECUTE FUNCTION bump_token_version();
+
+CREATE OR REPLACE FUNCTION bump_token_version_on_delete()
+RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO token_versions (user_id, version, updated_at)
+  VALUES (OLD.id, COALESCE(OLD.token_version, 0) + 1, NOW())
+  ON CONFLICT (user_id) DO UPDATE
+    SET version = EXCLUDED.version, updated_at = EXCLUDED.updated_at;
+  RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS bump_deleted_user_token_version ON users;
+CREATE TRIGGER bump_deleted_user_token_version AFTER DELETE ON users
+  FOR EACH ROW EXECUTE FUNCTION bump_token_version_on_delete();
+
+-- Force schema cache refresh so the API picks up the new column immediately
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,17 @@
+-- Indexes backing the paginated ledger (/accounts/transactions) and its export
+-- Run this in your Supabase SQL Editor
+
+-- Keyset pagination: newest first by (transaction_date, created_at, id)
+CREATE INDEX IF NOT EXISTS idx_transactions_ledger_order
+  ON transactions(transaction_date DESC, created_at DESC, id DESC);
+
+-- Member filter and the embedded member join
+CREATE INDEX IF NOT EXISTS idx_transactions_reference_user
+  ON transactions(reference_user_id, transaction_date DESC);
+
+-- Category / type filters
+CREATE INDEX IF NOT EXISTS idx_transactions_category_date
+  ON transactions(category, transaction_date DESC);
+
+CREATE INDEX IF NOT EXISTS idx_transactions_type_date
+  ON transactions(type, transaction_date DESC);
@@ -0,0 +1,116 @@
+-- SQL Migration: maintained ledger rollups for /accounts/summary and /accounts/rollups/*
+-- Run this in your Supabase SQL Editor.
+--
+-- transaction_rollups holds one row per (month, type, category, member role)
+-- and is kept current by a trigger on transactions, so dashboard totals read a
+-- few hundred rollup rows at most instead of the whole ledger.
+
+-- Role of the linked member when the transaction was recorded, so later role
+-- changes do not move historical amounts between rollup buckets
+ALTER TABLE transactions ADD COLUMN IF NOT EXISTS member_role TEXT;
+
+UPDATE transactions t
+SET member_role = u.role
+FROM users u
+WHERE t.reference_user_id = u.id AND t.member_role IS NULL;
+
+CREATE OR REPLACE FUNCTION set_transaction_member_role()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF NEW.member_role IS NULL AND NEW.reference_user_id IS NOT NULL THEN
+    SELECT role INTO NEW.member_role FROM users WHERE id = NEW.reference_user_id;
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_transactions_member_role ON transactions;
+CREATE TRIGGER trg_transactions_member_role
+  BEFORE INSERT ON transactions
+  FOR EACH ROW EXECUTE FUNCTION set_transaction_member_role();
+
+CREATE TABLE IF NOT EXISTS transaction_rollups (
+  month DATE NOT NULL,            -- first day of the month
+  type TEXT NOT NULL,             -- INCOME / EXPENSE
+  category TEXT NOT NULL,
+  member_role TEXT NOT NULL,      -- 'NONE' when not linked to a member
+  amount NUMERIC(15, 2) NOT NULL DEFAULT 0,
+  tx_count INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (month, type, category, member_role)
+);
+
+ALTER TABLE transaction_rollups ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION apply_transaction_rollup(
+  p_date DATE, p_type TEXT, p_category TEXT, p_role TEXT, p_amount NUMERIC, p_count INT
+)
+RETURNS VOID AS $$
+  INSERT INTO transaction_rollups AS r (month, type, category, member_role, amount, tx_count)
+  VALUES (date_trunc('month', p_date)::DATE, p_type, COALESCE(p_category, 'OTHER'), COALESCE(p_role, 'NONE'), p_amount, p_count)
+  ON CONFLICT (month, type, category, member_role) DO UPDATE
+    SET amount = r.amount + EXCLUDED.amount,
+        tx_count = r.tx_count + EXCLUDED.tx_count;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION maintain_transaction_rollups()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM apply_transaction_rollup(OLD.transaction_date, OLD.type, OLD.category, OLD.member_role, -OLD.amount, -1);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM apply_transaction_rollup(NEW.transaction_date, NEW.type, NEW.category, NEW.member_role, NEW.amount, 1);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_transactions_rollups ON transactions;
+CREATE TRIGGER trg_transactions_rollups
+  AFTER INSERT OR UPDATE OR DELETE ON transactions
+  FOR EACH ROW EXECUTE FUNCTION maintain_transaction_rollups();
+
+-- Recompute every rollup from the ledger (run once now; rerun if they ever drift)
+CREATE OR REPLACE FUNCTION rebuild_transaction_rollups()
+RETURNS VOID AS $$
+  DELETE FROM transaction_rollups;
+  INSERT INTO transaction_rollups (month, type, category, member_role, amount, tx_count)
+  SELECT date_trunc('month', transaction_date)::DATE, type, COALESCE(category, 'OTHER'),
+         COALESCE(member_role, 'NONE'), SUM(amount), COUNT(*)
+  FROM transactions
+  GROUP BY 1, 2, 3, 4;
+$$ LANGUAGE sql;
+
+SELECT rebuild_transaction_rollups();
+
+-- Income / expense per bucket. p_dimension: 'total', 'month', 'category' or 'role'.
+-- p_from / p_to (inclusive) limit the months covered.
+CREATE OR REPLACE FUNCTION transaction_rollup(p_dimension TEXT, p_from DATE DEFAULT NULL, p_to DATE DEFAULT NULL)
+RETURNS TABLE (bucket TEXT, income NUMERIC, expense NUMERIC, tx_count BIGINT)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  SELECT
+    CASE p_dimension
+      WHEN 'month' THEN to_char(month, 'YYYY-MM')
+      WHEN 'category' THEN category
+      WHEN 'role' THEN member_role
+      ELSE 'all'
+    END AS bucket,
+    COALESCE(SUM(amount) FILTER (WHERE type = 'INCOME'), 0),
+    COALESCE(SUM(amount) FILTER (WHERE type = 'EXPENSE'), 0),
+    COALESCE(SUM(tx_count), 0)
+  FROM transaction_rollups
+  WHERE (p_from IS NULL OR month >= date_trunc('month', p_from)::DATE)
+    AND (p_to IS NULL OR month <= date_trunc('month', p_to)::DATE)
+  GROUP BY 1
+  ORDER BY 1;
+$$;
+
+-- Only the backend (service role) may call it
+REVOKE ALL ON FUNCTION transaction_rollup(TEXT, DATE, DATE) FROM PUBLIC, anon, authenticated;
+
+-- Force schema cache refresh so the RPC is visible immediately
+NOTIFY pgrst, 'reload schema';
@@ -1,21 +1,168 @@
 import asyncio
+import contextvars
+import inspect
 import logging
+import queue
 import threading
-from supabase import create_client, Client
+import time
+from contextlib import contextmanager
+from typing import Optional
+from supabase import create_client, acreate_client, AsyncClient, Client
 from app.config import settings
+from app.db.fake_client import create_fake_client, get_fake_database
 
 logger = logging.getLogger(__name__)
 
-# Initialize Supabase client with service role key (backend only)
+
+def _new_client() -> Client:
+    if settings.db_backend == "fake":
+        return create_fake_client()
+    return create_client(
+        settings.supabase_url,
+        settings.supabase_service_key,
+    )
+
+
+# Default client with service role key (backend only). Used for calls made
+# outside run_query, e.g. storage get_public_url, which only builds a URL.
 # Timeout is handled at the httpx level via SUPABASE_CLIENT_TIMEOUT env or sensible default
-supabase: Client = create_client(
-    settings.supabase_url,
-    settings.supabase_service_key,
+supabase: Client = _new_client()
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no pooled client becomes free within the configured wait."""
+
+
+class ClientPool:
+    """
+    Fixed-size pool of independent Supabase clients.
+
+    Each client owns its own httpx/HTTP2 connection, so a client is only ever
+    used by one thread at a time (which avoids the httpcore HTTP2 stream
+    bookkeeping crashes) while up to `size` queries run in parallel.
+    Clients are created lazily, up to `size`.
+    """
+
+    def __init__(self, size: int, timeout: float, factory=_new_client):
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._factory = factory
+        self._idle: "queue.LifoQueue[Client]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._acquired = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _checkout(self) -> Client:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if can_create:
+            try:
+                return self._factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            with self._lock:
+                self._timeouts += 1
+            raise PoolTimeoutError(
+                f"No database client available after {self.timeout:.1f}s (pool size {self.size})"
+            )
+
+    def acquire(self) -> Client:
+        start = time.perf_counter()
+        with self._lock:
+            self._waiting += 1
+        try:
+            client = self._checkout()
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._in_use += 1
+            self._acquired += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return client
+
+    def release(self, client: Client) -> None:
+        with self._lock:
+            self._in_use -= 1
+        self._idle.put(client)
+
+    @contextmanager
+    def connection(self):
+        client = self.acquire()
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+    def stats(self) -> dict:
+        with self._lock:
+            acquired = self._acquired
+            return {
+                "size": self.size,
+                "created": self._created,
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+                "waiting": self._waiting,
+                "acquired": acquired,
+                "timeouts": self._timeouts,
+                "wait_avg_ms": round(self._wait_total / acquired * 1000, 3) if acquired else 0.0,
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+            }
+
+
+_pool = ClientPool(settings.db_pool_size, settings.db_pool_timeout_seconds)
+
+# Shared async client for DB_BACKEND=async. A single httpx.AsyncClient
+# multiplexes concurrent requests on the event loop, so it needs no pool.
+_async_client: Optional[AsyncClient] = None
+_async_client_lock = asyncio.Lock()
+_async_in_flight = 0
+_async_max_in_flight = 0
+_async_queries = 0
+
+# Client checked out by the run_query call currently executing in this context.
+_active_client: contextvars.ContextVar[Optional[Client]] = contextvars.ContextVar(
+    "active_supabase_client", default=None
 )
 
-# Lock to prevent concurrent thread access to the shared httpx/HTTP2 connection,
-# which causes KeyError crashes in httpcore's HTTP2 stream bookkeeping.
-_db_lock = threading.Lock()
+
+class _PooledClientProxy:
+    """
+    Stand-in returned by get_supabase_client().
+
+    Attribute access resolves to the client bound by the enclosing run_query
+    call (a pooled sync client, or the shared async client), so existing query
+    lambdas run unchanged on either backend. Outside run_query it falls back
+    to the default client.
+    """
+
+    def __getattr__(self, name):
+        client = _active_client.get() or supabase
+        return getattr(client, name)
+
+
+_client_proxy = _PooledClientProxy()
 
 
 def get_supabase_client() -> Client:
@@ -23,22 +170,80 @@ def get_supabase_client() -> Client:
     Get Supabase client instance.
     Returns client with service role privileges (bypass RLS).
     """
-    return supabase
+    return _client_proxy
+
+
+async def get_async_supabase_client() -> AsyncClient:
+    """
+    Get the shared async Supabase client (service role), creating it on first use.
+    Its builders mirror the sync API but `.execute()` returns a coroutine.
+    """
+    global _async_client
+    if _async_client is None:
+        async with _async_client_lock:
+            if _async_client is None:
+                _async_client = await acreate_client(
+                    settings.supabase_url,
+                    settings.supabase_service_key,
+                )
+    return _async_client
+
+
+def get_pool_stats() -> dict:
+    """Pool size, utilisation and wait-time counters for monitoring."""
+    stats = {
+        "backend": settings.db_backend,
+        **_pool.stats(),
+        "async_in_flight": _async_in_flight,
+        "async_max_in_flight": _async_max_in_flight,
+        "async_queries": _async_queries,
+    }
+    if settings.db_backend == "fake":
+        stats["fake_db"] = get_fake_database().stats()
+    return stats
+
+
+async def _run_async(query_fn):
+    global _async_in_flight, _async_max_in_flight, _async_queries
+    client = await get_async_supabase_client()
+    token = _active_client.set(client)
+    _async_in_flight += 1
+    _async_queries += 1
+    _async_max_in_flight = max(_async_max_in_flight, _async_in_flight)
+    try:
+        result = query_fn()
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+    finally:
+        _async_in_flight -= 1
+        _active_client.reset(token)
 
 
 async def run_query(query_fn):
     """
-    Run a synchronous Supabase/postgrest query in a thread-pool executor so it
-    does NOT block the FastAPI async event loop.
+    Run a Supabase/postgrest query without blocking the FastAPI event loop.
 
-    A threading lock serializes access to the shared httpx client to prevent
-    KeyError crashes caused by concurrent HTTP/2 stream access across threads.
+    With DB_BACKEND=async the query is built on the shared async client and
+    awaited directly on the event loop — no thread hop.
+
+    Otherwise (the default, the fallback, and DB_BACKEND=fake) the synchronous
+    query runs in a thread-pool executor. Each call checks out its own client from the pool
+    for the duration of the query, so independent requests hit the database
+    in parallel without sharing an HTTP/2 connection across threads.
 
     Usage:
         result = await run_query(lambda: supabase.table("users").select("*").execute())
     """
-    def _locked():
-        with _db_lock:
-            return query_fn()
+    if settings.db_backend == "async":
+        return await _run_async(query_fn)
+
+    def _pooled():
+        with _pool.connection() as client:
+            token = _active_client.set(client)
+            try:
+                return query_fn()
+            finally:
+                _active_client.reset(token)
 
-    return await asyncio.to_thread(_locked)
+    return await asyncio.to_thread(_pooled)
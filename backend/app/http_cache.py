@@ -0,0 +1,22 @@
+import hashlib
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag derived from the given version components."""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already names `etag`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in {tag.strip() for tag in header.split(",")}
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
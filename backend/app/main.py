@@ -1,5 +1,6 @@
 import logging
 import traceback
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -9,11 +10,18 @@ from slowapi.errors import RateLimitExceeded
 
 from app.config import settings
 from app.auth.routes import router as auth_router, limiter
+from app.auth.utils import pin_hasher
+from app.workers import ExecutorSaturatedError
+from app.members.directory import member_directory, directory_resync
 from app.members.routes import router as members_router
+from app.matrimony.scoring import match_index, match_index_resync
+from app.matrimony.images import image_processor
 from app.admin.routes import router as admin_router
 from app.articles.routes import router as articles_router
+from app.articles.janitor import article_cleanup
 from app.accounts.routes import router as accounts_router
-from app.matrimony.routes import router as matrimony_router
+from app.matrimony.routes import router as matrimony_router, MAX_UPLOAD_BODY
+from app.body_limit import BodySizeLimitMiddleware
 
 # Configure root logger for the application
 logging.basicConfig(
@@ -22,18 +30,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.member_directory_enabled:
+        try:
+            await member_directory.load()
+        except Exception:
+            # Routes fall back to Supabase until the periodic resync succeeds
+            logger.exception("Initial member directory load failed")
+        directory_resync.start()
+    if settings.match_ranking_enabled:
+        try:
+            await match_index.load()
+        except Exception:
+            # /matrimony/matches serves unranked results until the resync succeeds
+            logger.exception("Initial match index load failed")
+        match_index_resync.start()
+    article_cleanup.start()
+    yield
+    await article_cleanup.stop()
+    await match_index_resync.stop()
+    await directory_resync.stop()
+    pin_hasher.shutdown()
+    image_processor.shutdown()
+
+
 app = FastAPI(
     title="Community App API",
     description="Backend API for community application with controlled membership",
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 
 # Register slowapi rate limiter + its 429 exception handler
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Refuse oversized uploads before Starlette spools the multipart body
+# (added before CORS so the 413 still carries CORS headers)
+app.add_middleware(BodySizeLimitMiddleware, limits={"/matrimony/upload-photo": MAX_UPLOAD_BODY})
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -41,6 +80,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 
@@ -59,6 +99,17 @@ async def health_check():
     )
 
 
+# Worker pool back-pressure (e.g. a login burst saturating bcrypt) — ask clients to retry
+@app.exception_handler(ExecutorSaturatedError)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturatedError):
+    logger.warning("Rejected %s %s: %s", request.method, request.url.path, exc)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly."},
+        headers={"Retry-After": "1"},
+    )
+
+
 # Global exception handler — ensures CORS headers are present even on 500s
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(request: Request, exc: Exception):
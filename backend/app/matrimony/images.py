@@ -0,0 +1,96 @@
+import io
+import logging
+from typing import Dict, Optional
+
+from PIL import Image, ImageOps
+
+from app.config import settings
+from app.workers import BoundedExecutor
+
+logger = logging.getLogger(__name__)
+
+# Longest side in pixels for each stored variant
+VARIANTS = {
+    "thumb": 160,   # match list
+    "card": 480,    # profile cards / galleries
+    "full": 1280,   # detail view
+}
+WEBP_QUALITY = {"thumb": 70, "card": 78, "full": 82}
+VARIANT_CONTENT_TYPE = "image/webp"
+
+# Refuse decompression bombs: a 3MB upload has no business decoding to more than this
+MAX_IMAGE_PIXELS = 40_000_000
+
+
+class InvalidImageError(ValueError):
+    """Upload is not a decodable JPEG, PNG or WebP image."""
+
+
+def sniff_format(data: bytes) -> Optional[str]:
+    """Image format from the file's magic bytes ("jpeg", "png", "webp"), or None."""
+    if data[:3] == b"\xff\xd8\xff":
+        return "jpeg"
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def render_variants(data: bytes) -> Dict[str, bytes]:
+    """
+    Decode an upload and re-encode it as WebP at every VARIANTS size.
+
+    EXIF orientation is applied to the pixels and all metadata (EXIF, GPS,
+    ICC, XMP) is dropped, since nothing is copied into the new files.
+    Runs in the image worker pool.
+    """
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    try:
+        with Image.open(io.BytesIO(data)) as probe:
+            probe.verify()
+        image = Image.open(io.BytesIO(data))
+        image.load()
+    except (Image.DecompressionBombError, OSError, SyntaxError, ValueError) as exc:
+        raise InvalidImageError(str(exc)) from exc
+
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    variants = {}
+    for name, max_side in VARIANTS.items():
+        resized = image.copy()
+        resized.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        resized.save(out, format="WEBP", quality=WEBP_QUALITY[name], method=4)
+        variants[name] = out.getvalue()
+    return variants
+
+
+def variant_path(base_path: str, variant: str) -> str:
+    return f"{base_path}/{variant}.webp"
+
+
+def thumbnail_url_for(photo_url: str) -> str:
+    """
+    Thumbnail URL for a stored photo URL. Photos processed by this module
+    end in /full.webp with their siblings alongside; older uploads have no
+    variants, so their original URL is returned.
+    """
+    if photo_url and photo_url.endswith("/full.webp"):
+        return photo_url[: -len("full.webp")] + "thumb.webp"
+    return photo_url
+
+
+image_processor = BoundedExecutor(
+    "image-processor",
+    settings.image_executor,
+    settings.image_workers,
+    settings.image_max_pending,
+)
+
+
+async def process_image(data: bytes) -> Dict[str, bytes]:
+    """Render all variants off the event loop; raises InvalidImageError."""
+    return await image_processor.run(render_variants, data)
@@ -0,0 +1,164 @@
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.db import run_query
+from app.matrimony.models import MatchFilters
+
+MATCH_COLUMNS = (
+    "id, full_name, gender, age, gotram, star_with_pada, occupation, "
+    "current_city, photo_url, photos, photo_thumbnails, parishat_id"
+)
+# Cursor prefix for pages past the end of the precomputed ranking
+TAIL_CURSOR_PREFIX = "id:"
+
+
+def _like_literal(value: str) -> str:
+    """Escape user input for use inside an ILIKE pattern (PostgREST treats * as %)."""
+    return (
+        value.strip()
+        .replace("\\", "\\\\")
+        .replace("%", "\\%")
+        .replace("_", "\\_")
+        .replace("*", "")
+    )
+
+
+def _quoted(value: str) -> str:
+    """Quote a value for use inside a PostgREST or=(...) expression."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def build_match_query(supabase, my_profile: dict, filters: MatchFilters, columns: str = MATCH_COLUMNS):
+    """
+    PostgREST query for profiles matching `my_profile` under `filters`.
+
+    Every filter, including subscription expiry, is pushed down to the
+    database so only eligible rows leave Postgres. Results are ordered by id
+    for keyset pagination; the caller applies the limit.
+    """
+    target_gender = "FEMALE" if my_profile["gender"] == "MALE" else "MALE"
+    now = datetime.now(timezone.utc).isoformat()
+
+    query = (
+        supabase.table("matrimony_profiles")
+        .select(columns)
+        .eq("gender", target_gender)
+        .eq("status", "ACTIVE")
+        .eq("payment_status", "VERIFIED")
+        .gt("subscription_expires_at", now)
+    )
+
+    if filters.min_age is not None:
+        query = query.gte("age", filters.min_age)
+    if filters.max_age is not None:
+        query = query.lte("age", filters.max_age)
+    if filters.exclude_same_gotram and my_profile.get("gotram"):
+        gotram = _like_literal(my_profile["gotram"])
+        query = query.or_(f"gotram.is.null,gotram.not.ilike.{_quoted(gotram)}")
+    if filters.current_city:
+        query = query.ilike("current_city", _like_literal(filters.current_city))
+    if filters.willing_to_relocate is not None:
+        query = query.eq("willing_to_relocate", str(filters.willing_to_relocate).lower())
+    if filters.occupation:
+        query = query.ilike("occupation", f"%{_like_literal(filters.occupation)}%")
+    if filters.cursor:
+        query = query.gt("id", filters.cursor)
+
+    return query.order("id")
+
+
+async def find_matches(supabase, my_profile: dict, filters: MatchFilters) -> Tuple[List[dict], Optional[str]]:
+    """Run the match query; returns (matches, next_cursor)."""
+    def _fetch():
+        query = build_match_query(supabase, my_profile, filters)
+        if filters.limit:
+            # One extra row tells us whether another page exists
+            query = query.limit(filters.limit + 1)
+        return query.execute()
+
+    result = await run_query(_fetch)
+    matches = result.data or []
+
+    next_cursor = None
+    if filters.limit and len(matches) > filters.limit:
+        matches = matches[:filters.limit]
+        next_cursor = matches[-1]["id"]
+    return matches, next_cursor
+
+
+async def find_ranked_matches(
+    supabase, my_profile: dict, filters: MatchFilters, ranking: List[Tuple[str, float]]
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Serve matches in precomputed score order; returns (matches, next_cursor).
+
+    The ranked candidate ids go to the database with the same filters as
+    find_matches (so expiry and the optional filters still apply), and the
+    rows come back re-ordered by score. The ranking only holds the top K, so
+    once it runs out the rest of the eligible pool follows in id order
+    (without a match_score); no profile that find_matches would return is
+    left out. The cursor is the rank position of the last ranked row served,
+    or "id:<id>" once paging has moved past the ranking.
+    """
+    ranked_ids = [pid for pid, _ in ranking]
+    if filters.cursor and filters.cursor.startswith(TAIL_CURSOR_PREFIX):
+        return await _find_unranked(supabase, my_profile, filters, ranked_ids, filters.limit)
+
+    after = -1
+    if filters.cursor:
+        if not filters.cursor.isdigit():
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+        after = int(filters.cursor)
+
+    unpaged = filters.model_copy(update={"cursor": None})
+    positions = {pid: i for i, pid in enumerate(ranked_ids) if i > after}
+    rows: List[dict] = []
+    if positions:
+        result = await run_query(
+            lambda: build_match_query(supabase, my_profile, unpaged)
+            .in_("id", list(positions))
+            .execute()
+        )
+        rows = sorted(result.data or [], key=lambda row: positions[row["id"]])
+    for row in rows:
+        row["match_score"] = ranking[positions[row["id"]]][1]
+
+    if filters.limit and len(rows) > filters.limit:
+        rows = rows[:filters.limit]
+        return rows, str(positions[rows[-1]["id"]])
+
+    # Ranking exhausted: fill the page from the unranked remainder of the pool
+    remaining = filters.limit - len(rows) if filters.limit else None
+    tail, next_cursor = await _find_unranked(supabase, my_profile, unpaged, ranked_ids, remaining)
+    if next_cursor and not tail:
+        # The page is full of ranked rows; the next one starts the tail
+        next_cursor = str(positions[rows[-1]["id"]])
+    return rows + tail, next_cursor
+
+
+async def _find_unranked(
+    supabase, my_profile: dict, filters: MatchFilters, ranked_ids: List[str], limit: Optional[int]
+) -> Tuple[List[dict], Optional[str]]:
+    """Eligible profiles outside the ranking, in id order, after an "id:<id>" cursor."""
+    cursor = filters.cursor[len(TAIL_CURSOR_PREFIX):] if filters.cursor else None
+
+    def _fetch():
+        query = build_match_query(supabase, my_profile, filters.model_copy(update={"cursor": cursor}))
+        if ranked_ids:
+            query = query.not_.in_("id", ranked_ids)
+        if limit is not None:
+            # One extra row tells us whether another page exists
+            query = query.limit(limit + 1)
+        return query.execute()
+
+    result = await run_query(_fetch)
+    rows = result.data or []
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = TAIL_CURSOR_PREFIX + (rows[-1]["id"] if rows else "")
+    for row in rows:
+        row["match_score"] = None
+    return rows, next_cursor
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
 from typing import Optional, List
 from datetime import date, time
 from typing import Literal
@@ -98,6 +98,7 @@ class MatrimonyProfileResponse(BaseModel):
     email: Optional[EmailStr]
     photo_url: Optional[str]
     photos: Optional[List[str]]
+    photo_thumbnails: Optional[List[str]]
     payment_status: str
     status: str
     subscription_expires_at: Optional[str]
@@ -118,4 +119,24 @@ class MatrimonyMatchResponse(BaseModel):
     current_city: Optional[str]
     photo_url: Optional[str]
     photos: Optional[List[str]]
+    photo_thumbnails: Optional[List[str]]
     # Limiting exposed full fields until detailed view is clicked
+
+
+class MatchFilters(BaseModel):
+    """Query parameters for /matrimony/matches. All filters are applied in the database."""
+    min_age: Optional[int] = Field(None, ge=18, le=100)
+    max_age: Optional[int] = Field(None, ge=18, le=100)
+    exclude_same_gotram: bool = False
+    current_city: Optional[str] = Field(None, max_length=100)
+    willing_to_relocate: Optional[bool] = None
+    occupation: Optional[str] = Field(None, max_length=100, description="Keyword matched anywhere in occupation")
+    limit: Optional[int] = Field(None, ge=1, le=200, description="Page size; omit for all matches")
+    cursor: Optional[str] = Field(None, description="Value of X-Next-Cursor from the previous page")
+    sort: Literal["score", "id"] = Field("score", description="score: best matches first; id: stable listing")
+
+    @model_validator(mode="after")
+    def age_range_valid(self):
+        if self.min_age is not None and self.max_age is not None and self.min_age > self.max_age:
+            raise ValueError("min_age must not exceed max_age")
+        return self
@@ -0,0 +1,171 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set
+
+from app.db import get_supabase_client, run_query
+from app.matrimony.images import VARIANTS, variant_path
+
+logger = logging.getLogger(__name__)
+
+BUCKET = "matrimony-photos"
+OBJECTS_PREFIX = "matrimony/objects"
+REMOVE_BATCH_SIZE = 100
+PROFILE_PAGE_SIZE = 1000
+
+
+def photo_base_path(sha256: str) -> str:
+    """Storage prefix shared by every variant of the photo with this content hash."""
+    return f"{OBJECTS_PREFIX}/{sha256[:2]}/{sha256}"
+
+
+def variant_urls(bucket, base_path: str) -> Dict[str, str]:
+    return {name: bucket.get_public_url(variant_path(base_path, name)) for name in VARIANTS}
+
+
+async def find_photo(supabase, sha256: str) -> Optional[str]:
+    """
+    Base path of an already-stored photo with this content hash, or None.
+    A hit refreshes last_seen_at so the garbage collector leaves it alone
+    while the uploader finishes registering.
+    """
+    result = await run_query(
+        lambda: supabase.table("matrimony_photo_objects")
+        .update({"last_seen_at": datetime.now(timezone.utc).isoformat()})
+        .eq("sha256", sha256)
+        .execute()
+    )
+    return result.data[0]["base_path"] if result.data else None
+
+
+async def record_photo(supabase, sha256: str, base_path: str, user_id: str, size_bytes: int) -> None:
+    await run_query(
+        lambda: supabase.table("matrimony_photo_objects")
+        .upsert(
+            {
+                "sha256": sha256,
+                "base_path": base_path,
+                "uploaded_by": user_id,
+                "size_bytes": size_bytes,
+                "last_seen_at": datetime.now(timezone.utc).isoformat(),
+            },
+            on_conflict="sha256",
+        )
+        .execute()
+    )
+
+
+def _object_path(url: Optional[str], public_prefix: str) -> Optional[str]:
+    if not url or not url.startswith(public_prefix):
+        return None
+    return url[len(public_prefix):].split("?", 1)[0]
+
+
+def _variant_base(path: str) -> Optional[str]:
+    """Prefix of a generated variant (".../<name>.webp"), else None."""
+    base, _, filename = path.rpartition("/")
+    if filename in {f"{name}.webp" for name in VARIANTS}:
+        return base
+    return None
+
+
+async def _referenced(supabase, public_prefix: str):
+    """Object paths and variant prefixes referenced by any matrimony profile."""
+    paths: Set[str] = set()
+    prefixes: Set[str] = set()
+    start = 0
+    while True:
+        page = await run_query(
+            lambda: supabase.table("matrimony_profiles")
+            .select("id, photo_url, photos, photo_thumbnails")
+            .order("id")
+            .range(start, start + PROFILE_PAGE_SIZE - 1)
+            .execute()
+        )
+        for row in page.data or []:
+            urls = [row.get("photo_url"), *(row.get("photos") or []), *(row.get("photo_thumbnails") or [])]
+            for url in urls:
+                path = _object_path(url, public_prefix)
+                if path:
+                    paths.add(path)
+                    base = _variant_base(path)
+                    if base:
+                        prefixes.add(base)
+        if len(page.data or []) < PROFILE_PAGE_SIZE:
+            return paths, prefixes
+        start += PROFILE_PAGE_SIZE
+
+
+async def collect_garbage(dry_run: bool = True, grace_hours: int = 24) -> dict:
+    """
+    Delete objects in the matrimony-photos bucket that no profile references.
+
+    An object is kept if its path (or, for generated variants, any sibling
+    variant) appears in a profile's photo_url, photos or photo_thumbnails,
+    if it is younger than `grace_hours` (uploaded but not yet submitted with
+    a profile), or if its hash index entry was reused within that window.
+    With dry_run nothing is deleted; the report shows what would be.
+    """
+    supabase = get_supabase_client()
+    public_prefix = supabase.storage.from_(BUCKET).get_public_url("")
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=grace_hours)
+
+    paths, prefixes = await _referenced(supabase, public_prefix)
+
+    recent = await run_query(
+        lambda: supabase.table("matrimony_photo_objects")
+        .select("base_path")
+        .gt("last_seen_at", cutoff.isoformat())
+        .execute()
+    )
+    prefixes.update(row["base_path"] for row in (recent.data or []))
+
+    # One call for the whole listing instead of walking every folder
+    objects = await run_query(
+        lambda: supabase.rpc("list_storage_objects", {"p_bucket": BUCKET}).execute()
+    )
+
+    orphans: List[dict] = []
+    kept = 0
+    for obj in objects.data or []:
+        name = obj["name"]
+        created_at = datetime.fromisoformat(obj["created_at"].replace("Z", "+00:00"))
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        base = _variant_base(name)
+        if name in paths or (base and base in prefixes) or created_at > cutoff:
+            kept += 1
+        else:
+            orphans.append(obj)
+
+    removed = 0
+    if not dry_run:
+        names = [obj["name"] for obj in orphans]
+        for start in range(0, len(names), REMOVE_BATCH_SIZE):
+            batch = names[start:start + REMOVE_BATCH_SIZE]
+            await run_query(lambda: supabase.storage.from_(BUCKET).remove(batch))
+            removed += len(batch)
+
+        # Drop index entries whose objects are gone so the next upload re-creates them
+        orphan_bases = {b for b in (_variant_base(name) for name in names) if b and b.startswith(OBJECTS_PREFIX)}
+        hashes = [base.rsplit("/", 1)[-1] for base in orphan_bases]
+        for start in range(0, len(hashes), REMOVE_BATCH_SIZE):
+            batch = hashes[start:start + REMOVE_BATCH_SIZE]
+            await run_query(
+                lambda: supabase.table("matrimony_photo_objects").delete().in_("sha256", batch).execute()
+            )
+
+    orphan_bytes = sum(obj.get("size") or 0 for obj in orphans)
+    logger.info(
+        "Matrimony photo GC (dry_run=%s): %d kept, %d orphaned (%d bytes), %d removed",
+        dry_run, kept, len(orphans), orphan_bytes, removed,
+    )
+    return {
+        "dry_run": dry_run,
+        "grace_hours": grace_hours,
+        "objects_scanned": kept + len(orphans),
+        "kept": kept,
+        "orphaned": len(orphans),
+        "orphaned_bytes": orphan_bytes,
+        "removed": removed,
+        "sample": [obj["name"] for obj in orphans[:20]],
+    }
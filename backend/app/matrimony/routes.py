@@ -1,14 +1,27 @@
+import asyncio
+import hashlib
 import logging
-import time
 from datetime import datetime, timezone, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from typing import Annotated, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, UploadFile, File
 
 from app.auth.dependencies import get_current_user_id, require_active_status
 from app.db import get_supabase_client, run_query
-from app.matrimony.models import MatrimonyProfileCreate, MatrimonyRenewRequest
+from app.matrimony.models import MatrimonyProfileCreate, MatrimonyRenewRequest, MatchFilters
+from app.matrimony.matching import find_matches, find_ranked_matches
+from app.matrimony.scoring import match_index, FEATURE_COLUMNS
+from app.matrimony.images import (
+    VARIANTS, VARIANT_CONTENT_TYPE, InvalidImageError, process_image, sniff_format,
+    thumbnail_url_for, variant_path,
+)
+from app.matrimony.photo_store import BUCKET as PHOTO_BUCKET, find_photo, photo_base_path, record_photo, variant_urls
 
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp"}
 MAX_IMAGE_SIZE = 3 * 1024 * 1024  # 3MB per photo (max 3 photos = 6MB total enforced client-side)
+# Whole-request cap for upload-photo (photo + multipart envelope), enforced by
+# BodySizeLimitMiddleware before the body is buffered
+MAX_UPLOAD_BODY = MAX_IMAGE_SIZE + 64 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -23,6 +36,33 @@ def _subscription_expiry() -> str:
     return (datetime.now(timezone.utc) + timedelta(days=30)).isoformat()
 
 
+async def _read_upload(file: UploadFile) -> Tuple[bytes, str]:
+    """
+    Read an upload in chunks, stopping with 413 as soon as it passes
+    MAX_IMAGE_SIZE. Returns (contents, sha256 hex digest).
+    """
+    if file.size is not None and file.size > MAX_IMAGE_SIZE:
+        raise HTTPException(status_code=413, detail="Image must be under 3MB.")
+
+    digest = hashlib.sha256()
+    buffer = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        if len(buffer) + len(chunk) > MAX_IMAGE_SIZE:
+            raise HTTPException(status_code=413, detail="Image must be under 3MB.")
+        digest.update(chunk)
+        buffer += chunk
+    return bytes(buffer), digest.hexdigest()
+
+
+def _photo_response(urls: dict, sha256: str) -> dict:
+    return {
+        "url": urls["full"],
+        "thumbnail_url": urls["thumb"],
+        "card_url": urls["card"],
+        "sha256": sha256,
+    }
+
+
 def _is_subscription_active(profile: dict) -> bool:
     expires_at = profile.get("subscription_expires_at")
     if not expires_at:
@@ -38,33 +78,56 @@ async def upload_photo(
     file: UploadFile = File(...),
     current_user: dict = Depends(require_active_status),
 ):
-    """Upload a matrimony profile photo. Returns the public URL."""
+    """
+    Upload a matrimony profile photo.
+
+    The image is re-encoded server-side into WebP thumb/card/full variants
+    (EXIF stripped) and stored content-addressed: bytes that were uploaded
+    before (a retry, a re-submission, the same photo on another profile)
+    reuse the existing objects without being processed again.
+    Returns the full-size URL as `url` plus the variant URLs.
+    """
     if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(status_code=400, detail="Only JPEG, PNG, or WebP images are allowed.")
 
-    contents = await file.read()
-    if len(contents) > MAX_IMAGE_SIZE:
-        raise HTTPException(status_code=400, detail="Image must be under 5MB.")
+    contents, sha256 = await _read_upload(file)
 
-    user_id = current_user["id"]
-    ext = file.filename.rsplit(".", 1)[-1] if "." in file.filename else "jpg"
-    file_path = f"matrimony/{user_id}/{int(time.time())}.{ext}"
+    # The declared content type is client-controlled; trust the bytes instead
+    if sniff_format(contents) is None:
+        raise HTTPException(status_code=400, detail="Only JPEG, PNG, or WebP images are allowed.")
 
+    user_id = current_user["id"]
     supabase = get_supabase_client()
-
-    def _upload():
-        return supabase.storage.from_("matrimony-photos").upload(
-            file_path,
-            contents,
-            {"content-type": file.content_type, "upsert": "true"},
+    # Only for public URLs (string work); storage requests resolve the bucket
+    # inside run_query so each one goes through its own pooled client
+    bucket = supabase.storage.from_(PHOTO_BUCKET)
+
+    base_path = await find_photo(supabase, sha256)
+    if base_path:
+        logger.info("User %s re-uploaded stored photo %s", user_id, sha256[:12])
+        return _photo_response(variant_urls(bucket, base_path), sha256)
+
+    try:
+        variants = await process_image(contents)
+    except InvalidImageError as exc:
+        logger.info("Rejected unreadable photo from user %s: %s", current_user["id"], exc)
+        raise HTTPException(status_code=400, detail="Image could not be read. Please upload a valid photo.")
+
+    base_path = photo_base_path(sha256)
+
+    def _upload(name: str):
+        return lambda: supabase.storage.from_(PHOTO_BUCKET).upload(
+            variant_path(base_path, name),
+            variants[name],
+            {"content-type": VARIANT_CONTENT_TYPE, "upsert": "true"},
         )
 
-    res = await run_query(_upload)
-    if hasattr(res, "error") and res.error:
+    results = await asyncio.gather(*(run_query(_upload(name)) for name in VARIANTS))
+    if any(hasattr(res, "error") and res.error for res in results):
         raise HTTPException(status_code=500, detail="Failed to upload photo.")
 
-    public_url = supabase.storage.from_("matrimony-photos").get_public_url(file_path)
-    return {"url": public_url}
+    await record_photo(supabase, sha256, base_path, user_id, len(contents))
+    return _photo_response(variant_urls(bucket, base_path), sha256)
 
 
 @router.post("/register")
@@ -98,6 +161,7 @@ async def create_profile(
     # Keep photo_url in sync with first photo for backward compatibility
     if "photos" in profile_data and profile_data["photos"]:
         profile_data["photo_url"] = profile_data["photos"][0]
+        profile_data["photo_thumbnails"] = [thumbnail_url_for(url) for url in profile_data["photos"]]
 
     profile_data["user_id"] = user_id
     profile_data["payment_status"] = "PENDING"
@@ -109,6 +173,8 @@ async def create_profile(
     )
 
     profile_id = insert_res.data[0]["id"] if insert_res.data else "PENDING_VERIFICATION"
+    if insert_res.data:
+        await match_index.refresh_profiles([profile_id])
     logger.info("User %s submitted matrimony profile %s", user_id, profile_id)
     return {
         "message": "Profile created successfully. Pending admin approval.",
@@ -162,6 +228,7 @@ async def renew_subscription(
         .eq("user_id", user_id)
         .execute()
     )
+    await match_index.refresh_profiles([profile["id"]])
 
     logger.info("User %s submitted renewal payment reference", user_id)
     return {"message": "Renewal payment submitted. Pending admin approval."}
@@ -184,17 +251,29 @@ async def get_my_profile(current_user: dict = Depends(require_active_status)):
 
 
 @router.get("/matches")
-async def get_matches(current_user: dict = Depends(require_active_status)):
+async def get_matches(
+    response: Response,
+    filters: Annotated[MatchFilters, Query()],
+    current_user: dict = Depends(require_active_status),
+):
     """
     Get relevant matches for the active user's profile.
     Requires a VERIFIED profile with an active (non-expired) subscription.
+
+    By default matches come best-first from the precomputed compatibility
+    ranking, each with a `match_score` (0–100), followed by the rest of the
+    pool in id order (`match_score` null); `sort=id` lists the whole pool in
+    id order instead. Optional filters (age range, same-gotram
+    exclusion, city, relocation, occupation keyword) and subscription expiry
+    are applied in the database. Pass `limit` to paginate; the next page's
+    cursor is in X-Next-Cursor.
     """
     supabase = get_supabase_client()
     user_id = current_user["id"]
 
     my_profile_res = await run_query(
         lambda: supabase.table("matrimony_profiles")
-        .select("gender, payment_status, status, subscription_expires_at")
+        .select(FEATURE_COLUMNS)
         .eq("user_id", user_id)
         .execute()
     )
@@ -225,20 +304,14 @@ async def get_matches(current_user: dict = Depends(require_active_status)):
             detail="Your profile is inactive. Please contact support."
         )
 
-    target_gender = "FEMALE" if my_profile["gender"] == "MALE" else "MALE"
-
-    matches_res = await run_query(
-        lambda: supabase.table("matrimony_profiles")
-        .select("id, full_name, gender, age, gotram, star_with_pada, occupation, current_city, photo_url, photos, parishat_id")
-        .eq("gender", target_gender)
-        .eq("status", "ACTIVE")
-        .eq("payment_status", "VERIFIED")
-        .execute()
-    )
-
-    # Filter out expired subscriptions server-side
-    active_matches = [m for m in (matches_res.data or []) if m.get("subscription_expires_at") is None or _is_subscription_active(m)]
-    return active_matches
+    ranking = match_index.ranking_for(my_profile) if filters.sort == "score" else None
+    if ranking is not None:
+        matches, next_cursor = await find_ranked_matches(supabase, my_profile, filters, ranking)
+    else:
+        matches, next_cursor = await find_matches(supabase, my_profile, filters)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return matches
 
 
 @router.get("/profile/{profile_id}")
@@ -0,0 +1,502 @@
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.db import get_supabase_client, run_query
+from app.tasks import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+FEATURE_COLUMNS = (
+    "id, gender, age, gotram, star_with_pada, current_city, willing_to_relocate, "
+    "annual_income, status, payment_status, subscription_expires_at"
+)
+LOAD_PAGE_SIZE = 1000
+SCORE_BLOCK_ROWS = 512
+
+# Relative weight of each component in the final 0–100 score
+WEIGHTS = {"age": 0.35, "star": 0.30, "city": 0.20, "income": 0.15}
+NEUTRAL = 0.5  # component score when either side left the field blank
+# Same-gotram pairs rank below every other pair (the lowest regular score is
+# 4) but stay listed; excluding them is the exclude_same_gotram filter's job
+SAME_GOTRAM_SCORE = 0.0
+
+# Groom-minus-bride age gap → score: ideal 0–5 years, nothing beyond -3 / +10
+AGE_GAP_POINTS = ([-3.0, 0.0, 5.0, 10.0], [0.0, 1.0, 1.0, 0.0])
+
+# Annual income band edges in lakhs (band 0 = under 3 LPA … band 6 = 50+ LPA)
+INCOME_BAND_EDGES = np.array([3, 6, 10, 15, 25, 50], dtype=np.float32)
+
+# Tara koota: counting from one star to the other, (count - 1) % 9 picks the tara.
+# Janma is neutral; Vipat, Pratyak and Naidhana are unfavourable.
+TARA_SCORES = np.array([0.5, 1.0, 0.0, 1.0, 0.0, 1.0, 0.0, 1.0, 1.0], dtype=np.float32)
+
+NAKSHATRAS = [
+    ("Ashwini", "Aswini", "Asvini"),
+    ("Bharani",),
+    ("Krittika", "Kritika", "Karthika", "Kruthika", "Krithika", "Kartika"),
+    ("Rohini",),
+    ("Mrigashira", "Mrigasira", "Mrigasheersha", "Mrugasira", "Mrigashirsha", "Mrigasirsha"),
+    ("Ardra", "Arudra", "Aridra", "Thiruvathirai"),
+    ("Punarvasu", "Punarvasam", "Punarpoosam"),
+    ("Pushya", "Pushyami", "Pushyam", "Poosam", "Pooyam"),
+    ("Ashlesha", "Aslesha", "Ashlesa", "Ayilyam"),
+    ("Magha", "Makha", "Magam", "Makam"),
+    ("Purva Phalguni", "Poorva Phalguni", "Pubba", "Purva", "Pooram"),
+    ("Uttara Phalguni", "Uttara", "Uthiram", "Uttaram"),
+    ("Hasta", "Hastha", "Hastham", "Hastam"),
+    ("Chitra", "Chitta", "Chithra", "Chithirai"),
+    ("Swati", "Swathi", "Svati", "Chothi"),
+    ("Vishakha", "Visakha", "Vishaka", "Visakam", "Vishakam"),
+    ("Anuradha", "Anuraadha", "Anusham"),
+    ("Jyeshtha", "Jyeshta", "Jyesta", "Kettai", "Triketta"),
+    ("Mula", "Moola", "Moolam", "Mulam"),
+    ("Purva Ashadha", "Purvashada", "Poorvashada", "Purvashadha", "Pooradam"),
+    ("Uttara Ashadha", "Uttarashada", "Uttarashadha", "Uthiradam"),
+    ("Shravana", "Sravana", "Shravanam", "Sravanam", "Thiruvonam"),
+    ("Dhanishta", "Dhanishtha", "Dhanista", "Avittam"),
+    ("Shatabhisha", "Satabhisha", "Shatabhishak", "Sathabhisham", "Sadayam"),
+    ("Purva Bhadrapada", "Poorvabhadra", "Purvabhadra", "Poorattathi"),
+    ("Uttara Bhadrapada", "Uttarabhadra", "Uthrattathi"),
+    ("Revati", "Revathi"),
+]
+
+_INCOME_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(crores?|cr|lakhs?|lacs?|lpa|l|k|thousand)?\b")
+_STAR_SPLIT_RE = re.compile(r"[\d\-(/,]|\bpada\b")
+_SPELLING_VARIANTS = (
+    ("sh", "s"), ("th", "t"), ("dh", "d"), ("kh", "k"), ("ph", "p"), ("bh", "b"),
+    ("oo", "u"), ("ee", "i"), ("aa", "a"), ("w", "v"),
+)
+
+
+def _normalize(text: Optional[str]) -> str:
+    """Collapse case, punctuation and common transliteration variants."""
+    if not text:
+        return ""
+    s = re.sub(r"[^a-z]", "", text.lower())
+    for variant, canonical in _SPELLING_VARIANTS:
+        s = s.replace(variant, canonical)
+    return s
+
+
+_STAR_INDEX = {
+    _normalize(alias): index
+    for index, aliases in enumerate(NAKSHATRAS)
+    for alias in aliases
+}
+_STAR_SUFFIXES = tuple(_normalize(s) for s in ("nakshatram", "nakshatra", "star"))
+
+
+def parse_star(star_with_pada: Optional[str]) -> int:
+    """Nakshatra index 0–26 from text like "Rohini - 2"; -1 if unrecognised."""
+    if not star_with_pada:
+        return -1
+    name = _STAR_SPLIT_RE.split(star_with_pada.lower(), maxsplit=1)[0]
+    key = _normalize(name)
+    for suffix in _STAR_SUFFIXES:
+        if key.endswith(suffix) and key != suffix:
+            key = key[: -len(suffix)]
+            break
+    return _STAR_INDEX.get(key, -1)
+
+
+def parse_income_lakhs(annual_income: Optional[str]) -> Optional[float]:
+    """Annual income in lakhs from free text ("18 LPA", "1.2 Cr", "9,00,000", "60k per month")."""
+    if not annual_income:
+        return None
+    text = annual_income.lower().replace(",", "")
+    match = _INCOME_RE.search(text)
+    if not match:
+        return None
+    value = float(match.group(1))
+    unit = match.group(2) or ""
+    if unit.startswith("cr"):
+        value *= 100
+    elif unit in ("k", "thousand"):
+        value /= 100
+    elif not unit and value >= 1000:
+        value /= 100000  # plain rupees
+    if "month" in text or re.search(r"\bpm\b|/\s*m\b", text):
+        value *= 12
+    return value
+
+
+def _income_band(annual_income: Optional[str]) -> int:
+    lakhs = parse_income_lakhs(annual_income)
+    if lakhs is None:
+        return -1
+    return int(np.searchsorted(INCOME_BAND_EDGES, lakhs, side="right"))
+
+
+def _is_listed(row: dict, now: datetime) -> bool:
+    """Whether a profile belongs in the candidate pool (same rules as /matches)."""
+    if row.get("status") != "ACTIVE" or row.get("payment_status") != "VERIFIED":
+        return False
+    expires_at = row.get("subscription_expires_at")
+    if not expires_at:
+        return False
+    expiry = datetime.fromisoformat(expires_at.replace("Z", "+00:00"))
+    if expiry.tzinfo is None:
+        expiry = expiry.replace(tzinfo=timezone.utc)
+    return expiry > now
+
+
+class _Codes:
+    """Interns normalised strings (gotram, city) as small integers; -1 for blank."""
+
+    def __init__(self):
+        self._codes: Dict[str, int] = {}
+
+    def __call__(self, text: Optional[str]) -> int:
+        key = _normalize(text)
+        if not key:
+            return -1
+        return self._codes.setdefault(key, len(self._codes))
+
+
+class ProfileMatrix:
+    """Column arrays for every listed profile of one gender, row i ↔ ids[i]."""
+
+    def __init__(self, ids: List[str], features: List[tuple]):
+        self.ids = ids
+        self.pos = {pid: i for i, pid in enumerate(ids)}
+        columns = list(zip(*features)) if features else [()] * 6
+        self.age = np.array(columns[0], dtype=np.float32)
+        self.gotram = np.array(columns[1], dtype=np.int32)
+        self.star = np.array(columns[2], dtype=np.int16)
+        self.city = np.array(columns[3], dtype=np.int32)
+        self.relocate = np.array(columns[4], dtype=np.int8)
+        self.income = np.array(columns[5], dtype=np.int8)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def rows(self, index) -> dict:
+        """Feature columns for the given row selection, shaped (m, 1) for broadcasting."""
+        return {
+            name: getattr(self, name)[index][:, None]
+            for name in ("age", "gotram", "star", "city", "relocate", "income")
+        }
+
+
+def score_block(one: dict, other: ProfileMatrix, one_is_male: bool) -> np.ndarray:
+    """
+    Compatibility scores (0–100) of each profile in `one` (arrays shaped
+    (m, 1)) against every profile in `other`, as an (m, n) float32 matrix.
+    Same-gotram pairs score SAME_GOTRAM_SCORE. The score is symmetric in the
+    two profiles.
+    """
+    # Age: groom's age minus bride's age
+    gap = (one["age"] - other.age) if one_is_male else (other.age - one["age"])
+    age = np.interp(gap, *AGE_GAP_POINTS).astype(np.float32)
+    age = np.where(np.isnan(gap), NEUTRAL, age)
+
+    # Tara compatibility, counted in both directions
+    known_star = (one["star"] >= 0) & (other.star >= 0)
+    forward = TARA_SCORES[(other.star - one["star"]) % 27 % 9]
+    backward = TARA_SCORES[(one["star"] - other.star) % 27 % 9]
+    star = np.where(known_star, (forward + backward) / 2, NEUTRAL)
+
+    # City: same city, else either side willing to relocate
+    known_city = (one["city"] >= 0) & (other.city >= 0)
+    same_city = known_city & (one["city"] == other.city)
+    relocates = (one["relocate"] == 1) | (other.relocate == 1)
+    city = np.where(same_city, 1.0, np.where(relocates, 0.7, np.where(known_city, 0.2, NEUTRAL)))
+
+    # Income: closeness of income bands
+    known_income = (one["income"] >= 0) & (other.income >= 0)
+    band_gap = np.abs(one["income"].astype(np.int16) - other.income.astype(np.int16))
+    income = np.where(known_income, 1.0 - np.minimum(band_gap, 3) / 3.0, NEUTRAL)
+
+    total = 100.0 * (
+        WEIGHTS["age"] * age
+        + WEIGHTS["star"] * star
+        + WEIGHTS["city"] * city
+        + WEIGHTS["income"] * income
+    )
+    same_gotram = (one["gotram"] >= 0) & (one["gotram"] == other.gotram)
+    return np.where(same_gotram, SAME_GOTRAM_SCORE, total).astype(np.float32)
+
+
+def _top_k(scores: np.ndarray, ids: List[str], k: int) -> List[List[Tuple[str, float]]]:
+    """Best `k` (id, score) pairs per row of `scores`, highest first."""
+    n = scores.shape[1]
+    if n == 0:
+        return [[] for _ in range(scores.shape[0])]
+    k = min(k, n)
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    picked = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-picked, axis=1, kind="stable")
+    candidates = np.take_along_axis(candidates, order, axis=1)
+    picked = np.take_along_axis(picked, order, axis=1)
+    return [
+        [(ids[j], round(float(s), 1)) for j, s in zip(row_idx, row_scores)]
+        for row_idx, row_scores in zip(candidates, picked)
+    ]
+
+
+class MatchIndex:
+    """
+    Precomputed top-K compatibility ranking for every listed matrimony profile.
+
+    The whole pool (verified, active, unexpired profiles) is held as one
+    ProfileMatrix per gender and scored men × women in vectorised blocks at
+    startup and on each periodic resync. Between resyncs, refresh_profiles()
+    patches the pool after a profile is created, approved, rejected or
+    renewed: the changed profile's row is rescored against the other gender,
+    and it is merged into (or dropped from) everyone else's top-K.
+    """
+
+    def __init__(self, top_k: int):
+        self.top_k = top_k
+        self._gotram_codes = _Codes()
+        self._city_codes = _Codes()
+        self._features: Dict[str, Dict[str, tuple]] = {"MALE": {}, "FEMALE": {}}
+        self._matrices: Dict[str, ProfileMatrix] = {}
+        self._ranked: Dict[str, List[Tuple[str, float]]] = {}
+        self._loading = False
+        self._refresh_after_load: set = set()
+        self.loaded = False
+        self.loaded_at: Optional[float] = None
+        self.full_loads = 0
+        self.refreshes = 0
+        self.last_load_ms: Optional[float] = None
+        self.last_refresh_ms: Optional[float] = None
+        self.ad_hoc_rankings = 0
+
+    # ------------------------------------------------------------------
+    # Features
+    # ------------------------------------------------------------------
+
+    def _features_of(self, row: dict) -> tuple:
+        age = row.get("age")
+        relocate = row.get("willing_to_relocate")
+        return (
+            float(age) if age is not None else np.nan,
+            self._gotram_codes(row.get("gotram")),
+            parse_star(row.get("star_with_pada")),
+            self._city_codes(row.get("current_city")),
+            -1 if relocate is None else int(bool(relocate)),
+            _income_band(row.get("annual_income")),
+        )
+
+    def _rebuild(self, gender: str) -> None:
+        features = self._features[gender]
+        self._matrices[gender] = ProfileMatrix(list(features), list(features.values()))
+
+    @staticmethod
+    def _other(gender: str) -> str:
+        return "FEMALE" if gender == "MALE" else "MALE"
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    async def load(self) -> int:
+        """Read the full candidate pool and recompute every ranking."""
+        self._loading = True
+        try:
+            started = time.perf_counter()
+            rows = await self._fetch_pool()
+            fresh = MatchIndex(self.top_k)
+            fresh._gotram_codes = self._gotram_codes
+            fresh._city_codes = self._city_codes
+            for row in rows:
+                fresh._features[row["gender"]][row["id"]] = fresh._features_of(row)
+            await asyncio.to_thread(fresh._rank_all)
+
+            # Swap in one step; readers never see a partial load
+            self._features = fresh._features
+            self._matrices = fresh._matrices
+            self._ranked = fresh._ranked
+            self.loaded = True
+            self.loaded_at = time.time()
+            self.full_loads += 1
+            self.last_load_ms = round((time.perf_counter() - started) * 1000, 1)
+        finally:
+            self._loading = False
+
+        # Changes that landed while the pool was being read
+        if self._refresh_after_load:
+            pending, self._refresh_after_load = list(self._refresh_after_load), set()
+            await self.refresh_profiles(pending)
+
+        logger.info("Match index loaded: %d profiles in %.0f ms", len(self._ranked), self.last_load_ms)
+        return len(self._ranked)
+
+    async def _fetch_pool(self) -> List[dict]:
+        supabase = get_supabase_client()
+        now = datetime.now(timezone.utc).isoformat()
+        rows: List[dict] = []
+        start = 0
+        while True:
+            page = await run_query(
+                lambda: supabase.table("matrimony_profiles")
+                .select(FEATURE_COLUMNS)
+                .eq("status", "ACTIVE")
+                .eq("payment_status", "VERIFIED")
+                .gt("subscription_expires_at", now)
+                .order("id")
+                .range(start, start + LOAD_PAGE_SIZE - 1)
+                .execute()
+            )
+            rows.extend(page.data or [])
+            if len(page.data or []) < LOAD_PAGE_SIZE:
+                return rows
+            start += LOAD_PAGE_SIZE
+
+    def _rank_all(self) -> None:
+        for gender in ("MALE", "FEMALE"):
+            self._rebuild(gender)
+        for gender in ("MALE", "FEMALE"):
+            mine, other = self._matrices[gender], self._matrices[self._other(gender)]
+            for start in range(0, len(mine), SCORE_BLOCK_ROWS):
+                block = np.arange(start, min(start + SCORE_BLOCK_ROWS, len(mine)))
+                scores = score_block(mine.rows(block), other, gender == "MALE")
+                for i, ranking in zip(block, _top_k(scores, other.ids, self.top_k)):
+                    self._ranked[mine.ids[i]] = ranking
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    async def refresh_profiles(self, profile_ids: Iterable[str]) -> None:
+        """Re-read the given profiles and update the pool and affected rankings."""
+        ids = list(dict.fromkeys(pid for pid in profile_ids if pid))
+        if not ids:
+            return
+        if self._loading:
+            self._refresh_after_load.update(ids)
+        if not self.loaded:
+            return
+
+        started = time.perf_counter()
+        supabase = get_supabase_client()
+        try:
+            result = await run_query(
+                lambda: supabase.table("matrimony_profiles").select(FEATURE_COLUMNS).in_("id", ids).execute()
+            )
+        except Exception as exc:
+            # The periodic resync will converge the index
+            logger.warning("Match index refresh failed for %d profile(s): %s", len(ids), exc)
+            return
+
+        now = datetime.now(timezone.utc)
+        rows = {row["id"]: row for row in (result.data or [])}
+        removed = set()
+        added: Dict[str, List[str]] = {"MALE": [], "FEMALE": []}
+        for pid in ids:
+            for features in self._features.values():
+                if features.pop(pid, None) is not None:
+                    removed.add(pid)
+            self._ranked.pop(pid, None)
+            row = rows.get(pid)
+            if row and _is_listed(row, now):
+                self._features[row["gender"]][pid] = self._features_of(row)
+                added[row["gender"]].append(pid)
+
+        for gender in ("MALE", "FEMALE"):
+            self._rebuild(gender)
+
+        # Drop stale entries; rankings that fall below K are recomputed in full
+        stale = set()
+        if removed:
+            for pid, ranking in self._ranked.items():
+                if any(mid in removed for mid, _ in ranking):
+                    kept = [(mid, s) for mid, s in ranking if mid not in removed]
+                    if len(ranking) == self.top_k:
+                        stale.add(pid)
+                    self._ranked[pid] = kept
+
+        for gender, new_ids in added.items():
+            if not new_ids:
+                continue
+            mine, other = self._matrices[gender], self._matrices[self._other(gender)]
+            rows_idx = np.array([mine.pos[pid] for pid in new_ids])
+            scores = score_block(mine.rows(rows_idx), other, gender == "MALE")
+            for pid, ranking in zip(new_ids, _top_k(scores, other.ids, self.top_k)):
+                self._ranked[pid] = ranking
+            # The score is symmetric: column j of this block is how each new
+            # profile ranks for other.ids[j]
+            for row, pid in zip(scores, new_ids):
+                for other_id, score in zip(other.ids, row):
+                    self._offer(other_id, pid, round(float(score), 1))
+
+        for gender in ("MALE", "FEMALE"):
+            mine, other = self._matrices[gender], self._matrices[self._other(gender)]
+            targets = [pid for pid in stale if pid in mine.pos]
+            if targets:
+                rows_idx = np.array([mine.pos[pid] for pid in targets])
+                scores = score_block(mine.rows(rows_idx), other, gender == "MALE")
+                for pid, ranking in zip(targets, _top_k(scores, other.ids, self.top_k)):
+                    self._ranked[pid] = ranking
+
+        self.refreshes += 1
+        self.last_refresh_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    def _offer(self, owner_id: str, candidate_id: str, score: float) -> None:
+        """Merge one candidate into an existing top-K ranking if it qualifies."""
+        ranking = self._ranked.get(owner_id)
+        if ranking is None:
+            return
+        if len(ranking) >= self.top_k and score <= ranking[-1][1]:
+            return
+        position = len(ranking)
+        while position > 0 and ranking[position - 1][1] < score:
+            position -= 1
+        ranking.insert(position, (candidate_id, score))
+        del ranking[self.top_k:]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def ranking_for(self, profile: dict) -> Optional[List[Tuple[str, float]]]:
+        """
+        Ranked (profile_id, score) candidates for `profile`, best first.
+        Profiles not yet in the index (e.g. approved on another worker since
+        the last resync) are scored on the fly without being stored.
+        None until the index has loaded.
+        """
+        if not self.loaded:
+            return None
+        ranking = self._ranked.get(profile["id"])
+        if ranking is not None:
+            return ranking
+        gender = profile.get("gender")
+        if gender not in self._features:
+            return None
+        other = self._matrices[self._other(gender)]
+        mine = ProfileMatrix([profile["id"]], [self._features_of(profile)])
+        scores = score_block(mine.rows(np.array([0])), other, gender == "MALE")
+        self.ad_hoc_rankings += 1
+        return _top_k(scores, other.ids, self.top_k)[0]
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "profiles": len(self._ranked),
+            "top_k": self.top_k,
+            "full_loads": self.full_loads,
+            "refreshes": self.refreshes,
+            "ad_hoc_rankings": self.ad_hoc_rankings,
+            "seconds_since_full_load": round(time.time() - self.loaded_at, 1) if self.loaded_at else None,
+            "last_load_ms": self.last_load_ms,
+            "last_refresh_ms": self.last_refresh_ms,
+        }
+
+
+match_index = MatchIndex(settings.match_top_k)
+
+# Full rescore drops expired subscriptions and picks up other workers' changes
+match_index_resync = PeriodicTask(
+    "match-index-resync",
+    settings.match_index_resync_seconds,
+    match_index.load,
+)
@@ -0,0 +1,249 @@
+import hashlib
+import logging
+import time
+from bisect import bisect_right, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+from app.db import get_supabase_client, run_query
+from app.tasks import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+DIRECTORY_COLUMNS = (
+    "id, full_name, member_id, role, status, photo_url, zonal_committee, "
+    "regional_committee, phone, gotram, occupation, joined_at, updated_at"
+)
+LOAD_PAGE_SIZE = 1000
+
+# Sorts members without a member_id after everyone else
+_NO_MEMBER_ID = "\U0010ffff"
+# Cursor prefix for members without a member_id (they are paged by user id)
+NO_MEMBER_ID_CURSOR_PREFIX = "id:"
+
+
+def page_cursor(member_id: Optional[str], user_id: str) -> str:
+    """Cursor resuming after the member with this (member_id, id) sort key."""
+    return member_id or NO_MEMBER_ID_CURSOR_PREFIX + user_id
+
+
+class MemberEntry:
+    """One active member as held in the in-process directory."""
+
+    __slots__ = (
+        "id", "full_name", "member_id", "role", "photo_url", "zonal_committee",
+        "regional_committee", "phone", "gotram", "occupation", "joined_at", "updated_at",
+    )
+
+    def __init__(self, row: dict):
+        for name in self.__slots__:
+            setattr(self, name, row.get(name))
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.member_id or _NO_MEMBER_ID, self.id)
+
+    def to_dict(self, fields: Iterable[str]) -> dict:
+        return {name: getattr(self, name) for name in fields}
+
+
+def _is_listed(row: dict) -> bool:
+    return row.get("status") == "ACTIVE" and row.get("role") != "HEAD"
+
+
+class MemberDirectory:
+    """
+    In-process snapshot of the public member directory.
+
+    Loaded in full at startup (and periodically resynced), then patched by
+    refresh_users() whenever an admin route changes someone's membership.
+    Members are kept sorted by member_id, with secondary indexes by zonal and
+    regional committee, so directory pages and profiles are served without
+    touching Supabase.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], MemberEntry] = {}
+        self._by_id: Dict[str, MemberEntry] = {}
+        self._keys: List[Tuple[str, str]] = []
+        self._by_zonal: Dict[str, List[Tuple[str, str]]] = {}
+        self._by_regional: Dict[str, List[Tuple[str, str]]] = {}
+        self.loaded = False
+        self.version = 0
+        self.loaded_at: Optional[float] = None
+        self.full_loads = 0
+        self.refreshes = 0
+        self.last_refresh_lag_ms: Optional[float] = None
+        self.max_refresh_lag_ms = 0.0
+        self._content_tag: Optional[Tuple[int, str]] = None
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    async def load(self) -> int:
+        """Replace the snapshot with a full read of active members."""
+        supabase = get_supabase_client()
+        rows: List[dict] = []
+        start = 0
+        while True:
+            page = await run_query(
+                lambda: supabase.table("users")
+                .select(DIRECTORY_COLUMNS)
+                .eq("status", "ACTIVE")
+                .neq("role", "HEAD")
+                .order("id")
+                .range(start, start + LOAD_PAGE_SIZE - 1)
+                .execute()
+            )
+            rows.extend(page.data or [])
+            if len(page.data or []) < LOAD_PAGE_SIZE:
+                break
+            start += LOAD_PAGE_SIZE
+
+        fresh = MemberDirectory()
+        for row in rows:
+            fresh._insert(MemberEntry(row))
+
+        # Swap in the new indexes in one step; readers never see a partial load
+        self._entries = fresh._entries
+        self._by_id = fresh._by_id
+        self._keys = fresh._keys
+        self._by_zonal = fresh._by_zonal
+        self._by_regional = fresh._by_regional
+        self.loaded = True
+        self.loaded_at = time.time()
+        self.full_loads += 1
+        self.version += 1
+        logger.info("Member directory loaded: %d active members", len(self._by_id))
+        return len(self._by_id)
+
+    async def refresh_users(self, user_ids: Iterable[str]) -> None:
+        """Re-read the given users and add, update or drop their entries."""
+        ids = list(dict.fromkeys(uid for uid in user_ids if uid))
+        if not ids or not self.loaded:
+            return
+
+        started = time.perf_counter()
+        supabase = get_supabase_client()
+        try:
+            result = await run_query(
+                lambda: supabase.table("users").select(DIRECTORY_COLUMNS).in_("id", ids).execute()
+            )
+        except Exception as exc:
+            # The periodic resync will converge the snapshot
+            logger.warning("Member directory refresh failed for %d user(s): %s", len(ids), exc)
+            return
+
+        rows = {row["id"]: row for row in (result.data or [])}
+        for uid in ids:
+            self._remove(uid)
+            row = rows.get(uid)
+            if row and _is_listed(row):
+                self._insert(MemberEntry(row))
+
+        lag_ms = (time.perf_counter() - started) * 1000
+        self.refreshes += 1
+        self.version += 1
+        self.last_refresh_lag_ms = round(lag_ms, 1)
+        self.max_refresh_lag_ms = max(self.max_refresh_lag_ms, round(lag_ms, 1))
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def _insert(self, entry: MemberEntry) -> None:
+        key = entry.key
+        self._entries[key] = entry
+        self._by_id[entry.id] = entry
+        insort(self._keys, key)
+        if entry.zonal_committee:
+            insort(self._by_zonal.setdefault(entry.zonal_committee, []), key)
+        if entry.regional_committee:
+            insort(self._by_regional.setdefault(entry.regional_committee, []), key)
+
+    def _remove(self, user_id: str) -> None:
+        entry = self._by_id.pop(user_id, None)
+        if entry is None:
+            return
+        key = entry.key
+        del self._entries[key]
+        self._keys.remove(key)
+        if entry.zonal_committee:
+            self._by_zonal[entry.zonal_committee].remove(key)
+        if entry.regional_committee:
+            self._by_regional[entry.regional_committee].remove(key)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get(self, user_id: str) -> Optional[MemberEntry]:
+        return self._by_id.get(user_id)
+
+    @property
+    def content_tag(self) -> str:
+        """
+        Digest of the snapshot contents. Unlike `version` it is identical
+        across workers holding the same data, so it is safe to build ETags on.
+        """
+        if self._content_tag is None or self._content_tag[0] != self.version:
+            digest = hashlib.sha1()
+            for key in self._keys:
+                digest.update(f"{key[1]}:{self._entries[key].updated_at};".encode("utf-8"))
+            self._content_tag = (self.version, digest.hexdigest())
+        return self._content_tag[1]
+
+    def page(
+        self,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+        zonal_committee: Optional[str] = None,
+        regional_committee: Optional[str] = None,
+    ) -> Tuple[List[MemberEntry], Optional[str]]:
+        """Members ordered by (member_id, id) after the cursor; returns (entries, next_cursor)."""
+        keys = self._keys
+        if zonal_committee:
+            keys = self._by_zonal.get(zonal_committee, [])
+        if regional_committee:
+            regional = self._by_regional.get(regional_committee, [])
+            if zonal_committee:
+                wanted = set(regional)
+                keys = [k for k in keys if k in wanted]
+            else:
+                keys = regional
+
+        if not after:
+            start = 0
+        elif after.startswith(NO_MEMBER_ID_CURSOR_PREFIX):
+            start = bisect_right(keys, (_NO_MEMBER_ID, after[len(NO_MEMBER_ID_CURSOR_PREFIX):]))
+        else:
+            start = bisect_right(keys, (after, _NO_MEMBER_ID))
+        end = len(keys) if limit is None else start + limit
+        entries = [self._entries[k] for k in keys[start:end]]
+        next_cursor = None
+        if limit is not None and end < len(keys) and entries:
+            next_cursor = page_cursor(entries[-1].member_id, entries[-1].id)
+        return entries, next_cursor
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "size": len(self._by_id),
+            "version": self.version,
+            "full_loads": self.full_loads,
+            "refreshes": self.refreshes,
+            "seconds_since_full_load": round(time.time() - self.loaded_at, 1) if self.loaded_at else None,
+            "last_refresh_lag_ms": self.last_refresh_lag_ms,
+            "max_refresh_lag_ms": self.max_refresh_lag_ms,
+        }
+
+
+member_directory = MemberDirectory()
+
+# Full resync bounds how long changes made by other workers take to show up
+directory_resync = PeriodicTask(
+    "member-directory-resync",
+    settings.member_directory_resync_seconds,
+    member_directory.load,
+)
@@ -1,12 +1,21 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.auth.dependencies import get_current_user_id, require_active_status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from app.auth.dependencies import get_current_user_id, require_active_status, invalidate_user
 from app.db import get_supabase_client, run_query
+from app.http_cache import make_etag, is_not_modified, not_modified
+from app.members.directory import NO_MEMBER_ID_CURSOR_PREFIX, member_directory, page_cursor
 from app.members.models import MembershipApplicationRequest, MembershipApplicationResponse, RenewalRequest
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Public directory columns; `fields` may request any subset of these
+DIRECTORY_FIELDS = ("id", "full_name", "member_id", "role", "photo_url", "zonal_committee", "regional_committee", "phone")
+DIRECTORY_MAX_PAGE_SIZE = 500
+DIRECTORY_CACHE_CONTROL = "public, max-age=60"
+PROFILE_FIELDS = DIRECTORY_FIELDS + ("gotram", "occupation", "joined_at")
+
 
 @router.post("/apply", response_model=MembershipApplicationResponse)
 async def apply_membership(
@@ -36,6 +45,7 @@ async def apply_membership(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update user profile",
         )
+    invalidate_user(user_id)
 
     # 2. Create membership request
     request_data = {
@@ -64,19 +74,106 @@ async def apply_membership(
     )
 
 
+def _parse_fields(fields: Optional[str]) -> list:
+    if not fields:
+        return list(DIRECTORY_FIELDS)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = sorted(set(requested) - set(DIRECTORY_FIELDS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    # (member_id, id) is the pagination key, so both are always returned
+    return list(dict.fromkeys(["member_id", "id", *requested]))
+
+
+def _quoted(value: str) -> str:
+    """Quote a value for use inside a PostgREST or=(...) expression."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
 @router.get("/active")
-async def get_active_members():
-    """Get all active members (public endpoint)."""
+async def get_active_members(
+    request: Request,
+    response: Response,
+    after: Optional[str] = Query(None, description="Return members after this cursor (from X-Next-Cursor)"),
+    limit: Optional[int] = Query(None, ge=1, le=DIRECTORY_MAX_PAGE_SIZE, description="Page size; omit for the full list"),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of directory fields"),
+    zonal_committee: Optional[str] = None,
+    regional_committee: Optional[str] = None,
+):
+    """
+    Get active members ordered by member_id (public endpoint).
+
+    Supports keyset pagination (`after` + `limit`; the next cursor is returned
+    in the X-Next-Cursor header), field projection and committee filters.
+    Responses carry a strong ETag derived from the directory's latest update,
+    so conditional requests get 304 Not Modified.
+
+    Served from the in-process member directory snapshot when it is loaded;
+    falls back to querying Supabase otherwise.
+    """
+    columns = _parse_fields(fields)
+    params = (after, limit, ",".join(columns), zonal_committee, regional_committee)
+
+    if member_directory.loaded:
+        etag = make_etag("members", member_directory.content_tag, *params)
+        if is_not_modified(request, etag):
+            return not_modified(etag, DIRECTORY_CACHE_CONTROL)
+
+        entries, next_cursor = member_directory.page(after, limit, zonal_committee, regional_committee)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = DIRECTORY_CACHE_CONTROL
+        return [entry.to_dict(columns) for entry in entries]
+
     supabase = get_supabase_client()
-    result = await run_query(
+
+    version = await run_query(
         lambda: supabase.table("users")
-        .select("id, full_name, member_id, role, photo_url, zonal_committee, regional_committee, phone")
+        .select("updated_at", count="exact")
         .eq("status", "ACTIVE")
         .neq("role", "HEAD")
-        .order("member_id")
+        .order("updated_at", desc=True, nullsfirst=False)
+        .limit(1)
         .execute()
     )
-    return result.data
+    latest = version.data[0]["updated_at"] if version.data else None
+    etag = make_etag("members-db", latest, version.count, *params)
+    if is_not_modified(request, etag):
+        return not_modified(etag, DIRECTORY_CACHE_CONTROL)
+
+    def _page():
+        query = (
+            supabase.table("users")
+            .select(", ".join(columns))
+            .eq("status", "ACTIVE")
+            .neq("role", "HEAD")
+        )
+        if zonal_committee:
+            query = query.eq("zonal_committee", zonal_committee)
+        if regional_committee:
+            query = query.eq("regional_committee", regional_committee)
+        # Members without a member_id come last, ordered by id
+        if after and after.startswith(NO_MEMBER_ID_CURSOR_PREFIX):
+            query = query.is_("member_id", "null").gt("id", after[len(NO_MEMBER_ID_CURSOR_PREFIX):])
+        elif after:
+            query = query.or_(f"member_id.gt.{_quoted(after)},member_id.is.null")
+        query = query.order("member_id", nullsfirst=False).order("id")
+        if limit:
+            # One extra row tells us whether another page exists
+            query = query.limit(limit + 1)
+        return query.execute()
+
+    result = await run_query(_page)
+    members = result.data or []
+
+    if limit and len(members) > limit:
+        members = members[:limit]
+        response.headers["X-Next-Cursor"] = page_cursor(members[-1]["member_id"], members[-1]["id"])
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = DIRECTORY_CACHE_CONTROL
+    return members
 
 
 @router.get("/profile/{member_user_id}")
@@ -85,6 +182,12 @@ async def get_member_profile(
     current_user: dict = Depends(require_active_status),
 ):
     """Get a specific active member's public profile. Requires caller to be an active member."""
+    if member_directory.loaded:
+        entry = member_directory.get(member_user_id)
+        if entry is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Member not found")
+        return entry.to_dict(PROFILE_FIELDS)
+
     supabase = get_supabase_client()
     result = await run_query(
         lambda: supabase.table("users")
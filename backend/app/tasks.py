@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """
+    Runs an async job every `interval_seconds` on the event loop for the
+    lifetime of the app (started/stopped from the lifespan in app.main).
+    Failures are logged and counted; the loop keeps going.
+    """
+
+    def __init__(self, name: str, interval_seconds: float, job: Callable[[], Awaitable[object]]):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self._job = job
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.failures = 0
+        self.last_run_at: Optional[float] = None
+        self.last_duration_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def start(self) -> None:
+        if self.interval_seconds <= 0:
+            logger.info("Periodic task %s disabled", self.name)
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name=self.name)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self):
+        started = time.perf_counter()
+        try:
+            return await self._job()
+        except Exception as exc:
+            self.failures += 1
+            self.last_error = str(exc)
+            logger.exception("Periodic task %s failed", self.name)
+        finally:
+            self.runs += 1
+            self.last_run_at = time.time()
+            self.last_duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.run_once()
+
+    def stats(self) -> dict:
+        return {
+            "interval_seconds": self.interval_seconds,
+            "running": self._task is not None,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run_at": self.last_run_at,
+            "last_duration_ms": self.last_duration_ms,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when a BoundedExecutor already has max_pending jobs queued or running."""
+
+
+class BoundedExecutor:
+    """
+    CPU-bound work offloaded from the event loop, with a cap on queue depth.
+
+    `kind` is "process" (default; sidesteps the GIL) or "thread". Once
+    `max_pending` jobs are queued or running, further submissions fail fast
+    with ExecutorSaturatedError instead of growing an unbounded backlog.
+    The pool is created lazily on first use.
+    """
+
+    def __init__(self, name: str, kind: str, workers: int, max_pending: int):
+        self.name = name
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+            else:
+                # spawn, not fork: the server process already runs threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            logger.info("Started %s %s pool with %d workers", self.name, self.kind, self.workers)
+        return self._executor
+
+    async def run(self, fn, *args):
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise ExecutorSaturatedError(f"{self.name} is saturated ({self._pending} pending jobs)")
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), fn, *args)
+            self.completed += 1
+            return result
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
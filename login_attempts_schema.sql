@@ -0,0 +1,49 @@
+-- login_attempts_schema.sql
+--
+-- Atomic login bookkeeping used by /auth/login and /auth/verify-pin.
+-- The backend reads the user row once, verifies the PIN, and then (only if
+-- anything has to change) calls record_login_attempt via RPC. The counter
+-- update and lockout decision happen in a single UPDATE, so concurrent
+-- attempts cannot lose increments or race past the lockout threshold.
+
+CREATE OR REPLACE FUNCTION public.record_login_attempt(
+    p_user_id UUID,
+    p_success BOOLEAN,
+    p_max_attempts INT DEFAULT 5,
+    p_lockout_minutes INT DEFAULT 30
+)
+RETURNS TABLE (failed_login_attempts INT, locked_until TIMESTAMP)
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    UPDATE public.users AS u
+    SET
+        failed_login_attempts = CASE
+            WHEN p_success THEN 0
+            -- An expired lockout starts a fresh count
+            WHEN u.locked_until IS NOT NULL AND u.locked_until <= timezone('utc', now()) THEN 1
+            ELSE COALESCE(u.failed_login_attempts, 0) + 1
+        END,
+        locked_until = CASE
+            WHEN p_success THEN NULL
+            WHEN u.locked_until > timezone('utc', now()) THEN u.locked_until
+            WHEN (
+                CASE
+                    WHEN u.locked_until IS NOT NULL AND u.locked_until <= timezone('utc', now()) THEN 1
+                    ELSE COALESCE(u.failed_login_attempts, 0) + 1
+                END
+            ) >= p_max_attempts
+                THEN timezone('utc', now()) + make_interval(mins => p_lockout_minutes)
+            ELSE NULL
+        END,
+        updated_at = NOW()
+    WHERE u.id = p_user_id
+    RETURNING u.failed_login_attempts, u.locked_until;
+$$;
+
+-- Only the backend (service role) may call it
+REVOKE ALL ON FUNCTION public.record_login_attempt(UUID, BOOLEAN, INT, INT) FROM PUBLIC, anon, authenticated;
+
+-- Force schema cache refresh so the RPC is visible immediately
+NOTIFY pgrst, 'reload schema';
@@ -74,3 +74,81 @@ CREATE POLICY "Users can insert their own profile"
 CREATE POLICY "Users can update their own profile" 
     ON public.matrimony_profiles FOR UPDATE 
     USING (auth.uid() = user_id);
+
+-- Migration: subscription window set on admin verification
+ALTER TABLE public.matrimony_profiles
+    ADD COLUMN IF NOT EXISTS subscription_expires_at TIMESTAMP WITH TIME ZONE;
+
+-- Match engine indexes (/matrimony/matches filters are pushed down to Postgres)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Candidate pool: verified, active profiles of one gender, paginated by id
+CREATE INDEX IF NOT EXISTS idx_matrimony_pool_gender_id
+    ON public.matrimony_profiles (gender, id)
+    WHERE status = 'ACTIVE' AND payment_status = 'VERIFIED';
+
+CREATE INDEX IF NOT EXISTS idx_matrimony_pool_gender_expiry
+    ON public.matrimony_profiles (gender, subscription_expires_at)
+    WHERE status = 'ACTIVE' AND payment_status = 'VERIFIED';
+
+CREATE INDEX IF NOT EXISTS idx_matrimony_pool_gender_age
+    ON public.matrimony_profiles (gender, age)
+    WHERE status = 'ACTIVE' AND payment_status = 'VERIFIED';
+
+-- Case-insensitive city / occupation keyword / gotram matching (ILIKE)
+CREATE INDEX IF NOT EXISTS idx_matrimony_city_trgm
+    ON public.matrimony_profiles USING gin (current_city gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_matrimony_occupation_trgm
+    ON public.matrimony_profiles USING gin (occupation gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_matrimony_gotram_trgm
+    ON public.matrimony_profiles USING gin (gotram gin_trgm_ops);
+
+-- Migration: WebP thumbnails generated by /matrimony/upload-photo (parallel to photos)
+ALTER TABLE public.matrimony_profiles
+    ADD COLUMN IF NOT EXISTS photo_thumbnails TEXT[];
+
+UPDATE public.matrimony_profiles
+    SET photo_thumbnails = (
+        SELECT array_agg(
+            CASE WHEN url LIKE '%/full.webp' THEN left(url, -length('full.webp')) || 'thumb.webp' ELSE url END
+            ORDER BY ord)
+        FROM unnest(photos) WITH ORDINALITY AS p(url, ord)
+    )
+    WHERE photos IS NOT NULL AND photo_thumbnails IS NULL;
+
+-- Content-addressed photo store: sha256 of the uploaded bytes → stored variants.
+-- /matrimony/upload-photo reuses an existing entry instead of storing the same
+-- photo again; POST /admin/matrimony-photos/gc removes unreferenced objects.
+CREATE TABLE IF NOT EXISTS public.matrimony_photo_objects (
+    sha256 TEXT PRIMARY KEY,
+    base_path TEXT NOT NULL,
+    uploaded_by UUID REFERENCES public.users(id) ON DELETE SET NULL,
+    size_bytes INTEGER,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    last_seen_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_matrimony_photo_objects_last_seen
+    ON public.matrimony_photo_objects (last_seen_at);
+
+-- Backend only (service role); no client access
+ALTER TABLE public.matrimony_photo_objects ENABLE ROW LEVEL SECURITY;
+
+-- Full bucket listing in one call for the photo GC (the storage API lists one folder per request)
+CREATE OR REPLACE FUNCTION public.list_storage_objects(p_bucket TEXT)
+RETURNS TABLE (name TEXT, size BIGINT, created_at TIMESTAMP WITH TIME ZONE)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = storage, public
+AS $$
+    SELECT o.name, (o.metadata->>'size')::BIGINT, o.created_at
+    FROM storage.objects AS o
+    WHERE o.bucket_id = p_bucket;
+$$;
+
+REVOKE ALL ON FUNCTION public.list_storage_objects(TEXT) FROM PUBLIC, anon, authenticated;
+
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,126 @@
+"""
+Benchmark GET /auth/me throughput with the thread-based and the native async
+database backends.
+
+Starts the API once per backend (DB_BACKEND=thread, then DB_BACKEND=async),
+logs in with the given account, fires concurrent /auth/me requests for a fixed
+duration and prints requests/sec and latency percentiles for each run.
+
+Usage (run from project root, with backend/.env configured):
+    python scripts/bench_auth_me.py --phone 9100000001 --pin 1234
+    python scripts/bench_auth_me.py --phone 9100000001 --pin 1234 --concurrency 100 --duration 20
+
+Requires: pip install httpx uvicorn
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+import subprocess
+
+import httpx
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../backend"))
+
+
+def start_server(backend, port):
+    env = {**os.environ, "DB_BACKEND": backend, "ENVIRONMENT": "production"}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return proc, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"Server for backend={backend} did not start")
+
+
+async def run_load(base_url, token, concurrency, duration):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        headers = {"Authorization": f"Bearer {token}"}
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                resp = await client.get("/auth/me", headers=headers)
+                if resp.status_code == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return latencies, errors, elapsed
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--phone", required=True)
+    parser.add_argument("--pin", required=True)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  /auth/me benchmark — thread vs async DB backend")
+    print(f"  concurrency={args.concurrency} duration={args.duration:.0f}s")
+    print("=" * 60)
+
+    results = {}
+    for backend in ("thread", "async"):
+        proc, base_url = start_server(backend, args.port)
+        try:
+            resp = httpx.post(f"{base_url}/auth/login", json={"phone": args.phone, "pin": args.pin}, timeout=30)
+            if resp.status_code != 200:
+                print(f"  ✗ Login failed: {resp.text}")
+                sys.exit(1)
+            token = resp.json()["access_token"]
+
+            # Warm up connections before measuring
+            asyncio.run(run_load(base_url, token, min(args.concurrency, 5), 1.0))
+            latencies, errors, elapsed = asyncio.run(run_load(base_url, token, args.concurrency, args.duration))
+        finally:
+            proc.terminate()
+            proc.wait()
+
+        rps = len(latencies) / elapsed if elapsed else 0.0
+        results[backend] = rps
+        print(f"\n  [{backend}]")
+        print(f"    requests : {len(latencies)} ok, {errors} errors")
+        print(f"    req/sec  : {rps:.1f}")
+        print(f"    p50      : {statistics.median(latencies) * 1000 if latencies else 0:.1f} ms")
+        print(f"    p99      : {percentile(latencies, 99) * 1000:.1f} ms")
+
+    if results.get("thread"):
+        print(f"\n  async / thread speed-up: {results['async'] / results['thread']:.2f}x")
+    print()
+
+
+if __name__ == "__main__":
+    main()
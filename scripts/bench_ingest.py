@@ -0,0 +1,149 @@
+"""
+Benchmark for onboarding spreadsheet ingestion (backend/app/admin/ingest.py).
+
+Writes a synthetic workbook in the Parishat_Member_Onboarding_Template.xlsx
+layout (default 50,000 rows, with the usual mess: numeric and "+91 ..." phones,
+lower-case roles, committee casing, blank and duplicate rows), then compares:
+
+  full-load   openpyxl.load_workbook (not read-only) + per-row tuple unpacking
+              and cleaning, as the onboarding scripts used to do
+  streaming   ingest.iter_batches: read-only rows, header-mapped columns,
+              per-batch column normalization and validation
+
+Each phase is timed on its own pass and measured for peak Python heap
+(tracemalloc) on a second pass, since tracing slows the code down.
+
+Usage (run from project root):
+    python scripts/bench_ingest.py
+    python scripts/bench_ingest.py --rows 100000 --batch-size 2000
+    python scripts/bench_ingest.py --keep /tmp/onboarding_50k.xlsx
+
+Requires: pip install openpyxl numpy
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+from openpyxl import Workbook, load_workbook
+
+backend_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend'))
+if backend_path not in sys.path:
+    sys.path.append(backend_path)
+
+from app.admin.ingest import iter_batches, load_schema
+
+ROLES = ["PERMANENT", "NORMAL", "ASSOCIATED", "normal", "Permanent"]
+ZONES = ["Uttar Andhra", "Rayalaseema", "dakshina kosta andhra", "Madhya Kosta", None]
+REGIONS = ["Andhra", "Telangana", "Tamil Nadu", "karnataka", "Rest of India", None]
+
+
+def make_workbook(path, rows, seed=7):
+    rnd = random.Random(seed)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Members")
+    ws.append(["full_name", "phone", "role", "zonal_committee", "regional_committee"])
+    for i in range(rows):
+        number = 6000000000 + rnd.randrange(4000000000)
+        if i % 97 == 0:
+            ws.append([None, None, None, None, None])          # blank row
+            continue
+        if i % 50 == 0:
+            phone = f"+91 {number // 100000} {number % 100000:05d}"
+        elif i % 7 == 0:
+            phone = str(number)
+        else:
+            phone = number                                      # Excel numeric cell
+        name = f"  Member `{i}  Test " if i % 11 == 0 else f"Member {i}"
+        ws.append([name, phone, rnd.choice(ROLES), rnd.choice(ZONES), rnd.choice(REGIONS)])
+    wb.save(path)
+
+
+def clean_phone(phone):
+    if not phone:
+        return None
+    digits = re.sub(r"\D", "", str(phone))
+    digits = digits[-10:] if len(digits) >= 10 else digits
+    return digits if len(digits) == 10 else None
+
+
+def full_load(path, batch_size):
+    """The old way: whole workbook in memory, positional unpacking."""
+    wb = load_workbook(path)
+    members, seen = [], set()
+    for row in wb["Members"].iter_rows(min_row=2, values_only=True):
+        name, phone, role, zonal, regional = row
+        name = re.sub(r"[`']+", "", str(name)).strip() if name else None
+        phone = clean_phone(phone)
+        if not name or not phone or phone in seen:
+            continue
+        seen.add(phone)
+        members.append({
+            "full_name": name,
+            "phone": phone,
+            "role": str(role).upper() if role else None,
+            "zonal_committee": zonal,
+            "regional_committee": regional,
+        })
+    return len(members), 0
+
+
+def streaming(path, batch_size):
+    schema = load_schema()
+    valid = errors = 0
+    for batch in iter_batches(path, schema=schema, batch_size=batch_size):
+        valid += len(batch.rows)
+        errors += len(batch.errors)
+    return valid, errors
+
+
+def run_phase(label, fn, path, batch_size):
+    started = time.perf_counter()
+    valid, errors = fn(path, batch_size)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    fn(path, batch_size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"\n  [{label}]")
+    print(f"    rows accepted : {valid}" + (f"  ({errors} rejected with reasons)" if errors else ""))
+    print(f"    wall time     : {elapsed:.2f} s  ({valid / elapsed:,.0f} rows/s)")
+    print(f"    peak heap     : {peak / (1024 * 1024):.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--keep", help="write the synthetic workbook here and keep it")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  Onboarding spreadsheet ingestion benchmark")
+    print("=" * 60)
+
+    path = args.keep or os.path.join(tempfile.mkdtemp(prefix="bench-ingest-"), "onboarding.xlsx")
+    started = time.perf_counter()
+    make_workbook(path, args.rows)
+    print(f"  Synthetic workbook: {args.rows:,} rows, {os.path.getsize(path) / (1024 * 1024):.1f} MB "
+          f"({time.perf_counter() - started:.1f} s to write)")
+
+    try:
+        run_phase("full-load", full_load, path, args.batch_size)
+        run_phase("streaming", streaming, path, args.batch_size)
+    finally:
+        if not args.keep:
+            os.unlink(path)
+            os.rmdir(os.path.dirname(path))
+    print()
+
+
+if __name__ == "__main__":
+    main()
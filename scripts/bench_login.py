@@ -0,0 +1,110 @@
+"""
+Load test for /auth/login that reports database calls per login.
+
+Reads the query counters from GET /admin/metrics before and after each phase
+and divides by the number of logins, so the figures reflect what the server
+actually sent to Supabase. Run it against a dedicated test server — other
+traffic on the same worker would be counted too. Start the server with a
+single worker and the rate limiter off:
+
+    cd backend && RATE_LIMIT_ENABLED=false uvicorn app.main:app --port 8000
+
+Phases:
+  success        — N concurrent correct-PIN logins (clean counters)
+  failure        — failed logins below the lockout threshold
+  success-reset  — one correct login after failures (counter reset)
+
+For reference, the previous multi-step flow cost 2 calls per successful
+login (SELECT + counter-reset UPDATE, 3 after an expired lockout) and
+2 per failed login (SELECT + UPDATE).
+
+Usage (run from project root):
+    python scripts/bench_login.py --phone 9100000001 --pin 1234 --logins 200
+
+Requires: pip install httpx
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+
+import httpx
+
+BASE_URL = "http://localhost:8000"
+ADMIN_PHONE = "1112223333"
+ADMIN_PIN = "1234"
+
+
+def wrong_pin(pin):
+    return f"{(int(pin) + 1) % 10000:04d}"
+
+
+async def db_calls(client, admin_headers):
+    resp = await client.get("/admin/metrics", headers=admin_headers)
+    resp.raise_for_status()
+    pool = resp.json()["db_pool"]
+    return pool["acquired"] + pool["async_queries"]
+
+
+async def measure(client, admin_headers, overhead, label, coros):
+    before = await db_calls(client, admin_headers)
+    started = time.perf_counter()
+    responses = await asyncio.gather(*coros)
+    elapsed = time.perf_counter() - started
+    after = await db_calls(client, admin_headers)
+
+    count = len(responses)
+    statuses = {}
+    for r in responses:
+        statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+    calls = after - before - overhead
+    print(f"\n  [{label}]")
+    print(f"    logins        : {count} {dict(sorted(statuses.items()))}")
+    print(f"    wall time     : {elapsed:.2f} s ({count / elapsed:.1f} logins/s)")
+    print(f"    DB calls      : {calls} ({calls / count:.2f} per login)")
+
+
+async def run(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        resp = await client.post("/auth/login", json={"phone": ADMIN_PHONE, "pin": ADMIN_PIN})
+        if resp.status_code != 200:
+            print(f"  ✗ Admin login failed: {resp.text}")
+            sys.exit(1)
+        admin_headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+        # Cost of a metrics read itself (auth dependency lookups), measured back to back
+        first = await db_calls(client, admin_headers)
+        second = await db_calls(client, admin_headers)
+        overhead = second - first
+
+        def login(pin):
+            return client.post("/auth/login", json={"phone": args.phone, "pin": pin})
+
+        await measure(client, admin_headers, overhead, "success",
+                      [login(args.pin) for _ in range(args.logins)])
+        await measure(client, admin_headers, overhead, "failure",
+                      [login(wrong_pin(args.pin)) for _ in range(args.failures)])
+        await measure(client, admin_headers, overhead, "success-reset",
+                      [login(args.pin)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--phone", required=True, help="test account phone")
+    parser.add_argument("--pin", required=True, help="test account PIN")
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--failures", type=int, default=3, help="kept below the lockout threshold (5)")
+    parser.add_argument("--base-url", default=BASE_URL)
+    args = parser.parse_args()
+    args.failures = max(1, min(args.failures, 4))
+
+    print("=" * 60)
+    print("  /auth/login load test — DB calls per login")
+    print("=" * 60)
+    asyncio.run(run(args))
+    print()
+
+
+if __name__ == "__main__":
+    main()
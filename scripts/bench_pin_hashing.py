@@ -0,0 +1,111 @@
+"""
+Microbenchmark: event-loop latency during a burst of concurrent PIN checks.
+
+Runs N concurrent bcrypt verifications (default 100, like a login burst)
+while a probe coroutine measures how late the event loop wakes it up:
+  before — verify_pin called inline in async code (old behaviour)
+  after  — verify_pin_async, offloaded to the bcrypt worker pool
+
+No database or server is needed.
+
+Usage (run from project root):
+    python scripts/bench_pin_hashing.py
+    python scripts/bench_pin_hashing.py --logins 200 --executor thread --workers 4
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+backend_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../backend"))
+if backend_path not in sys.path:
+    sys.path.append(backend_path)
+
+# Settings are required at import time; the benchmark never talks to Supabase
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "bench")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench")
+os.environ.setdefault("JWT_SECRET", "bench-secret-bench-secret-bench-secret")
+
+PROBE_INTERVAL = 0.005
+
+
+async def probe(stop, lags):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def run_burst(verify, logins, pin, pin_hash):
+    lags = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(stop, lags))
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(verify(pin, pin_hash) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe_task
+    return lags, elapsed
+
+
+def report(label, lags, elapsed, logins):
+    ordered = sorted(lags) or [0.0]
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"\n  [{label}]")
+    print(f"    wall time      : {elapsed:.2f} s ({logins / elapsed:.1f} logins/s)")
+    print(f"    loop lag p50   : {statistics.median(ordered) * 1000:.1f} ms")
+    print(f"    loop lag p99   : {p99 * 1000:.1f} ms")
+    print(f"    loop lag max   : {ordered[-1] * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--executor", choices=["process", "thread"], default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.executor:
+        os.environ["PIN_HASH_EXECUTOR"] = args.executor
+    if args.workers:
+        os.environ["PIN_HASH_WORKERS"] = str(args.workers)
+    os.environ["PIN_HASH_MAX_PENDING"] = str(max(args.logins, 1))
+
+    from app.auth.utils import hash_pin, verify_pin, verify_pin_async, pin_hasher
+
+    print("=" * 60)
+    print("  bcrypt PIN verification — event-loop latency")
+    print(f"  {args.logins} concurrent logins, pool={pin_hasher.kind} x{pin_hasher.workers}")
+    print("=" * 60)
+
+    pin = "1234"
+    pin_hash = hash_pin(pin)
+
+    async def verify_inline(plain, hashed):
+        return verify_pin(plain, hashed)
+
+    lags, elapsed = asyncio.run(run_burst(verify_inline, args.logins, pin, pin_hash))
+    report("before: inline bcrypt", lags, elapsed, args.logins)
+
+    async def offloaded():
+        # Warm the pool so worker start-up is not counted
+        await verify_pin_async(pin, pin_hash)
+        return await run_burst(verify_pin_async, args.logins, pin, pin_hash)
+
+    try:
+        lags, elapsed = asyncio.run(offloaded())
+    finally:
+        pin_hasher.shutdown()
+    report("after: worker pool", lags, elapsed, args.logins)
+    print()
+
+
+if __name__ == "__main__":
+    main()
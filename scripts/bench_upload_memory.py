@@ -0,0 +1,170 @@
+"""
+Memory benchmark for /matrimony/upload-photo under concurrent uploads.
+
+Samples the server's resident memory (VmRSS from /proc/<pid>/status) while
+it handles:
+  valid     — N concurrent photo uploads just under the 3MB limit
+  oversize  — N concurrent chunked uploads far over the limit (no
+              Content-Length, so only the streaming byte count can stop them)
+
+and reports peak RSS growth above the idle baseline, status codes and wall
+time. Run each phase twice: the first pass includes one-off warm-up
+allocations. Starlette spools file parts over 1MB to a temp file, so
+without the body limit an oversize upload shows up less in RSS than in
+wall time and temp-disk writes (the full body is received and spooled
+before the route can reject it). With the limit, oversize requests are
+answered 413 after at most ~3MB each. Valid uploads hold one bounded
+copy of the photo while the image worker pool (max_pending) re-encodes it.
+
+The server must run on this machine (RSS is read from /proc). Use a single
+worker and the test account from seed_test_matrimony.py (any ACTIVE member
+works). Valid uploads are identical, so they all land on the same
+content-addressed objects in the matrimony-photos bucket.
+
+    cd backend && uvicorn app.main:app --port 8000
+    pgrep -f "uvicorn app.main:app"      # → server pid
+
+Usage (run from project root):
+    python scripts/bench_upload_memory.py --phone 9100000001 --pin 1234 --server-pid 12345
+    python scripts/bench_upload_memory.py --phone 9100000001 --pin 1234 --server-pid 12345 --uploads 50 --oversize-mb 50
+
+Requires: pip install httpx Pillow
+"""
+
+import io
+import sys
+import time
+import random
+import asyncio
+import argparse
+
+import httpx
+from PIL import Image
+
+BASE_URL = "http://localhost:8000"
+SAMPLE_INTERVAL = 0.02
+CHUNK = 64 * 1024
+
+
+def read_rss_mb(pid):
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def make_jpeg(target_bytes):
+    """Random-noise JPEG (incompressible) sized close to target_bytes."""
+    rnd = random.Random(42)
+    side = 256
+    while True:
+        img = Image.frombytes("RGB", (side, side), rnd.randbytes(side * side * 3))
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=90)
+        if out.tell() >= target_bytes * 0.9 or side >= 4096:
+            break
+        side = int(side * 1.2)
+    while out.tell() > target_bytes and side > 64:
+        side = int(side * 0.97)
+        img = img.resize((side, side))
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=90)
+    return out.getvalue()
+
+
+async def sample(pid, stop, peak):
+    while not stop.is_set():
+        peak[0] = max(peak[0], read_rss_mb(pid))
+        await asyncio.sleep(SAMPLE_INTERVAL)
+
+
+async def measure(label, pid, coros):
+    baseline = read_rss_mb(pid)
+    peak = [baseline]
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample(pid, stop, peak))
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*coros, return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await sampler
+
+    statuses = {}
+    for r in results:
+        key = r.status_code if isinstance(r, httpx.Response) else type(r).__name__
+        statuses[key] = statuses.get(key, 0) + 1
+    print(f"\n  [{label}]")
+    print(f"    requests      : {len(results)} {statuses}")
+    print(f"    wall time     : {elapsed:.2f} s")
+    print(f"    RSS baseline  : {baseline:.1f} MB")
+    print(f"    RSS peak      : {peak[0]:.1f} MB (+{peak[0] - baseline:.1f} MB)")
+
+
+async def oversize_body(total_bytes):
+    boundary = "benchboundary"
+    yield (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"big.jpg\"\r\n"
+        "Content-Type: image/jpeg\r\n\r\n"
+    ).encode()
+    yield b"\xff\xd8\xff"
+    sent = 0
+    block = b"\0" * CHUNK
+    while sent < total_bytes:
+        yield block
+        sent += CHUNK
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+
+async def run(args):
+    photo = make_jpeg(args.size_kb * 1024)
+    print(f"  Test photo: {len(photo) / 1024:.0f} KB")
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120) as client:
+        resp = await client.post("/auth/login", json={"phone": args.phone, "pin": args.pin})
+        if resp.status_code != 200:
+            print(f"  ✗ Login failed: {resp.text}")
+            sys.exit(1)
+        headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+        def upload():
+            return client.post(
+                "/matrimony/upload-photo",
+                headers=headers,
+                files={"file": ("bench.jpg", photo, "image/jpeg")},
+            )
+
+        def upload_oversize():
+            return client.post(
+                "/matrimony/upload-photo",
+                headers={**headers, "Content-Type": "multipart/form-data; boundary=benchboundary"},
+                content=oversize_body(args.oversize_mb * 1024 * 1024),
+            )
+
+        for round_no in (1, 2):
+            await measure(f"valid #{round_no}", args.server_pid, [upload() for _ in range(args.uploads)])
+        for round_no in (1, 2):
+            await measure(f"oversize #{round_no}", args.server_pid, [upload_oversize() for _ in range(args.uploads)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--phone", required=True, help="ACTIVE member phone")
+    parser.add_argument("--pin", required=True, help="ACTIVE member PIN")
+    parser.add_argument("--server-pid", type=int, required=True, help="pid of the uvicorn worker")
+    parser.add_argument("--uploads", type=int, default=50, help="concurrent uploads per phase")
+    parser.add_argument("--size-kb", type=int, default=2800, help="valid photo size (limit is 3072)")
+    parser.add_argument("--oversize-mb", type=int, default=50, help="body size of each oversize upload")
+    parser.add_argument("--base-url", default=BASE_URL)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  /matrimony/upload-photo memory benchmark")
+    print("=" * 60)
+    asyncio.run(run(args))
+    print()
+
+
+if __name__ == "__main__":
+    main()
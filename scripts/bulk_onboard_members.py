@@ -1,42 +1,49 @@
 """
-Bulk onboard members from 'Members List.xlsx' via the admin API.
-Reads both sheets (Normal, Permanent) and calls POST /admin/create-member for each.
+Bulk onboard members from 'Members List.xlsx' (or a filled-in
+Parishat_Member_Onboarding_Template.xlsx) via the admin API.
+Sheets are streamed and validated by backend/app/admin/ingest.py (columns are
+matched by header name; for 'Members List.xlsx' the role comes from the sheet,
+Normal or Permanent) and sent to POST /admin/create-members
+in batches, several batches at a time. Batches that fail with a transient error
+(connection problems, 429, 502-504), and members the endpoint reports with a
+"; retry" hint, are re-sent with backoff; the endpoint leaves members who are
+already ACTIVE in their role untouched (filling in a missing approval record or
+fee), so retries and re-runs are safe.
 
 Usage:
     python scripts/bulk_onboard_members.py
+    python scripts/bulk_onboard_members.py --batch-size 200 --concurrency 4
+    python scripts/bulk_onboard_members.py --excel Parishat_Member_Onboarding_Template.xlsx
 
-Requires: openpyxl, requests
-    pip install openpyxl requests
+Requires: openpyxl, numpy, httpx
+    pip install openpyxl numpy httpx
 """
 
+import os
 import sys
-import re
-import openpyxl
-import requests
+import asyncio
+import argparse
+import httpx
 from datetime import datetime
+from openpyxl import load_workbook
+
+# Add backend directory to path for the ingestion module
+backend_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend'))
+if backend_path not in sys.path:
+    sys.path.append(backend_path)
+
+from app.admin.ingest import IngestError, iter_batches
 
 BASE_URL = "http://localhost:8000"
 ADMIN_PHONE = "1112223333"
 ADMIN_PIN = "1234"
 EXCEL_PATH = "Members List.xlsx"
+RETRY_STATUSES = {429, 502, 503, 504}
 
 # ── helpers ───────────────────────────────────────────────────────────────────
 
-def clean_name(name):
-    if not name:
-        return None
-    return re.sub(r"[`']+", "", str(name)).strip()
-
-def clean_phone(phone):
-    if not phone:
-        return None
-    digits = re.sub(r"\D", "", str(phone))
-    # Take last 10 digits
-    digits = digits[-10:] if len(digits) >= 10 else digits
-    return digits if len(digits) == 10 else None
-
-def get_admin_token():
-    resp = requests.post(f"{BASE_URL}/auth/verify-pin", json={
+async def get_admin_token(client):
+    resp = await client.post("/auth/verify-pin", json={
         "identifier": ADMIN_PHONE,
         "pin": ADMIN_PIN
     })
@@ -47,53 +54,99 @@ def get_admin_token():
     print(f"  ✓ Admin login successful\n")
     return token
 
-def create_member(token, payload):
-    resp = requests.post(
-        f"{BASE_URL}/admin/create-member",
-        json=payload,
-        headers={"Authorization": f"Bearer {token}"}
-    )
-    return resp.status_code, resp.json()
+def is_retryable(result):
+    """Per-member failures the endpoint marks as transient end with a "; retry" hint."""
+    return result["status"] == "error" and str(result.get("detail") or "").endswith("; retry")
+
+async def create_batch(client, token, batch, retries):
+    """
+    POST one batch; returns its per-member results in input order. Transport
+    errors, retryable HTTP statuses and members reported with a retry hint are
+    re-sent with backoff (only the members still pending).
+    """
+    results = {}
+    pending = list(batch)
+    detail = None
+    for attempt in range(retries + 1):
+        if attempt:
+            await asyncio.sleep(min(2 ** attempt, 30))
+        try:
+            resp = await client.post(
+                "/admin/create-members",
+                json={"members": pending},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+        except httpx.TransportError as exc:
+            detail = f"{type(exc).__name__}: {exc}"
+            continue
+        if resp.status_code == 200:
+            retry = []
+            for member, result in zip(pending, resp.json()["results"]):
+                results[member["phone"]] = result
+                if is_retryable(result):
+                    retry.append(member)
+            pending = retry
+            if not pending:
+                break
+            continue
+        detail = f"HTTP {resp.status_code}: {resp.text[:200]}"
+        if resp.status_code not in RETRY_STATUSES:
+            break
+    for member in pending:
+        results.setdefault(member["phone"], {"phone": member["phone"], "full_name": member["full_name"], "status": "error", "detail": detail})
+    return [results[m["phone"]] for m in batch]
 
 # ── read sheets ───────────────────────────────────────────────────────────────
 
-def read_normal_sheet(ws):
-    members = []
-    for row in ws.iter_rows(min_row=2, values_only=True):
-        _, name, guardian, gender, gotram, dob, address, phone, occupation, _ = row
-        name = clean_name(name)
-        phone = clean_phone(phone)
-        if not name or not phone:
-            continue
-        members.append({
-            "full_name": name,
-            "phone": phone,
-            "role": "NORMAL",
-            "zonal_committee": "",
-            "regional_committee": "",
-        })
-    return members
-
-def read_permanent_sheet(ws):
-    members = []
-    for row in ws.iter_rows(min_row=2, values_only=True):
-        _, name, guardian, gender, gotram, dob, address, phone, email, occupation, _ = row
-        name = clean_name(name)
-        phone = clean_phone(phone)
-        if not name or not phone:
-            continue
-        members.append({
-            "full_name": name,
-            "phone": phone,
-            "role": "PERMANENT",
-            "zonal_committee": "",
-            "regional_committee": "",
-        })
-    return members
+# 'Members List.xlsx' sheets and the role each one implies
+LEGACY_SHEETS = {"Permanent": "PERMANENT", "Normal": "NORMAL"}
+MEMBER_FIELDS = ("full_name", "phone", "role", "zonal_committee", "regional_committee")
+
+def read_members(path):
+    """Valid members per sheet plus per-row problems, streamed through the ingestion module."""
+    wb = load_workbook(path, read_only=True)
+    sheetnames = wb.sheetnames
+    wb.close()
+    sheets = {"Members": None} if "Members" in sheetnames else {s: r for s, r in LEGACY_SHEETS.items() if s in sheetnames}
+
+    members, problems = {}, []
+    for sheet, role in sheets.items():
+        members[sheet] = []
+        for batch in iter_batches(path, sheet, default_role=role):
+            members[sheet].extend({k: row[k] for k in MEMBER_FIELDS} for row in batch.rows)
+            problems.extend((sheet, error) for error in batch.errors)
+    return members, problems
 
 # ── main ──────────────────────────────────────────────────────────────────────
 
+async def onboard(members, args):
+    batches = [members[i:i + args.batch_size] for i in range(0, len(members), args.batch_size)]
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120) as client:
+        print("  Authenticating as admin...")
+        token = await get_admin_token(client)
+
+        async def run(number, batch):
+            async with limit:
+                results = await create_batch(client, token, batch, args.retries)
+            ok = sum(1 for r in results if r["status"] != "error")
+            print(f"  batch {number:>3}/{len(batches)}: {ok}/{len(batch)} ok")
+            return results
+
+        print(f"  Sending {len(batches)} batch(es) of up to {args.batch_size}, {args.concurrency} at a time\n")
+        per_batch = await asyncio.gather(*(run(n, b) for n, b in enumerate(batches, 1)))
+    return [r for results in per_batch for r in results]
+
 def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--excel", default=EXCEL_PATH)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--batch-size", type=int, default=100, help="members per request (max 500)")
+    parser.add_argument("--concurrency", type=int, default=4, help="batches in flight")
+    parser.add_argument("--retries", type=int, default=3, help="retries per batch on transient errors")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("  Parishat — Bulk Member Onboarding")
     print(f"  {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -101,59 +154,63 @@ def main():
 
     # Load Excel
     try:
-        wb = openpyxl.load_workbook(EXCEL_PATH)
+        sheets, problems = read_members(args.excel)
     except FileNotFoundError:
-        print(f"\n✗ File not found: {EXCEL_PATH}")
+        print(f"\n✗ File not found: {args.excel}")
         print("  Run this script from the project root directory.")
         sys.exit(1)
+    except IngestError as e:
+        print(f"\n✗ {e}")
+        sys.exit(1)
 
-    normal_members   = read_normal_sheet(wb["Normal"])
-    permanent_members = read_permanent_sheet(wb["Permanent"])
-    all_members = permanent_members + normal_members
-
-    print(f"\n  Found {len(permanent_members)} Permanent + {len(normal_members)} Normal = {len(all_members)} members\n")
+    all_members = [m for rows in sheets.values() for m in rows]
+    counts = " + ".join(f"{len(rows)} {sheet}" for sheet, rows in sheets.items())
+    print(f"\n  Found {counts} = {len(all_members)} members\n")
 
-    # Login
-    print("  Authenticating as admin...")
-    token = get_admin_token()
+    skipped = []
+    for sheet, error in problems:
+        print(f"  ⚠  SKIP  {sheet} row {error.row} — {error.column}: {error.message}")
+        skipped.append({"name": f"{sheet} row {error.row}", "phone": "—", "reason": f"{error.column}: {error.message}"})
 
-    # Track results
-    created   = []
-    updated   = []
-    skipped   = []
+    # Warn about shared phones across sheets (family members in same household); first one wins
+    to_send = []
     seen_phones = {}
-
-    for i, member in enumerate(all_members, 1):
-        phone = member["phone"]
-        name  = member["full_name"]
-        role  = member["role"]
-
-        # Warn about shared phones (family members in same household)
+    for member in all_members:
+        phone, name = member["phone"], member["full_name"]
         if phone in seen_phones:
-            print(f"  [{i:>3}] ⚠  SKIP  {name} ({role}) — phone {phone} already used by {seen_phones[phone]}")
+            print(f"  ⚠  SKIP  {name} ({member['role']}) — phone {phone} already used by {seen_phones[phone]}")
             skipped.append({"name": name, "phone": phone, "reason": f"Phone shared with {seen_phones[phone]}"})
             continue
-
         seen_phones[phone] = name
-        status_code, resp = create_member(token, member)
-
-        if status_code == 200:
-            mid = resp.get("member_id", "—")
-            print(f"  [{i:>3}] ✓ Created  {name} ({role}) → {mid}")
-            created.append({"name": name, "phone": phone, "role": role, "member_id": mid})
-        elif status_code == 409 or "already exists" in str(resp).lower():
-            print(f"  [{i:>3}] ~  Exists   {name} ({role})")
-            updated.append({"name": name, "phone": phone, "role": role})
+        to_send.append(member)
+
+    results = asyncio.run(onboard(to_send, args))
+
+    print()
+    by_phone = {m["phone"]: m for m in to_send}
+    created, updated, existing = [], [], []
+    for i, r in enumerate(results, 1):
+        role = by_phone.get(r["phone"], {}).get("role", "?")
+        name = r["full_name"]
+        if r["status"] == "created":
+            print(f"  [{i:>3}] ✓ Created  {name} ({role}) → {r['member_id']}")
+            created.append(r)
+        elif r["status"] == "updated":
+            print(f"  [{i:>3}] ✓ Updated  {name} ({role}) → {r['member_id']}")
+            updated.append(r)
+        elif r["status"] == "exists":
+            print(f"  [{i:>3}] ~  Exists   {name} ({role}) → {r['member_id']}")
+            existing.append(r)
         else:
-            detail = resp.get("detail", resp)
-            print(f"  [{i:>3}] ✗ Failed   {name} ({role}) — {detail}")
-            skipped.append({"name": name, "phone": phone, "reason": str(detail)})
+            print(f"  [{i:>3}] ✗ Failed   {name} ({role}) — {r.get('detail')}")
+            skipped.append({"name": name, "phone": r["phone"], "reason": r.get("detail")})
 
     # Summary
     print("\n" + "=" * 60)
     print(f"  SUMMARY")
     print(f"  Created  : {len(created)}")
-    print(f"  Existing : {len(updated)}")
+    print(f"  Updated  : {len(updated)}")
+    print(f"  Existing : {len(existing)}")
     print(f"  Skipped  : {len(skipped)}")
     print("=" * 60)
 
@@ -0,0 +1,142 @@
+"""
+Bulk PIN reset for the members listed in 'Members List.xlsx'.
+
+Resets every listed member's PIN to their sheet's default (Normal → 1234,
+Permanent → 2244) and clears failed-login lockouts. Phones are updated in
+chunks with one `UPDATE ... WHERE identifier IN (...)` per chunk; identifiers
+missing from the returned rows are reported as not found. With --dry-run
+nothing is written: the same chunks are only looked up.
+
+Replaces bulk_reset_pins_normal.py and bulk_reset_pins_permanent.py.
+
+Usage (run from project root):
+    python scripts/bulk_reset_pins.py --sheet normal
+    python scripts/bulk_reset_pins.py --sheet permanent --dry-run
+    python scripts/bulk_reset_pins.py --sheet all --chunk-size 200
+"""
+
+import asyncio
+import argparse
+import logging
+import os
+import sys
+import time
+
+# Add backend directory to path if needed for imports
+backend_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend'))
+if backend_path not in sys.path:
+    sys.path.append(backend_path)
+
+from app.db import get_supabase_client, run_query
+from app.auth.utils import hash_pin
+from app.admin.ingest import IngestError, iter_batches, load_schema
+
+# Configure logging
+logging.basicConfig(level=logging.WARNING)
+
+EXCEL_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../Members List.xlsx'))
+
+# --sheet choice → (sheet name, membership role, default PIN)
+SHEETS = {
+    "normal": ("Normal", "NORMAL", "1234"),
+    "permanent": ("Permanent", "PERMANENT", "2244"),
+}
+
+
+def read_sheet(path, sheet_name, role):
+    """Unique valid phones on a sheet (first occurrence wins), as {phone: name}."""
+    members = {}
+    print(f"Reading rows from '{sheet_name}'...")
+    # Only the phone matters for a reset; keep rows without a name
+    schema = load_schema()
+    schema["full_name"] = schema["full_name"]._replace(required=False)
+    for batch in iter_batches(path, sheet_name, schema=schema, default_role=role):
+        for row in batch.rows:
+            members[row["phone"]] = row["full_name"] or "Unknown"
+    return members
+
+
+async def reset_chunk(supabase, chunk, new_hash, dry_run):
+    """Identifiers in `chunk` that matched a user (updated unless dry_run)."""
+    if dry_run:
+        result = await run_query(
+            lambda: supabase.table("users").select("identifier").in_("identifier", chunk).execute()
+        )
+    else:
+        result = await run_query(
+            lambda: supabase.table("users")
+            .update({
+                "pin_hash": new_hash,
+                "failed_login_attempts": 0,
+                "locked_until": None,
+            })
+            .in_("identifier", chunk)
+            .execute()
+        )
+    return {row["identifier"] for row in (result.data or [])}
+
+
+async def reset_sheet(supabase, key, args):
+    sheet_name, role, pin = SHEETS[key]
+    print("=" * 60)
+    print(f"  Bulk PIN Reset — {sheet_name} Sheet{'  (DRY RUN)' if args.dry_run else ''}")
+    print("=" * 60)
+
+    try:
+        members = read_sheet(args.excel, sheet_name, role)
+    except (OSError, IngestError) as e:
+        print(f"✗ Error loading Excel file at {args.excel}: {e}")
+        return
+    print(f"Loaded {len(members)} unique/valid phone numbers from sheet.")
+    if not members:
+        print("No valid members found to update.\n")
+        return
+
+    new_hash = None if args.dry_run else hash_pin(pin)
+    phones = list(members)
+    chunks = [phones[i:i + args.chunk_size] for i in range(0, len(phones), args.chunk_size)]
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(reset_chunk(supabase, chunk, new_hash, args.dry_run) for chunk in chunks),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - started
+
+    matched, not_found, failed = set(), [], []
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, Exception):
+            print(f"  ✗ Chunk of {len(chunk)} failed — {result}")
+            failed.extend(chunk)
+            continue
+        matched |= result
+        not_found.extend(phone for phone in chunk if phone not in result)
+
+    for phone in not_found:
+        print(f"  ⚠ Not Found {phone} ({members[phone]})")
+
+    print("\n" + "=" * 60)
+    print("  SUMMARY")
+    print(f"  {'Total Rows Loaded':<20}: {len(members)}")
+    print(f"  {'Would Update' if args.dry_run else 'Updated Successfully':<20}: {len(matched)}  (PIN {pin})")
+    print(f"  {'Not Found (Skipped)':<20}: {len(not_found)}")
+    print(f"  {'Failed (Errors)':<20}: {len(failed)}")
+    print(f"  {'Time':<20}: {elapsed:.2f} s in {len(chunks)} chunk(s)")
+    print("=" * 60 + "\n")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sheet", choices=["normal", "permanent", "all"], required=True)
+    parser.add_argument("--chunk-size", type=int, default=200, help="identifiers per UPDATE statement")
+    parser.add_argument("--dry-run", action="store_true", help="only report who would be reset")
+    parser.add_argument("--excel", default=EXCEL_PATH)
+    args = parser.parse_args()
+
+    supabase = get_supabase_client()
+    for key in (SHEETS if args.sheet == "all" else [args.sheet]):
+        await reset_sheet(supabase, key, args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
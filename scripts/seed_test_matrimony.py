@@ -6,10 +6,20 @@ USER CREATION  — writes directly to Supabase with TST-PID-/TST-NID-/TST-AID-
 MATRIMONY FLOW — runs through the live API (register → admin approve) to
                  exercise the actual endpoints.
 
+SYNTHETIC SCALE — --synthetic N bulk-writes N generated users with their
+                 membership requests, fees, ledger entries, articles and
+                 matrimony profiles (TST-SYN- IDs; see scripts/synthetic_data.py),
+                 deterministic by --seed, for load testing at production scale.
+
 Usage (run from project root):
     python scripts/seed_test_matrimony.py            # full seed
     python scripts/seed_test_matrimony.py --profiles-only  # skip user creation
     python scripts/seed_test_matrimony.py --teardown       # print cleanup SQL
+    python scripts/seed_test_matrimony.py --synthetic 100000 --seed 7
+    python scripts/seed_test_matrimony.py --synthetic 500000 --chunk-size 2000 --workers 8
+    python scripts/seed_test_matrimony.py --synthetic-teardown  # print cleanup SQL
+    python scripts/seed_test_matrimony.py --synthetic 50000 --synthetic-fixture /tmp/fake_db.json
+                                         # JSON for the backend's DB_BACKEND=fake (FAKE_DB_FIXTURE)
 
 Requires: pip install requests python-dotenv supabase bcrypt
 """
@@ -18,7 +28,7 @@ import sys
 import argparse
 import bcrypt
 import requests
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
 from dotenv import load_dotenv
 import os
 
@@ -584,6 +594,45 @@ def run_seed(profiles_only: bool = False):
 """)
 
 
+def run_synthetic(users: int, seed: int, as_of, chunk_size: int, workers: int):
+    from synthetic_data import SyntheticDataset, seed as seed_synthetic
+
+    dataset = SyntheticDataset(users, seed=seed, as_of=as_of)
+    _supabase_client()  # fail fast on missing credentials
+    print("=" * 65)
+    print(f"  Synthetic seed — {users:,} users (seed {seed}, as of {dataset.as_of})")
+    print(f"  {dataset.articles:,} articles, {dataset.ledger_rows:,} ledger entries, "
+          f"chunks of {chunk_size} × {workers} workers")
+    print("=" * 65)
+    started = datetime.now(timezone.utc)
+    totals = seed_synthetic(_supabase_client, dataset, _hash(TEST_PIN), chunk_size, workers)
+    elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+    print(f"\n  Done: {sum(totals.values()):,} rows in {elapsed:.1f} s. Test logins use PIN {TEST_PIN}.")
+    print("  To remove: python scripts/seed_test_matrimony.py --synthetic-teardown")
+
+
+def run_synthetic_fixture(users: int, seed: int, as_of, path: str):
+    from synthetic_data import SyntheticDataset, write_fixture
+
+    dataset = SyntheticDataset(users, seed=seed, as_of=as_of)
+    print("=" * 65)
+    print(f"  Synthetic fixture — {users:,} users (seed {seed}, as of {dataset.as_of}) → {path}")
+    print("=" * 65)
+    totals = write_fixture(dataset, _hash(TEST_PIN), path)
+    for name, count in totals.items():
+        print(f"    ✓ {name:<22} {count:>9,} rows")
+    print(f"\n  Start the backend with DB_BACKEND=fake FAKE_DB_FIXTURE={path}")
+
+
+def run_synthetic_teardown():
+    from synthetic_data import teardown_sql
+
+    print("=" * 65)
+    print("  Synthetic teardown SQL — paste into Supabase SQL Editor and run")
+    print("=" * 65)
+    print(teardown_sql())
+
+
 def run_teardown():
     phones = [m["phone"]     for m in TEST_MEMBERS]
     mids   = [m["member_id"] for m in TEST_MEMBERS]
@@ -620,14 +669,34 @@ DELETE FROM public.users WHERE member_id IN ({mid_list});
 # ─────────────────────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Aaruvela matrimony test data seed")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
     parser.add_argument("--teardown",      action="store_true",
                         help="Print teardown SQL instead of seeding")
     parser.add_argument("--profiles-only", action="store_true",
                         help="Skip user creation, only submit + approve profiles")
+    parser.add_argument("--synthetic",     type=int, metavar="N",
+                        help="Bulk-write N synthetic users (10k-500k) and related rows")
+    parser.add_argument("--seed",          type=int, default=42,
+                        help="Random seed for --synthetic (same seed → same rows)")
+    parser.add_argument("--as-of",         type=date.fromisoformat, metavar="YYYY-MM-DD",
+                        help="Anchor date for --synthetic (default: today)")
+    parser.add_argument("--chunk-size",    type=int, default=1000,
+                        help="Rows per bulk upsert for --synthetic")
+    parser.add_argument("--workers",       type=int, default=4,
+                        help="Concurrent upserts for --synthetic")
+    parser.add_argument("--synthetic-fixture", metavar="PATH",
+                        help="With --synthetic: write a FAKE_DB_FIXTURE JSON file instead of Supabase")
+    parser.add_argument("--synthetic-teardown", action="store_true",
+                        help="Print teardown SQL for --synthetic data")
     args = parser.parse_args()
 
-    if args.teardown:
+    if args.synthetic_teardown:
+        run_synthetic_teardown()
+    elif args.synthetic and args.synthetic_fixture:
+        run_synthetic_fixture(args.synthetic, args.seed, args.as_of, args.synthetic_fixture)
+    elif args.synthetic:
+        run_synthetic(args.synthetic, args.seed, args.as_of, args.chunk_size, args.workers)
+    elif args.teardown:
         run_teardown()
     else:
         run_seed(profiles_only=args.profiles_only)
@@ -0,0 +1,379 @@
+"""
+Synthetic large-scale test data for capacity planning (used by
+seed_test_matrimony.py --synthetic N).
+
+Generates N users plus their membership requests, membership fee
+transactions, general ledger entries, articles and matrimony profiles, and
+writes them to Supabase with chunked bulk upserts from a few worker threads.
+
+ISOLATION (same idea as the hand-written TST- seed)
+  • member_id     : TST-SYN-PID-000001 / TST-SYN-NID-… / TST-SYN-AID-… — never
+                    produced by the real member ID counters
+  • phone / login : 5000000000 + n — no Indian mobile number starts with 5
+  • articles      : pdf_path under TST-SYN/, title prefixed "[TST]"
+  • ledger rows   : description prefixed "TST-SYN"
+  • every UUID is derived from (seed, table, n), so re-running with the same
+    seed upserts the same rows instead of adding more
+
+Every row is a pure function of (seed, as_of, n): chunks are generated on
+the fly, memory stays flat at 500k users, and two runs with the same seed
+and --as-of date produce identical data.
+
+Teardown: python scripts/seed_test_matrimony.py --synthetic-teardown
+"""
+
+import json
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Iterator, List
+
+MEMBER_ID_PREFIX = "TST-SYN-"
+PHONE_BASE = 5_000_000_000
+PDF_PREFIX = "TST-SYN/"
+DESCRIPTION_PREFIX = "TST-SYN"
+PHOTO_URL = "https://placehold.co/400x400/e2e8f0/64748b.jpg?text=Test+Profile"
+PDF_URL = "https://placehold.co/600x800.pdf?text=TST"
+
+MEMBERSHIP_FEES = {"PERMANENT": 5000, "NORMAL": 100, "ASSOCIATED": 500}
+ROLE_PREFIXES = {"PERMANENT": "PID", "NORMAL": "NID", "ASSOCIATED": "AID"}
+ROLE_WEIGHTS = [("PERMANENT", 10), ("NORMAL", 68), ("ASSOCIATED", 15), ("GENERAL", 7)]
+
+FIRST_NAMES_M = ["Arjun", "Venkat", "Suresh", "Ramesh", "Srinivas", "Krishna", "Ravi", "Sai", "Anil", "Prasad",
+                 "Nagaraju", "Sridhar", "Phani", "Kiran", "Mohan", "Satya", "Rama", "Surya", "Vamsi", "Hari"]
+FIRST_NAMES_F = ["Priya", "Lakshmi", "Deepika", "Kavitha", "Sravani", "Mounika", "Anitha", "Bhavana", "Padma",
+                 "Sita", "Durga", "Swathi", "Sirisha", "Radha", "Uma", "Vani", "Hema", "Keerthi", "Sailaja", "Jyothi"]
+SURNAMES = ["Sharma", "Rao", "Iyer", "Varma", "Sundaram", "Kota", "Tadepalli", "Veluri", "Chilakalapudi",
+            "Yadlapati", "Pothuraju", "Machiraju", "Kocherlakota", "Ajjarapu", "Nanduri", "Kollimarla", "Sastry"]
+GOTRAMS = ["Bharadwaja", "Vasishta", "Kashyapa", "Atri", "Vishwamitra", "Koundinya", "Kousika", "Harita",
+           "Srivatsa", "Gautama", "Jamadagni", "Mudgala"]
+STARS = ["Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra", "Punarvasu", "Pushya", "Ashlesha",
+         "Magha", "Purva Phalguni", "Uttara Phalguni", "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha",
+         "Jyeshtha", "Moola", "Purvashada", "Uttarashada", "Shravana", "Dhanishta", "Shatabhisha",
+         "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"]
+CITIES = ["Hyderabad", "Vijayawada", "Visakhapatnam", "Kakinada", "Rajahmundry", "Guntur", "Tirupati", "Nellore",
+          "Bangalore", "Chennai", "Pune", "Mumbai", "Delhi", "Warangal", "Eluru", "Ongole"]
+OCCUPATIONS = ["Software Engineer", "Doctor (MBBS)", "Government Employee", "Teacher", "Chartered Accountant",
+               "Business", "Lawyer", "Bank Officer", "Civil Engineer", "Lecturer", "Pharmacist", "Student"]
+ZONES = ["Uttar Andhra", "Rayalaseema", "Dakshina Kosta Andhra", "Madhya Kosta", None]
+REGIONS = ["Andhra", "Telangana", "Tamil Nadu", "Karnataka", "Rest of India", None]
+INCOME_CATEGORIES = ["DONATION", "EVENT", "GRANT", "OTHER"]
+EXPENSE_CATEGORIES = ["EVENT", "MAINTENANCE", "PRINTING", "TRAVEL", "ADMIN", "OTHER"]
+
+# Share of users with a matrimony profile, and articles / general ledger rows per user
+MATRIMONY_SHARE = 0.2
+# Share of active NORMAL / ASSOCIATED members whose membership has lapsed (renewal paths)
+EXPIRED_SHARE = 0.05
+ARTICLES_PER_USER = 1 / 200
+LEDGER_ROWS_PER_USER = 1 / 5
+
+
+class SyntheticDataset:
+    """Deterministic rows for one (seed, users) combination."""
+
+    def __init__(self, users: int, seed: int = 42, as_of: date = None):
+        self.users = users
+        self.seed = seed
+        self.as_of = as_of or datetime.now(timezone.utc).date()
+        self.namespace = uuid.uuid5(uuid.NAMESPACE_URL, f"aaruvela-synthetic-{seed}")
+        # Dates are relative to `as_of` so subscriptions / article expiry look current
+        self.now = datetime(self.as_of.year, self.as_of.month, self.as_of.day, 12, tzinfo=timezone.utc)
+        self.articles = max(20, int(users * ARTICLES_PER_USER))
+        self.ledger_rows = int(users * LEDGER_ROWS_PER_USER)
+
+    def _id(self, table: str, n: int) -> str:
+        return str(uuid.uuid5(self.namespace, f"{table}:{n}"))
+
+    def _rng(self, table: str, n: int) -> random.Random:
+        return random.Random(f"{self.seed}:{table}:{n}")
+
+    # ── per-row generators ────────────────────────────────────────────────────
+
+    def member(self, n: int) -> dict:
+        """Attributes of synthetic user n (1-based) shared by every table."""
+        rnd = self._rng("users", n)
+        role = rnd.choices([r for r, _ in ROLE_WEIGHTS], weights=[w for _, w in ROLE_WEIGHTS])[0]
+        gender = "MALE" if rnd.random() < 0.5 else "FEMALE"
+        first = rnd.choice(FIRST_NAMES_M if gender == "MALE" else FIRST_NAMES_F)
+        joined = self.now - timedelta(days=rnd.randrange(1, 5 * 365))
+        return {
+            "n": n,
+            "id": self._id("users", n),
+            "phone": str(PHONE_BASE + n),
+            "full_name": f"{first} {rnd.choice(SURNAMES)}",
+            "gender": gender,
+            "role": role,
+            "active": role != "GENERAL",
+            "member_id": f"{MEMBER_ID_PREFIX}{ROLE_PREFIXES[role]}-{n:06d}" if role in ROLE_PREFIXES else None,
+            "joined_at": joined,
+            "age": rnd.randrange(21, 75),
+            "gotram": rnd.choice(GOTRAMS),
+            "occupation": rnd.choice(OCCUPATIONS),
+            "zonal_committee": rnd.choice(ZONES),
+            "regional_committee": rnd.choice(REGIONS),
+            "matrimony": rnd.random() < MATRIMONY_SHARE and role != "GENERAL",
+            # Current for most term members, so synthetic logins pass the membership check
+            "expires_at": self.now + (
+                timedelta(days=-rnd.randrange(1, 90)) if rnd.random() < EXPIRED_SHARE
+                else timedelta(days=rnd.randrange(1, 365))
+            ),
+        }
+
+    def user_row(self, n: int, pin_hash: str) -> dict:
+        m = self.member(n)
+        return {
+            "id": m["id"],
+            "identifier": m["phone"],
+            "phone": m["phone"],
+            "pin_hash": pin_hash,
+            "full_name": m["full_name"],
+            "role": m["role"],
+            "status": "ACTIVE" if m["active"] else "PENDING",
+            "member_id": m["member_id"],
+            "age": m["age"],
+            "gotram": m["gotram"],
+            "occupation": m["occupation"],
+            "zonal_committee": m["zonal_committee"],
+            "regional_committee": m["regional_committee"],
+            "membership_expires_at": (
+                m["expires_at"].isoformat()
+                if m["active"] and m["role"] != "PERMANENT" else None
+            ),
+            "joined_at": m["joined_at"].isoformat() if m["active"] else None,
+            "created_at": m["joined_at"].isoformat(),
+            "updated_at": m["joined_at"].isoformat(),
+        }
+
+    def membership_request_row(self, n: int) -> dict:
+        m = self.member(n)
+        requested = m["role"] if m["active"] else self._rng("requests", n).choice(list(ROLE_PREFIXES))
+        return {
+            "id": self._id("membership_requests", n),
+            "user_id": m["id"],
+            "requested_role": requested,
+            "application_data": {"full_name": m["full_name"], "phone": m["phone"]},
+            "payment_status": "PAID" if m["active"] else "PENDING",
+            "approval_status": "APPROVED" if m["active"] else "PENDING",
+            "admin_notes": f"Synthetic test data (seed {self.seed})",
+            "created_at": m["joined_at"].isoformat(),
+        }
+
+    def fee_row(self, n: int):
+        m = self.member(n)
+        fee = MEMBERSHIP_FEES.get(m["role"])
+        if not m["active"] or not fee:
+            return None
+        return {
+            "id": self._id("fees", n),
+            "type": "INCOME",
+            "category": "MEMBERSHIP_FEE",
+            "amount": fee,
+            "description": f"Registration fee — {m['member_id']} ({m['role']})",
+            "reference_user_id": m["id"],
+            "transaction_date": m["joined_at"].date().isoformat(),
+            "fee_key": f"{m['role']}:{m['member_id']}",
+        }
+
+    def ledger_row(self, n: int) -> dict:
+        rnd = self._rng("ledger", n)
+        income = rnd.random() < 0.55
+        day = (self.now - timedelta(days=rnd.randrange(0, 5 * 365))).date()
+        category = rnd.choice(INCOME_CATEGORIES if income else EXPENSE_CATEGORIES)
+        return {
+            "id": self._id("ledger", n),
+            "type": "INCOME" if income else "EXPENSE",
+            "category": category,
+            "amount": round(rnd.lognormvariate(8, 1.2), 2),
+            "description": f"{DESCRIPTION_PREFIX} {category.lower()} #{n}",
+            "reference_user_id": None,
+            "transaction_date": day.isoformat(),
+        }
+
+    def article_row(self, n: int) -> dict:
+        rnd = self._rng("articles", n)
+        author = self.member(rnd.randrange(1, self.users + 1))
+        status = rnd.choices(["PUBLISHED", "PENDING", "REJECTED"], weights=[80, 15, 5])[0]
+        published = self.now - timedelta(days=rnd.randrange(0, 60))
+        row = {
+            "id": self._id("articles", n),
+            "title": f"[TST] {rnd.choice(['Community', 'Festival', 'Seva', 'Education', 'Health'])} update #{n}",
+            "summary": "Synthetic article generated for load testing.",
+            "category": rnd.choice(["NEWS", "ARTICLE"]),
+            "pdf_url": PDF_URL,
+            "pdf_path": f"{PDF_PREFIX}{n:06d}.pdf",
+            "status": status,
+            "submitted_by": author["id"],
+            "published_at": None,
+            "expires_at": None,
+        }
+        if status == "PUBLISHED":
+            # Published for 30 days, so roughly half of these are already expired
+            row["published_at"] = published.isoformat()
+            row["expires_at"] = (published + timedelta(days=30)).isoformat()
+        return row
+
+    def matrimony_row(self, n: int):
+        m = self.member(n)
+        if not m["matrimony"]:
+            return None
+        rnd = self._rng("matrimony", n)
+        age = rnd.randrange(21, 41)
+        dob = date(self.now.year - age, rnd.randrange(1, 13), rnd.randrange(1, 29))
+        verified = rnd.random() < 0.85
+        expires = self.now + timedelta(days=rnd.randrange(-30, 330))
+        return {
+            "id": self._id("matrimony_profiles", n),
+            "user_id": m["id"],
+            "parishat_id": m["member_id"],
+            "full_name": m["full_name"],
+            "gender": m["gender"],
+            "age": age,
+            "dob": dob.isoformat(),
+            "tob": f"{rnd.randrange(24):02d}:{rnd.randrange(60):02d}:00",
+            "gotram": m["gotram"],
+            "star_with_pada": f"{rnd.choice(STARS)} - {rnd.randrange(1, 5)}",
+            "place_of_birth": rnd.choice(CITIES),
+            "current_city": rnd.choice(CITIES),
+            "occupation": m["occupation"],
+            "annual_income": f"{rnd.randrange(3, 40)} LPA",
+            "father_guardian_name": f"{rnd.choice(FIRST_NAMES_M)} {m['full_name'].split()[-1]}",
+            "brothers": rnd.randrange(0, 3),
+            "sisters": rnd.randrange(0, 3),
+            "willing_to_relocate": rnd.random() < 0.6,
+            "particulars": "Synthetic profile generated for load testing.",
+            "requirement": "Synthetic requirement.",
+            "contact_no": m["phone"],
+            "photo_url": PHOTO_URL,
+            "photos": [PHOTO_URL],
+            "payment_reference": f"TST-SYN-UTR-{n:06d}",
+            "payment_status": "VERIFIED" if verified else "PENDING",
+            "status": "ACTIVE",
+            "subscription_expires_at": expires.isoformat() if verified else None,
+        }
+
+    # ── chunked table streams ────────────────────────────────────────────────
+
+    def chunks(self, table: str, chunk_size: int, pin_hash: str = None) -> Iterator[List[dict]]:
+        """Rows of `table` in chunks; rows that don't apply to a user are skipped."""
+        makers: dict = {
+            "users": (self.users, lambda n: self.user_row(n, pin_hash)),
+            "membership_requests": (self.users, self.membership_request_row),
+            "matrimony_profiles": (self.users, self.matrimony_row),
+            "transactions:fees": (self.users, self.fee_row),
+            "transactions:ledger": (self.ledger_rows, self.ledger_row),
+            "articles": (self.articles, self.article_row),
+        }
+        count, make = makers[table]
+        chunk = []
+        for n in range(1, count + 1):
+            row = make(n)
+            if row is not None:
+                chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+# Insert order respects foreign keys (users first)
+TABLES = [
+    ("users", "users"),
+    ("membership_requests", "membership_requests"),
+    ("transactions:fees", "transactions"),
+    ("transactions:ledger", "transactions"),
+    ("articles", "articles"),
+    ("matrimony_profiles", "matrimony_profiles"),
+]
+
+
+def seed(client_factory: Callable, dataset: SyntheticDataset, pin_hash: str, chunk_size: int = 1000, workers: int = 4) -> dict:
+    """
+    Upsert every table of `dataset` in chunks of `chunk_size`, `workers`
+    chunks in flight (one Supabase client per worker thread). Returns rows
+    written per table.
+    """
+    local = threading.local()
+
+    def client():
+        if not hasattr(local, "client"):
+            local.client = client_factory()
+        return local.client
+
+    def write(table, rows):
+        client().table(table).upsert(rows, on_conflict="id", returning="minimal").execute()
+        return len(rows)
+
+    totals = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for name, table in TABLES:
+            started = time.perf_counter()
+            written = 0
+            pending = []
+            for rows in dataset.chunks(name, chunk_size, pin_hash):
+                pending.append(pool.submit(write, table, rows))
+                # Keep at most 2 × workers chunks generated ahead of the writers
+                if len(pending) >= 2 * workers:
+                    written += pending.pop(0).result()
+            written += sum(f.result() for f in pending)
+            elapsed = time.perf_counter() - started
+            totals[name] = written
+            print(f"    ✓ {name:<22} {written:>9,} rows  {elapsed:6.1f} s  ({written / max(elapsed, 1e-9):,.0f} rows/s)")
+    return totals
+
+
+def write_fixture(dataset: SyntheticDataset, pin_hash: str, path: str, chunk_size: int = 1000) -> dict:
+    """
+    Write `dataset` as {table: [rows]} JSON for the backend's in-memory
+    database (DB_BACKEND=fake, FAKE_DB_FIXTURE=path), streamed chunk by
+    chunk. Returns rows written per table.
+    """
+    totals = {}
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{")
+        for index, table in enumerate(dict.fromkeys(table for _, table in TABLES)):
+            f.write(("," if index else "") + f"\n{json.dumps(table)}: [")
+            first = True
+            for name, target in TABLES:
+                if target != table:
+                    continue
+                totals[name] = 0
+                for rows in dataset.chunks(name, chunk_size, pin_hash):
+                    for row in rows:
+                        f.write(("\n" if first else ",\n") + json.dumps(row))
+                        first = False
+                    totals[name] += len(rows)
+            f.write("]")
+        f.write("}\n")
+    return totals
+
+
+def teardown_sql() -> str:
+    """Set-based cleanup of everything seed() can write, children first."""
+    match = f"member_id LIKE '{MEMBER_ID_PREFIX}%' OR (member_id IS NULL AND identifier ~ '^5[0-9]{{9}}$')"
+    users = f"SELECT id FROM public.users WHERE {match}"
+    return f"""
+-- Synthetic users are identified by TST-SYN- member IDs or 5xxxxxxxxx phones
+-- (GENERAL applicants have no member ID).
+
+-- 1. Matrimony profiles
+DELETE FROM public.matrimony_profiles WHERE user_id IN ({users});
+
+-- 2. Ledger rows (fees reference the users; general entries carry the prefix)
+DELETE FROM public.transactions
+WHERE description LIKE '{DESCRIPTION_PREFIX}%'
+   OR reference_user_id IN ({users});
+
+-- 3. Articles
+DELETE FROM public.articles WHERE pdf_path LIKE '{PDF_PREFIX}%';
+
+-- 4. Membership requests and payments
+DELETE FROM public.membership_requests WHERE user_id IN ({users});
+DELETE FROM public.payments WHERE user_id IN ({users});
+
+-- 5. Users
+DELETE FROM public.users WHERE {match};
+"""
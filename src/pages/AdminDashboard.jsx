@@ -572,7 +572,13 @@ const AccountsTab = () => {
                 <div className="flex gap-2">
                     <Button onClick={async () => {
                         try {
-                            const res = await api.post('/accounts/backfill');
+                            let res = await api.post('/accounts/backfill');
+                            // Runs in the background on the server; poll until it finishes
+                            while (res.data.status === 'running') {
+                                await new Promise((resolve) => setTimeout(resolve, 1000));
+                                res = await api.get('/accounts/backfill');
+                            }
+                            if (res.data.status === 'failed') throw new Error(res.data.message);
                             toast.success(res.data.message);
                             fetchAll();
                         } catch { toast.error('Backfill failed'); }
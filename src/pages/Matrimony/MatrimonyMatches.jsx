@@ -295,7 +295,7 @@ const MatrimonyMatches = () => {
                                 <div className="flex items-center gap-4 mb-4">
                                     <div className="w-16 h-16 rounded-2xl bg-blue-50 overflow-hidden shrink-0 border border-blue-100 group-hover:border-blue-300 transition-colors">
                                         {match.photo_url ? (
-                                            <img src={match.photo_url} alt={match.full_name} className="w-full h-full object-cover" />
+                                            <img src={match.photo_thumbnails?.[0] || match.photo_url} alt={match.full_name} loading="lazy" className="w-full h-full object-cover" />
                                         ) : (
                                             <div className="w-full h-full flex items-center justify-center text-blue-300 bg-blue-50">
                                                 <User size={24} />